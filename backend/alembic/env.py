@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
-from app.models import user, income, expense
+from app.models import user, income, expense, harvest_season, equipment, harvest_expense, revenue, summary_calculation, rollup
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,314 @@
+"""Harvest season tables, daily rollups and hot-path indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+# Enum(ExpenseCategory) stores member names, but 001 created the type with the values
+EXPENSE_CATEGORIES = ['fuel', 'labor', 'equipment_lease', 'equipment_repair', 'equipment_depreciation', 'rent_interest', 'taxes', 'other']
+
+
+def upgrade() -> None:
+    for category in EXPENSE_CATEGORIES:
+        op.execute(f"ALTER TYPE expensecategory RENAME VALUE '{category}' TO '{category.upper()}'")
+
+    # Create harvest_seasons table
+    op.create_table('harvest_seasons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('business_name', sa.String(), nullable=False),
+        sa.Column('business_address', sa.Text(), nullable=True),
+        sa.Column('contact_phone', sa.String(), nullable=True),
+        sa.Column('contact_email', sa.String(), nullable=True),
+        sa.Column('estimated_start_date', sa.DateTime(), nullable=True),
+        sa.Column('estimated_end_date', sa.DateTime(), nullable=True),
+        sa.Column('actual_start_date', sa.DateTime(), nullable=True),
+        sa.Column('actual_end_date', sa.DateTime(), nullable=True),
+        sa.Column('pay_cycle', postgresql.ENUM('WEEKLY', 'BI_WEEKLY', 'SEMI_MONTHLY', 'MONTHLY', name='paycycle'), nullable=False),
+        sa.Column('interest_rate', sa.Float(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_harvest_seasons_id'), 'harvest_seasons', ['id'], unique=False)
+    op.create_index(op.f('ix_harvest_seasons_user_id'), 'harvest_seasons', ['user_id'], unique=False)
+
+    # Create equipment table
+    op.create_table('equipment',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('equipment_type', postgresql.ENUM('COMBINE', 'HEADER', 'TRACTOR', 'TRAILER', 'TRUCK', 'CAMPER', 'OTHER', name='equipmenttype'), nullable=False),
+        sa.Column('ownership_type', postgresql.ENUM('OWNED', 'LEASED', 'FINANCED', name='ownershiptype'), nullable=False),
+        sa.Column('purchase_date', sa.Date(), nullable=True),
+        sa.Column('purchase_price', sa.Float(), nullable=True),
+        sa.Column('current_value', sa.Float(), nullable=True),
+        sa.Column('years_ownership', sa.Float(), nullable=True),
+        sa.Column('lease_rate', sa.Float(), nullable=True),
+        sa.Column('finance_rate', sa.Float(), nullable=True),
+        sa.Column('down_payment', sa.Float(), nullable=True),
+        sa.Column('monthly_payment', sa.Float(), nullable=True),
+        sa.Column('working_days', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_equipment_id'), 'equipment', ['id'], unique=False)
+    op.create_index(op.f('ix_equipment_harvest_season_id'), 'equipment', ['harvest_season_id'], unique=False)
+
+    # Create equipment_costs table
+    op.create_table('equipment_costs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('lease_cost', sa.Float(), nullable=True),
+        sa.Column('interest_cost', sa.Float(), nullable=True),
+        sa.Column('depreciation_cost', sa.Float(), nullable=True),
+        sa.Column('total_cost', sa.Float(), nullable=False),
+        sa.Column('acres_worked', sa.Float(), nullable=True),
+        sa.Column('cost_per_acre', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_equipment_costs_id'), 'equipment_costs', ['id'], unique=False)
+    op.create_index(op.f('ix_equipment_costs_equipment_id'), 'equipment_costs', ['equipment_id'], unique=False)
+    op.create_index('ix_equipment_costs_harvest_season_id_period_start', 'equipment_costs', ['harvest_season_id', 'period_start'], unique=False)
+
+    # Create harvest_expenses table
+    op.create_table('harvest_expenses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('category', postgresql.ENUM('FUEL', 'MAINTENANCE', 'REPAIRS', 'HOUSING', 'EMPLOYEES', 'INSURANCE', 'TAXES', 'PERMITS', 'OTHER', name='harvestexpensecategory'), nullable=False),
+        sa.Column('subcategory', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('harvest_days', sa.Float(), nullable=True),
+        sa.Column('prorated_amount', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_harvest_expenses_id'), 'harvest_expenses', ['id'], unique=False)
+    op.create_index('ix_harvest_expenses_harvest_season_id_category', 'harvest_expenses', ['harvest_season_id', 'category'], unique=False, postgresql_include=['amount'])
+
+    # Create housing_expenses table
+    op.create_table('housing_expenses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('housing_type', postgresql.ENUM('CAMPER', 'HOTEL', 'LOT_RENT', 'UTILITIES', name='housingtype'), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('daily_rate', sa.Float(), nullable=True),
+        sa.Column('total_days', sa.Float(), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_housing_expenses_id'), 'housing_expenses', ['id'], unique=False)
+    op.create_index(op.f('ix_housing_expenses_harvest_season_id'), 'housing_expenses', ['harvest_season_id'], unique=False)
+
+    # Create employee_expenses table
+    op.create_table('employee_expenses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('expense_type', postgresql.ENUM('WAGES', 'BENEFITS', 'TRAINING', 'MEALS', 'ENTERTAINMENT', name='employeeexpensetype'), nullable=False),
+        sa.Column('employee_name', sa.String(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_employee_expenses_id'), 'employee_expenses', ['id'], unique=False)
+    op.create_index(op.f('ix_employee_expenses_harvest_season_id'), 'employee_expenses', ['harvest_season_id'], unique=False)
+
+    # Create revenue_entries table
+    op.create_table('revenue_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('crop_type', postgresql.ENUM('SMALL_GRAIN', 'CORN', 'COTTON', 'SILAGE', name='croptype'), nullable=False),
+        sa.Column('pricing_model', postgresql.ENUM('PER_ACRE', 'PER_BUSHEL', 'PER_MINUTE', 'PER_MILE', 'PER_HOUR', name='pricingmodel'), nullable=False),
+        sa.Column('client_name', sa.String(), nullable=True),
+        sa.Column('client_state', sa.String(), nullable=True),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('rate', sa.Float(), nullable=False),
+        sa.Column('total_revenue', sa.Float(), nullable=False),
+        sa.Column('harvest_date', sa.DateTime(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_revenue_entries_id'), 'revenue_entries', ['id'], unique=False)
+    op.create_index('ix_revenue_entries_harvest_season_id_crop_type', 'revenue_entries', ['harvest_season_id', 'crop_type'], unique=False, postgresql_include=['quantity', 'total_revenue', 'pricing_model'])
+
+    # Create income_rate_structures table
+    op.create_table('income_rate_structures',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('crop_type', postgresql.ENUM(name='croptype', create_type=False), nullable=False),
+        sa.Column('state', sa.String(), nullable=False),
+        sa.Column('per_acre_rate', sa.Float(), nullable=True),
+        sa.Column('per_bushel_rate', sa.Float(), nullable=True),
+        sa.Column('per_minute_rate', sa.Float(), nullable=True),
+        sa.Column('per_mile_rate', sa.Float(), nullable=True),
+        sa.Column('per_hour_rate', sa.Float(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_income_rate_structures_id'), 'income_rate_structures', ['id'], unique=False)
+    op.create_index(op.f('ix_income_rate_structures_harvest_season_id'), 'income_rate_structures', ['harvest_season_id'], unique=False)
+
+    # Create summary_calculations table
+    op.create_table('summary_calculations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('harvest_duration_days', sa.Float(), nullable=True),
+        sa.Column('acres_billed', sa.Float(), nullable=True),
+        sa.Column('total_equipment_cost', sa.Float(), nullable=True),
+        sa.Column('total_housing_cost', sa.Float(), nullable=True),
+        sa.Column('total_employee_cost', sa.Float(), nullable=True),
+        sa.Column('total_fuel_cost', sa.Float(), nullable=True),
+        sa.Column('total_maintenance_cost', sa.Float(), nullable=True),
+        sa.Column('total_insurance_cost', sa.Float(), nullable=True),
+        sa.Column('total_tax_cost', sa.Float(), nullable=True),
+        sa.Column('total_other_cost', sa.Float(), nullable=True),
+        sa.Column('total_expenses', sa.Float(), nullable=True),
+        sa.Column('total_revenue', sa.Float(), nullable=True),
+        sa.Column('revenue_by_crop', sa.Text(), nullable=True),
+        sa.Column('gross_profit', sa.Float(), nullable=True),
+        sa.Column('net_profit', sa.Float(), nullable=True),
+        sa.Column('profit_margin', sa.Float(), nullable=True),
+        sa.Column('cost_per_acre', sa.Float(), nullable=True),
+        sa.Column('revenue_per_acre', sa.Float(), nullable=True),
+        sa.Column('profit_per_acre', sa.Float(), nullable=True),
+        sa.Column('equipment_cost_breakdown', sa.Text(), nullable=True),
+        sa.Column('calculated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_calculations_id'), 'summary_calculations', ['id'], unique=False)
+    op.create_index(op.f('ix_summary_calculations_harvest_season_id'), 'summary_calculations', ['harvest_season_id'], unique=False)
+
+    # Create daily rollup tables
+    op.create_table('daily_income_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('income_sum', sa.Float(), nullable=False),
+        sa.Column('income_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', name='uq_daily_income_rollups_user_day')
+    )
+    op.create_index(op.f('ix_daily_income_rollups_id'), 'daily_income_rollups', ['id'], unique=False)
+    op.create_index('ix_daily_income_rollups_day', 'daily_income_rollups', ['day'], unique=False)
+
+    op.create_table('daily_expense_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', postgresql.ENUM(name='expensecategory', create_type=False), nullable=False),
+        sa.Column('expense_sum', sa.Float(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'category', name='uq_daily_expense_rollups_user_day_category')
+    )
+    op.create_index(op.f('ix_daily_expense_rollups_id'), 'daily_expense_rollups', ['id'], unique=False)
+    op.create_index('ix_daily_expense_rollups_day', 'daily_expense_rollups', ['day'], unique=False)
+
+    # Hot-path indexes on existing tables, built without blocking writes
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_users_state'), 'users', ['state'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_income_entries_user_id_harvest_date', 'income_entries', ['user_id', 'harvest_date'], unique=False,
+                        postgresql_include=['total_earned'], postgresql_concurrently=True)
+        op.create_index('ix_expense_entries_user_id_expense_date_category', 'expense_entries', ['user_id', 'expense_date', 'category'], unique=False,
+                        postgresql_include=['amount'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_expense_entries_user_id_expense_date_category', table_name='expense_entries', postgresql_concurrently=True)
+        op.drop_index('ix_income_entries_user_id_harvest_date', table_name='income_entries', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_users_state'), table_name='users', postgresql_concurrently=True)
+
+    op.drop_index('ix_daily_expense_rollups_day', table_name='daily_expense_rollups')
+    op.drop_index(op.f('ix_daily_expense_rollups_id'), table_name='daily_expense_rollups')
+    op.drop_table('daily_expense_rollups')
+    op.drop_index('ix_daily_income_rollups_day', table_name='daily_income_rollups')
+    op.drop_index(op.f('ix_daily_income_rollups_id'), table_name='daily_income_rollups')
+    op.drop_table('daily_income_rollups')
+    op.drop_index(op.f('ix_summary_calculations_harvest_season_id'), table_name='summary_calculations')
+    op.drop_index(op.f('ix_summary_calculations_id'), table_name='summary_calculations')
+    op.drop_table('summary_calculations')
+    op.drop_index(op.f('ix_income_rate_structures_harvest_season_id'), table_name='income_rate_structures')
+    op.drop_index(op.f('ix_income_rate_structures_id'), table_name='income_rate_structures')
+    op.drop_table('income_rate_structures')
+    op.drop_index('ix_revenue_entries_harvest_season_id_crop_type', table_name='revenue_entries')
+    op.drop_index(op.f('ix_revenue_entries_id'), table_name='revenue_entries')
+    op.drop_table('revenue_entries')
+    op.drop_index(op.f('ix_employee_expenses_harvest_season_id'), table_name='employee_expenses')
+    op.drop_index(op.f('ix_employee_expenses_id'), table_name='employee_expenses')
+    op.drop_table('employee_expenses')
+    op.drop_index(op.f('ix_housing_expenses_harvest_season_id'), table_name='housing_expenses')
+    op.drop_index(op.f('ix_housing_expenses_id'), table_name='housing_expenses')
+    op.drop_table('housing_expenses')
+    op.drop_index('ix_harvest_expenses_harvest_season_id_category', table_name='harvest_expenses')
+    op.drop_index(op.f('ix_harvest_expenses_id'), table_name='harvest_expenses')
+    op.drop_table('harvest_expenses')
+    op.drop_index('ix_equipment_costs_harvest_season_id_period_start', table_name='equipment_costs')
+    op.drop_index(op.f('ix_equipment_costs_equipment_id'), table_name='equipment_costs')
+    op.drop_index(op.f('ix_equipment_costs_id'), table_name='equipment_costs')
+    op.drop_table('equipment_costs')
+    op.drop_index(op.f('ix_equipment_harvest_season_id'), table_name='equipment')
+    op.drop_index(op.f('ix_equipment_id'), table_name='equipment')
+    op.drop_table('equipment')
+    op.drop_index(op.f('ix_harvest_seasons_user_id'), table_name='harvest_seasons')
+    op.drop_index(op.f('ix_harvest_seasons_id'), table_name='harvest_seasons')
+    op.drop_table('harvest_seasons')
+    op.execute('DROP TYPE employeeexpensetype')
+    op.execute('DROP TYPE housingtype')
+    op.execute('DROP TYPE harvestexpensecategory')
+    op.execute('DROP TYPE pricingmodel')
+    op.execute('DROP TYPE croptype')
+    op.execute('DROP TYPE ownershiptype')
+    op.execute('DROP TYPE equipmenttype')
+    op.execute('DROP TYPE paycycle')
+    for category in EXPENSE_CATEGORIES:
+        op.execute(f"ALTER TYPE expensecategory RENAME VALUE '{category.upper()}' TO '{category}'")
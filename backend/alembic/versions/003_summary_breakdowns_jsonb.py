@@ -0,0 +1,128 @@
+"""Summary breakdowns as JSONB with per-crop and per-equipment child tables
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import json
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+BREAKDOWN_COLUMNS = ('revenue_by_crop', 'equipment_cost_breakdown')
+
+
+def _decode(value):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    summaries = sa.table('summary_calculations',
+        sa.column('id', sa.Integer()),
+        sa.column('harvest_season_id', sa.Integer()),
+        sa.column('revenue_by_crop', sa.Text()),
+        sa.column('equipment_cost_breakdown', sa.Text())
+    )
+
+    # Values that never decoded were read as empty; clear them so the cast succeeds
+    rows = connection.execute(sa.select(summaries)).all()
+    for row in rows:
+        invalid = {column: None for column in BREAKDOWN_COLUMNS if getattr(row, column) and _decode(getattr(row, column)) is None}
+        if invalid:
+            connection.execute(summaries.update().where(summaries.c.id == row.id).values(**invalid))
+
+    for column in BREAKDOWN_COLUMNS:
+        op.alter_column('summary_calculations', column,
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb'
+        )
+
+    op.create_table('summary_crop_revenues',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('summary_calculation_id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('crop_type', sa.String(), nullable=False),
+        sa.Column('total_revenue', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['summary_calculation_id'], ['summary_calculations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_crop_revenues_id'), 'summary_crop_revenues', ['id'], unique=False)
+    op.create_index(op.f('ix_summary_crop_revenues_summary_calculation_id'), 'summary_crop_revenues', ['summary_calculation_id'], unique=False)
+    op.create_index(op.f('ix_summary_crop_revenues_harvest_season_id'), 'summary_crop_revenues', ['harvest_season_id'], unique=False)
+    op.create_index('ix_summary_crop_revenues_crop_type_harvest_season_id', 'summary_crop_revenues', ['crop_type', 'harvest_season_id'], unique=False)
+
+    op.create_table('summary_equipment_costs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('summary_calculation_id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_name', sa.String(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['summary_calculation_id'], ['summary_calculations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_equipment_costs_id'), 'summary_equipment_costs', ['id'], unique=False)
+    op.create_index(op.f('ix_summary_equipment_costs_summary_calculation_id'), 'summary_equipment_costs', ['summary_calculation_id'], unique=False)
+    op.create_index(op.f('ix_summary_equipment_costs_harvest_season_id'), 'summary_equipment_costs', ['harvest_season_id'], unique=False)
+    op.create_index('ix_summary_equipment_costs_equipment_name_harvest_season_id', 'summary_equipment_costs', ['equipment_name', 'harvest_season_id'], unique=False)
+
+    # Backfill the child tables from the existing breakdowns
+    crop_rows, equipment_rows = [], []
+    for row in rows:
+        for crop, revenue in (_decode(row.revenue_by_crop) or {}).items():
+            crop_rows.append({'summary_calculation_id': row.id, 'harvest_season_id': row.harvest_season_id,
+                              'crop_type': crop, 'total_revenue': revenue})
+        for name, cost in (_decode(row.equipment_cost_breakdown) or {}).items():
+            equipment_rows.append({'summary_calculation_id': row.id, 'harvest_season_id': row.harvest_season_id,
+                                   'equipment_name': name, 'cost': cost})
+    if crop_rows:
+        op.bulk_insert(sa.table('summary_crop_revenues',
+            sa.column('summary_calculation_id', sa.Integer()),
+            sa.column('harvest_season_id', sa.Integer()),
+            sa.column('crop_type', sa.String()),
+            sa.column('total_revenue', sa.Float())
+        ), crop_rows)
+    if equipment_rows:
+        op.bulk_insert(sa.table('summary_equipment_costs',
+            sa.column('summary_calculation_id', sa.Integer()),
+            sa.column('harvest_season_id', sa.Integer()),
+            sa.column('equipment_name', sa.String()),
+            sa.column('cost', sa.Float())
+        ), equipment_rows)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summary_equipment_costs_equipment_name_harvest_season_id', table_name='summary_equipment_costs')
+    op.drop_index(op.f('ix_summary_equipment_costs_harvest_season_id'), table_name='summary_equipment_costs')
+    op.drop_index(op.f('ix_summary_equipment_costs_summary_calculation_id'), table_name='summary_equipment_costs')
+    op.drop_index(op.f('ix_summary_equipment_costs_id'), table_name='summary_equipment_costs')
+    op.drop_table('summary_equipment_costs')
+    op.drop_index('ix_summary_crop_revenues_crop_type_harvest_season_id', table_name='summary_crop_revenues')
+    op.drop_index(op.f('ix_summary_crop_revenues_harvest_season_id'), table_name='summary_crop_revenues')
+    op.drop_index(op.f('ix_summary_crop_revenues_summary_calculation_id'), table_name='summary_crop_revenues')
+    op.drop_index(op.f('ix_summary_crop_revenues_id'), table_name='summary_crop_revenues')
+    op.drop_table('summary_crop_revenues')
+
+    for column in BREAKDOWN_COLUMNS:
+        op.alter_column('summary_calculations', column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text'
+        )
@@ -0,0 +1,88 @@
+"""One versioned current summary per season plus summary history
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+HISTORY_COLUMNS = (
+    'harvest_duration_days, acres_billed, total_equipment_cost, total_expenses, total_revenue, '
+    'gross_profit, net_profit, profit_margin, cost_per_acre, revenue_per_acre, profit_per_acre'
+)
+
+
+def upgrade() -> None:
+    op.create_table('summary_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('harvest_season_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('calculated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('harvest_duration_days', sa.Float(), nullable=True),
+        sa.Column('acres_billed', sa.Float(), nullable=True),
+        sa.Column('total_equipment_cost', sa.Float(), nullable=True),
+        sa.Column('total_expenses', sa.Float(), nullable=True),
+        sa.Column('total_revenue', sa.Float(), nullable=True),
+        sa.Column('gross_profit', sa.Float(), nullable=True),
+        sa.Column('net_profit', sa.Float(), nullable=True),
+        sa.Column('profit_margin', sa.Float(), nullable=True),
+        sa.Column('cost_per_acre', sa.Float(), nullable=True),
+        sa.Column('revenue_per_acre', sa.Float(), nullable=True),
+        sa.Column('profit_per_acre', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['harvest_season_id'], ['harvest_seasons.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('harvest_season_id', 'version', name='uq_summary_history_harvest_season_id_version')
+    )
+    op.create_index(op.f('ix_summary_history_id'), 'summary_history', ['id'], unique=False)
+    op.create_index(op.f('ix_summary_history_calculated_at'), 'summary_history', ['calculated_at'], unique=False)
+
+    # Every existing summary becomes a history version, oldest first
+    op.execute(f"""
+        INSERT INTO summary_history (harvest_season_id, version, calculated_at, {HISTORY_COLUMNS})
+        SELECT harvest_season_id,
+               row_number() OVER (PARTITION BY harvest_season_id ORDER BY calculated_at, id),
+               COALESCE(calculated_at, created_at, now()),
+               {HISTORY_COLUMNS}
+        FROM summary_calculations
+    """)
+
+    # Keep only the latest summary of each season; breakdown rows cascade
+    op.execute("""
+        DELETE FROM summary_calculations older
+        USING summary_calculations newer
+        WHERE newer.harvest_season_id = older.harvest_season_id
+          AND (newer.calculated_at, newer.id) > (older.calculated_at, older.id)
+    """)
+
+    op.add_column('summary_calculations', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.execute("""
+        UPDATE summary_calculations
+        SET version = history.latest_version
+        FROM (
+            SELECT harvest_season_id, max(version) AS latest_version
+            FROM summary_history
+            GROUP BY harvest_season_id
+        ) AS history
+        WHERE history.harvest_season_id = summary_calculations.harvest_season_id
+    """)
+
+    op.drop_index(op.f('ix_summary_calculations_harvest_season_id'), table_name='summary_calculations')
+    op.create_index(op.f('ix_summary_calculations_harvest_season_id'), 'summary_calculations', ['harvest_season_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_summary_calculations_harvest_season_id'), table_name='summary_calculations')
+    op.create_index(op.f('ix_summary_calculations_harvest_season_id'), 'summary_calculations', ['harvest_season_id'], unique=False)
+    op.drop_column('summary_calculations', 'version')
+
+    op.drop_index(op.f('ix_summary_history_calculated_at'), table_name='summary_history')
+    op.drop_index(op.f('ix_summary_history_id'), table_name='summary_history')
+    op.drop_table('summary_history')
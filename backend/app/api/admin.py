@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 from sqlalchemy import func
 
 from app.core.database import get_db
 from app.schemas.user import UserResponse
+from app.schemas.summary_calculation import BatchRecalculationRequest, BatchRecalculationJobResponse
+from app.schemas.profiling import ProfilingSettings, ProfilingStatus, ProfileReport
+from app.schemas.slow_query import SlowQueryEntry
 from app.models.user import User
 from app.models.income import IncomeEntry
 from app.models.expense import ExpenseEntry
-from app.utils.auth import get_current_admin_user
+from app.utils.auth import get_current_admin_user, principal_cache
+from app.services.batch_recalculation import batch_recalculation_jobs
+from app.utils.password_hashing import password_hashing
+from app.core.profiling import ProfiledRoute, request_profiler
+from app.core.slow_queries import slow_query_log
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.get("/users", response_model=List[UserResponse])
 def get_all_users(
@@ -44,6 +52,10 @@ def get_platform_stats(
         "total_expenses_tracked": total_expenses
     }
 
+@router.get("/password-hashing")
+def get_password_hashing_metrics(current_user: User = Depends(get_current_admin_user)):
+    return password_hashing.metrics()
+
 @router.delete("/users/{user_id}")
 def deactivate_user(
     user_id: int,
@@ -56,4 +68,74 @@ def deactivate_user(
     
     user.is_active = False
     db.commit()
+    principal_cache.invalidate(user.email)
     return {"message": "User deactivated successfully"}
+
+@router.post("/recalculate-seasons", response_model=BatchRecalculationJobResponse, status_code=202)
+def batch_recalculate_seasons(
+    request: BatchRecalculationRequest,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Queue a recalculation of many harvest seasons across a process pool"""
+    return batch_recalculation_jobs.submit(
+        season_ids=request.season_ids,
+        workers=request.workers,
+        chunk_size=request.chunk_size
+    )
+
+@router.get("/recalculate-seasons/{job_id}", response_model=BatchRecalculationJobResponse)
+def get_batch_recalculation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    job = batch_recalculation_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch recalculation job not found")
+    return job
+
+@router.get("/profiling", response_model=ProfilingStatus)
+def get_profiling_status(current_user: User = Depends(get_current_admin_user)):
+    return request_profiler.status()
+
+@router.put("/profiling", response_model=ProfilingStatus)
+def update_profiling(
+    request: ProfilingSettings,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Profile a fraction of requests on this worker (0 turns sampling off)"""
+    request_profiler.configure(request.sample_rate, request.path_prefix)
+    return request_profiler.status()
+
+@router.get("/profiles", response_model=List[ProfileReport])
+def list_profiles(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Stored request profiles, newest first"""
+    return request_profiler.store.list()[skip:skip + limit]
+
+@router.get("/profiles/{report_id}")
+def download_profile(
+    report_id: str,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Collapsed stacks for flamegraph.pl, speedscope or inferno"""
+    path = request_profiler.store.path(report_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+@router.get("/slow-queries", response_model=List[SlowQueryEntry])
+def get_slow_queries(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Recent statements over SLOW_QUERY_THRESHOLD_MS on this worker, newest first"""
+    return slow_query_log.entries()[skip:skip + limit]
+
+@router.delete("/slow-queries")
+def clear_slow_queries(current_user: User = Depends(get_current_admin_user)):
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
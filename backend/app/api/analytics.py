@@ -1,24 +1,33 @@
 from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
 from typing import List
 from datetime import datetime, date, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
 from app.schemas.analytics import AnalyticsResponse, ProfitLossSummary, CategoryBreakdown, PeerComparison
-from app.models.income import IncomeEntry
-from app.models.expense import ExpenseEntry
+from app.models.expense import ExpenseCategory
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user_async
+from app.services.rollups import get_income_total, get_expense_totals_by_category
+from app.services.peer_stats import peer_stats_cache
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+def _load_user_totals(db: Session, user_id: int, start_date: date, end_date: date):
+    income, _ = get_income_total(db, user_id, start_date, end_date)
+    return income, get_expense_totals_by_category(db, user_id, start_date, end_date)
 
 @router.get("/dashboard", response_model=AnalyticsResponse)
-def get_dashboard_analytics(
+@query_budget(3)
+async def get_dashboard_analytics(
     start_date: date = None,
     end_date: date = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Default to last 30 days if no dates provided
     if not start_date:
@@ -26,38 +35,13 @@ def get_dashboard_analytics(
     if not end_date:
         end_date = date.today()
     
-    # Get user's income and expenses for the period
-    user_income = db.query(func.sum(IncomeEntry.total_earned)).filter(
-        and_(
-            IncomeEntry.user_id == current_user.id,
-            IncomeEntry.harvest_date >= start_date,
-            IncomeEntry.harvest_date <= end_date
-        )
-    ).scalar() or 0
-    
-    user_expenses = db.query(func.sum(ExpenseEntry.amount)).filter(
-        and_(
-            ExpenseEntry.user_id == current_user.id,
-            ExpenseEntry.expense_date >= start_date,
-            ExpenseEntry.expense_date <= end_date
-        )
-    ).scalar() or 0
+    # Get user's income and expenses for the period from the daily rollups
+    user_income, expense_breakdown = await db.run_sync(_load_user_totals, current_user.id, start_date, end_date)
+    user_expenses = sum(total for _, total in expense_breakdown)
     
     # Calculate profit/loss
     profit_loss = user_income - user_expenses
     
-    # Get expense breakdown by category
-    expense_breakdown = db.query(
-        ExpenseEntry.category,
-        func.sum(ExpenseEntry.amount).label('total')
-    ).filter(
-        and_(
-            ExpenseEntry.user_id == current_user.id,
-            ExpenseEntry.expense_date >= start_date,
-            ExpenseEntry.expense_date <= end_date
-        )
-    ).group_by(ExpenseEntry.category).all()
-    
     category_breakdowns = []
     for category, total in expense_breakdown:
         percentage = (total / user_expenses * 100) if user_expenses > 0 else 0
@@ -70,67 +54,37 @@ def get_dashboard_analytics(
     # Get peer comparisons (simplified for MVP)
     peer_comparisons = []
     
-    # State-level comparisons
-    state_users = db.query(User).filter(User.state == current_user.state).all()
-    state_user_ids = [user.id for user in state_users]
+    # State and national averages from the peer stats cache, which may query
+    # with its own sync session on a miss, so it runs on the threadpool
+    peer_stats = await run_in_threadpool(peer_stats_cache.get_averages, current_user.state, start_date, end_date)
+    state_avg_income = peer_stats['state_avg_income']
+    state_avg_expenses = peer_stats['state_avg_expenses']
+    national_avg_income = peer_stats['national_avg_income']
+    national_avg_expenses = peer_stats['national_avg_expenses']
+    percentiles = await run_in_threadpool(
+        peer_stats_cache.get_percentiles, current_user.state, start_date, end_date, user_income, user_expenses
+    )
     
-    if state_user_ids:
-        state_avg_income = db.query(func.avg(IncomeEntry.total_earned)).filter(
-            and_(
-                IncomeEntry.user_id.in_(state_user_ids),
-                IncomeEntry.harvest_date >= start_date,
-                IncomeEntry.harvest_date <= end_date
-            )
-        ).scalar() or 0
-        
-        state_avg_expenses = db.query(func.avg(ExpenseEntry.amount)).filter(
-            and_(
-                ExpenseEntry.user_id.in_(state_user_ids),
-                ExpenseEntry.expense_date >= start_date,
-                ExpenseEntry.expense_date <= end_date
-            )
-        ).scalar() or 0
-        
-        # National averages
-        all_users = db.query(User).all()
-        all_user_ids = [user.id for user in all_users]
-        
-        national_avg_income = db.query(func.avg(IncomeEntry.total_earned)).filter(
-            and_(
-                IncomeEntry.user_id.in_(all_user_ids),
-                IncomeEntry.harvest_date >= start_date,
-                IncomeEntry.harvest_date <= end_date
-            )
-        ).scalar() or 0
-        
-        national_avg_expenses = db.query(func.avg(ExpenseEntry.amount)).filter(
-            and_(
-                ExpenseEntry.user_id.in_(all_user_ids),
-                ExpenseEntry.expense_date >= start_date,
-                ExpenseEntry.expense_date <= end_date
-            )
-        ).scalar() or 0
-        
-        # Add comparisons
-        if state_avg_income > 0:
-            peer_comparisons.append(PeerComparison(
-                metric="Income per Harvest",
-                user_value=user_income,
-                state_average=state_avg_income,
-                national_average=national_avg_income,
-                state_percentile=75,  # Simplified calculation
-                national_percentile=70
-            ))
-        
-        if state_avg_expenses > 0:
-            peer_comparisons.append(PeerComparison(
-                metric="Total Expenses",
-                user_value=user_expenses,
-                state_average=state_avg_expenses,
-                national_average=national_avg_expenses,
-                state_percentile=60,  # Simplified calculation
-                national_percentile=65
-            ))
+    # Add comparisons
+    if state_avg_income > 0:
+        peer_comparisons.append(PeerComparison(
+            metric="Income per Harvest",
+            user_value=user_income,
+            state_average=state_avg_income,
+            national_average=national_avg_income,
+            state_percentile=percentiles['state_income_percentile'],
+            national_percentile=percentiles['national_income_percentile']
+        ))
+    
+    if state_avg_expenses > 0:
+        peer_comparisons.append(PeerComparison(
+            metric="Total Expenses",
+            user_value=user_expenses,
+            state_average=state_avg_expenses,
+            national_average=national_avg_expenses,
+            state_percentile=percentiles['state_expenses_percentile'],
+            national_percentile=percentiles['national_expenses_percentile']
+        ))
     
     # Generate insights
     insights = []
@@ -140,14 +94,7 @@ def get_dashboard_analytics(
         insights.append("Consider reviewing your expenses to improve profitability.")
     
     if user_expenses > 0:
-        fuel_expenses = db.query(func.sum(ExpenseEntry.amount)).filter(
-            and_(
-                ExpenseEntry.user_id == current_user.id,
-                ExpenseEntry.category == "fuel",
-                ExpenseEntry.expense_date >= start_date,
-                ExpenseEntry.expense_date <= end_date
-            )
-        ).scalar() or 0
+        fuel_expenses = sum(total for category, total in expense_breakdown if category == ExpenseCategory.FUEL)
         
         if fuel_expenses / user_expenses > 0.3:
             insights.append("Your fuel costs are high. Consider fuel efficiency improvements.")
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
 from app.schemas.equipment import EquipmentCreate, EquipmentUpdate, EquipmentResponse, EquipmentCostCreate, EquipmentCostResponse
 from app.models.equipment import Equipment, EquipmentCost
 from app.models.harvest_season import HarvestSeason
 from app.models.user import User
-from app.utils.auth import get_current_active_user
-from app.services.calculation_engine import HarvestCalculationEngine
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.utils.pagination import keyset, fetch_page, stream_ndjson
+from app.services.calculation_engine import get_calculation_engine
+from app.services.summary_maintenance import SummaryMaintainer
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/", response_model=EquipmentResponse)
 def create_equipment(
@@ -29,29 +35,39 @@ def create_equipment(
     
     db_equipment = Equipment(**equipment.dict())
     db.add(db_equipment)
+    maintainer = SummaryMaintainer(db)
+    maintainer.equipment_changed(harvest_season.id, None, maintainer.snapshot_equipment(db_equipment, harvest_season))
     db.commit()
     db.refresh(db_equipment)
     return db_equipment
 
 @router.get("/harvest-season/{harvest_season_id}", response_model=List[EquipmentResponse])
-def get_equipment_by_harvest_season(
+@query_budget(3)
+async def get_equipment_by_harvest_season(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    equipment = db.query(Equipment).filter(
-        Equipment.harvest_season_id == harvest_season_id
-    ).all()
-    return equipment
+    query = keyset(
+        select(Equipment).where(Equipment.harvest_season_id == harvest_season_id),
+        None, Equipment.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, EquipmentResponse)
+    return await fetch_page(db, query, None, limit, response)
 
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
 def get_equipment(
@@ -84,10 +100,13 @@ def update_equipment(
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     
+    maintainer = SummaryMaintainer(db)
+    before = maintainer.snapshot_equipment(equipment, equipment.harvest_season)
     update_data = equipment_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(equipment, field, value)
     
+    maintainer.equipment_changed(equipment.harvest_season_id, before, maintainer.snapshot_equipment(equipment, equipment.harvest_season))
     db.commit()
     db.refresh(equipment)
     return equipment
@@ -106,7 +125,10 @@ def delete_equipment(
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     
+    maintainer = SummaryMaintainer(db)
+    before = maintainer.snapshot_equipment(equipment, equipment.harvest_season)
     db.delete(equipment)
+    maintainer.equipment_changed(equipment.harvest_season_id, before, None)
     db.commit()
     return {"message": "Equipment deleted successfully"}
 
@@ -132,24 +154,32 @@ def create_equipment_cost(
     return db_equipment_cost
 
 @router.get("/costs/harvest-season/{harvest_season_id}", response_model=List[EquipmentCostResponse])
-def get_equipment_costs_by_harvest_season(
+@query_budget(3)
+async def get_equipment_costs_by_harvest_season(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    equipment_costs = db.query(EquipmentCost).filter(
-        EquipmentCost.harvest_season_id == harvest_season_id
-    ).all()
-    return equipment_costs
+    query = keyset(
+        select(EquipmentCost).where(EquipmentCost.harvest_season_id == harvest_season_id),
+        EquipmentCost.period_start, EquipmentCost.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, EquipmentCostResponse)
+    return await fetch_page(db, query, 'period_start', limit, response)
 
 @router.post("/{equipment_id}/calculate-costs")
 def calculate_equipment_costs(
@@ -166,18 +196,13 @@ def calculate_equipment_costs(
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     
-    calculation_engine = HarvestCalculationEngine(db)
+    calculation_engine = get_calculation_engine(db)
     harvest_season = db.query(HarvestSeason).filter(
         HarvestSeason.id == equipment.harvest_season_id
     ).first()
     
-    # Calculate costs for this equipment
-    costs = calculation_engine.calculate_period_costs(harvest_season)
-    equipment_costs = [cost for cost in costs if cost.equipment_id == equipment_id]
-    
-    # Save to database
-    for cost in equipment_costs:
-        db.add(cost)
+    # Materialize and bulk insert period rows for this equipment
+    period_count = calculation_engine.persist_period_costs(harvest_season, [equipment])
     db.commit()
     
-    return {"message": f"Equipment costs calculated for {len(equipment_costs)} periods"}
+    return {"message": f"Equipment costs calculated for {period_count} periods"}
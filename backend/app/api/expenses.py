@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.profiling import ProfiledRoute
 from app.schemas.expense import ExpenseEntryCreate, ExpenseEntryUpdate, ExpenseEntryResponse
 from app.models.expense import ExpenseEntry
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.utils.pagination import keyset, fetch_page, stream_ndjson
+from app.services.rollups import RollupMaintainer, snapshot_expense
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/", response_model=ExpenseEntryResponse)
 def create_expense_entry(
@@ -22,31 +27,36 @@ def create_expense_entry(
         **expense_entry.dict()
     )
     db.add(db_expense)
+    RollupMaintainer(db).expense_changed(current_user.id, None, snapshot_expense(db_expense))
     db.commit()
     db.refresh(db_expense)
     return db_expense
 
 @router.get("/", response_model=List[ExpenseEntryResponse])
-def get_expense_entries(
-    skip: int = 0,
-    limit: int = 100,
+async def get_expense_entries(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
     start_date: date = None,
     end_date: date = None,
     category: str = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(ExpenseEntry).filter(ExpenseEntry.user_id == current_user.id)
+    query = select(ExpenseEntry).where(ExpenseEntry.user_id == current_user.id)
     
     if start_date:
-        query = query.filter(ExpenseEntry.expense_date >= start_date)
+        query = query.where(ExpenseEntry.expense_date >= start_date)
     if end_date:
-        query = query.filter(ExpenseEntry.expense_date <= end_date)
+        query = query.where(ExpenseEntry.expense_date <= end_date)
     if category:
-        query = query.filter(ExpenseEntry.category == category)
+        query = query.where(ExpenseEntry.category == category)
     
-    expense_entries = query.offset(skip).limit(limit).all()
-    return expense_entries
+    query = keyset(query, ExpenseEntry.expense_date, ExpenseEntry.id, cursor)
+    if response_format == "ndjson":
+        return stream_ndjson(query, ExpenseEntryResponse)
+    return await fetch_page(db, query, "expense_date", limit, response)
 
 @router.get("/{expense_id}", response_model=ExpenseEntryResponse)
 def get_expense_entry(
@@ -79,10 +89,12 @@ def update_expense_entry(
     if not expense_entry:
         raise HTTPException(status_code=404, detail="Expense entry not found")
     
+    before = snapshot_expense(expense_entry)
     update_data = expense_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(expense_entry, field, value)
     
+    RollupMaintainer(db).expense_changed(current_user.id, before, snapshot_expense(expense_entry))
     db.commit()
     db.refresh(expense_entry)
     return expense_entry
@@ -101,6 +113,7 @@ def delete_expense_entry(
     if not expense_entry:
         raise HTTPException(status_code=404, detail="Expense entry not found")
     
+    RollupMaintainer(db).expense_changed(current_user.id, snapshot_expense(expense_entry), None)
     db.delete(expense_entry)
     db.commit()
     return {"message": "Expense entry deleted successfully"}
@@ -1,19 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
 from app.schemas.harvest_expense import (
     HarvestExpenseCreate, HarvestExpenseUpdate, HarvestExpenseResponse,
     HousingExpenseCreate, HousingExpenseResponse,
     EmployeeExpenseCreate, EmployeeExpenseResponse
 )
+from app.schemas.bulk_import import BulkImportResponse
 from app.models.harvest_expense import HarvestExpense, HousingExpense, EmployeeExpense
 from app.models.harvest_season import HarvestSeason
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.utils.pagination import keyset, fetch_page, stream_ndjson
+from app.services.summary_maintenance import SummaryMaintainer, snapshot_expense
+from app.services.bulk_import import HarvestExpenseImporter, HousingExpenseImporter, EmployeeExpenseImporter, csv_lines
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Harvest Expenses
 @router.post("/", response_model=HarvestExpenseResponse)
@@ -33,29 +41,47 @@ def create_harvest_expense(
     
     db_expense = HarvestExpense(**expense.dict())
     db.add(db_expense)
+    SummaryMaintainer(db).expense_changed(harvest_season.id, None, snapshot_expense(db_expense))
     db.commit()
     db.refresh(db_expense)
     return db_expense
 
-@router.get("/harvest-season/{harvest_season_id}", response_model=List[HarvestExpenseResponse])
-def get_harvest_expenses_by_season(
-    harvest_season_id: int,
+@router.post("/import", response_model=BulkImportResponse)
+def import_harvest_expenses(
+    file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
+):
+    """Import harvest expenses from a CSV with one column per HarvestExpenseCreate field"""
+    return HarvestExpenseImporter(db, current_user.id).run(csv_lines(file))
+
+@router.get("/harvest-season/{harvest_season_id}", response_model=List[HarvestExpenseResponse])
+@query_budget(3)
+async def get_harvest_expenses_by_season(
+    harvest_season_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    expenses = db.query(HarvestExpense).filter(
-        HarvestExpense.harvest_season_id == harvest_season_id
-    ).all()
-    return expenses
+    query = keyset(
+        select(HarvestExpense).where(HarvestExpense.harvest_season_id == harvest_season_id),
+        HarvestExpense.period_start, HarvestExpense.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, HarvestExpenseResponse)
+    return await fetch_page(db, query, 'period_start', limit, response)
 
 @router.get("/{expense_id}", response_model=HarvestExpenseResponse)
 def get_harvest_expense(
@@ -88,10 +114,12 @@ def update_harvest_expense(
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     
+    before = snapshot_expense(expense)
     update_data = expense_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(expense, field, value)
     
+    SummaryMaintainer(db).expense_changed(expense.harvest_season_id, before, snapshot_expense(expense))
     db.commit()
     db.refresh(expense)
     return expense
@@ -110,7 +138,9 @@ def delete_harvest_expense(
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
     
+    before = snapshot_expense(expense)
     db.delete(expense)
+    SummaryMaintainer(db).expense_changed(expense.harvest_season_id, before, None)
     db.commit()
     return {"message": "Expense deleted successfully"}
 
@@ -136,25 +166,42 @@ def create_housing_expense(
     db.refresh(db_expense)
     return db_expense
 
-@router.get("/housing/harvest-season/{harvest_season_id}", response_model=List[HousingExpenseResponse])
-def get_housing_expenses_by_season(
-    harvest_season_id: int,
+@router.post("/housing/import", response_model=BulkImportResponse)
+def import_housing_expenses(
+    file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
+):
+    """Import housing expenses from a CSV with one column per HousingExpenseCreate field"""
+    return HousingExpenseImporter(db, current_user.id).run(csv_lines(file))
+
+@router.get("/housing/harvest-season/{harvest_season_id}", response_model=List[HousingExpenseResponse])
+@query_budget(3)
+async def get_housing_expenses_by_season(
+    harvest_season_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    expenses = db.query(HousingExpense).filter(
-        HousingExpense.harvest_season_id == harvest_season_id
-    ).all()
-    return expenses
+    query = keyset(
+        select(HousingExpense).where(HousingExpense.harvest_season_id == harvest_season_id),
+        HousingExpense.period_start, HousingExpense.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, HousingExpenseResponse)
+    return await fetch_page(db, query, 'period_start', limit, response)
 
 # Employee Expenses
 @router.post("/employees/", response_model=EmployeeExpenseResponse)
@@ -178,22 +225,39 @@ def create_employee_expense(
     db.refresh(db_expense)
     return db_expense
 
-@router.get("/employees/harvest-season/{harvest_season_id}", response_model=List[EmployeeExpenseResponse])
-def get_employee_expenses_by_season(
-    harvest_season_id: int,
+@router.post("/employees/import", response_model=BulkImportResponse)
+def import_employee_expenses(
+    file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
+):
+    """Import employee expenses from a CSV with one column per EmployeeExpenseCreate field"""
+    return EmployeeExpenseImporter(db, current_user.id).run(csv_lines(file))
+
+@router.get("/employees/harvest-season/{harvest_season_id}", response_model=List[EmployeeExpenseResponse])
+@query_budget(3)
+async def get_employee_expenses_by_season(
+    harvest_season_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    expenses = db.query(EmployeeExpense).filter(
-        EmployeeExpense.harvest_season_id == harvest_season_id
-    ).all()
-    return expenses
+    query = keyset(
+        select(EmployeeExpense).where(EmployeeExpense.harvest_season_id == harvest_season_id),
+        EmployeeExpense.period_start, EmployeeExpense.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, EmployeeExpenseResponse)
+    return await fetch_page(db, query, 'period_start', limit, response)
@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
 from app.schemas.revenue import (
     RevenueEntryCreate, RevenueEntryUpdate, RevenueEntryResponse,
     IncomeRateStructureCreate, IncomeRateStructureResponse
 )
+from app.schemas.bulk_import import BulkImportResponse
 from app.models.revenue import RevenueEntry, IncomeRateStructure
 from app.models.harvest_season import HarvestSeason
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.utils.pagination import keyset, fetch_page, stream_ndjson
+from app.services.summary_maintenance import SummaryMaintainer, snapshot_revenue
+from app.services.bulk_import import RevenueImporter, csv_lines
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Revenue Entries
 @router.post("/", response_model=RevenueEntryResponse)
@@ -32,29 +40,47 @@ def create_revenue_entry(
     
     db_revenue = RevenueEntry(**revenue_entry.dict())
     db.add(db_revenue)
+    SummaryMaintainer(db).revenue_changed(harvest_season.id, None, snapshot_revenue(db_revenue))
     db.commit()
     db.refresh(db_revenue)
     return db_revenue
 
-@router.get("/harvest-season/{harvest_season_id}", response_model=List[RevenueEntryResponse])
-def get_revenue_entries_by_season(
-    harvest_season_id: int,
+@router.post("/import", response_model=BulkImportResponse)
+def import_revenue_entries(
+    file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
+):
+    """Import revenue entries from a CSV with one column per RevenueEntryCreate field"""
+    return RevenueImporter(db, current_user.id).run(csv_lines(file))
+
+@router.get("/harvest-season/{harvest_season_id}", response_model=List[RevenueEntryResponse])
+@query_budget(3)
+async def get_revenue_entries_by_season(
+    harvest_season_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    harvest_season = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
+    ))
     
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    revenue_entries = db.query(RevenueEntry).filter(
-        RevenueEntry.harvest_season_id == harvest_season_id
-    ).all()
-    return revenue_entries
+    query = keyset(
+        select(RevenueEntry).where(RevenueEntry.harvest_season_id == harvest_season_id),
+        RevenueEntry.harvest_date, RevenueEntry.id, cursor
+    )
+    if response_format == "ndjson":
+        return stream_ndjson(query, RevenueEntryResponse)
+    return await fetch_page(db, query, 'harvest_date', limit, response)
 
 @router.get("/{revenue_id}", response_model=RevenueEntryResponse)
 def get_revenue_entry(
@@ -87,10 +113,12 @@ def update_revenue_entry(
     if not revenue_entry:
         raise HTTPException(status_code=404, detail="Revenue entry not found")
     
+    before = snapshot_revenue(revenue_entry)
     update_data = revenue_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(revenue_entry, field, value)
     
+    SummaryMaintainer(db).revenue_changed(revenue_entry.harvest_season_id, before, snapshot_revenue(revenue_entry))
     db.commit()
     db.refresh(revenue_entry)
     return revenue_entry
@@ -109,7 +137,9 @@ def delete_revenue_entry(
     if not revenue_entry:
         raise HTTPException(status_code=404, detail="Revenue entry not found")
     
+    before = snapshot_revenue(revenue_entry)
     db.delete(revenue_entry)
+    SummaryMaintainer(db).revenue_changed(revenue_entry.harvest_season_id, before, None)
     db.commit()
     return {"message": "Revenue entry deleted successfully"}
 
@@ -136,6 +166,7 @@ def create_income_rate_structure(
     return db_rate_structure
 
 @router.get("/rate-structures/harvest-season/{harvest_season_id}", response_model=List[IncomeRateStructureResponse])
+@query_budget(3)
 def get_income_rate_structures_by_season(
     harvest_season_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -1,16 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
+import os
+import shutil
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
 from app.schemas.harvest_season import HarvestSeasonCreate, HarvestSeasonUpdate, HarvestSeasonResponse
 from app.models.harvest_season import HarvestSeason
 from app.models.user import User
-from app.utils.auth import get_current_active_user
-from app.services.calculation_engine import HarvestCalculationEngine
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.services.calculation_engine import get_calculation_engine
+from app.services.summary_maintenance import SummaryMaintainer
+from app.services.season_export import ExportUnavailable, export_archive, season_ids_for_user
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+COST_DRIVER_FIELDS = {
+    'estimated_start_date', 'estimated_end_date',
+    'actual_start_date', 'actual_end_date',
+    'interest_rate'
+}
 
 @router.post("/", response_model=HarvestSeasonResponse)
 def create_harvest_season(
@@ -28,16 +44,39 @@ def create_harvest_season(
     return db_harvest_season
 
 @router.get("/", response_model=List[HarvestSeasonResponse])
-def get_harvest_seasons(
+@query_budget(2)
+async def get_harvest_seasons(
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    harvest_seasons = (await db.execute(
+        select(HarvestSeason).where(HarvestSeason.user_id == current_user.id)
+    )).scalars().all()
+    return harvest_seasons
+
+def _export_response(db: Session, season_ids, fmt: str, filename: str) -> FileResponse:
+    try:
+        archive = export_archive(db.connection(), season_ids, fmt)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return FileResponse(
+        archive,
+        media_type="application/zip",
+        filename=f"{filename}-{fmt}.zip",
+        background=BackgroundTask(shutil.rmtree, os.path.dirname(archive), ignore_errors=True)
+    )
+
+@router.get("/export")
+def export_harvest_seasons(
+    export_format: str = Query("parquet", alias="format", pattern="^(parquet|arrow)$"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    harvest_seasons = db.query(HarvestSeason).filter(
-        HarvestSeason.user_id == current_user.id
-    ).all()
-    return harvest_seasons
+    """Zip of one Parquet/Arrow file per table covering all of the user's seasons"""
+    return _export_response(db, season_ids_for_user(current_user.id), export_format, "harvest-seasons")
 
 @router.get("/{harvest_season_id}", response_model=HarvestSeasonResponse)
+@query_budget(2)
 def get_harvest_season(
     harvest_season_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -72,6 +111,10 @@ def update_harvest_season(
     for field, value in update_data.items():
         setattr(harvest_season, field, value)
     
+    # Dates and interest rate drive duration and equipment costs
+    if COST_DRIVER_FIELDS & update_data.keys():
+        SummaryMaintainer(db).season_changed(harvest_season)
+    
     db.commit()
     db.refresh(harvest_season)
     return harvest_season
@@ -109,7 +152,25 @@ def calculate_profit_loss(
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    calculation_engine = HarvestCalculationEngine(db)
+    calculation_engine = get_calculation_engine(db)
     summary = calculation_engine.recalculate_harvest_season(harvest_season_id)
     
     return {"message": "Profit/loss calculation completed", "summary_id": summary.id}
+
+@router.get("/{harvest_season_id}/export")
+def export_harvest_season(
+    harvest_season_id: int,
+    export_format: str = Query("parquet", alias="format", pattern="^(parquet|arrow)$"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Zip of one Parquet/Arrow file per table of the season"""
+    harvest_season = db.query(HarvestSeason.id).filter(
+        HarvestSeason.id == harvest_season_id,
+        HarvestSeason.user_id == current_user.id
+    ).first()
+
+    if not harvest_season:
+        raise HTTPException(status_code=404, detail="Harvest season not found")
+
+    return _export_response(db, harvest_season_id, export_format, f"harvest-season-{harvest_season_id}")
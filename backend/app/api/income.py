@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime, date
 
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
+from app.core.profiling import ProfiledRoute
 from app.schemas.income import IncomeEntryCreate, IncomeEntryUpdate, IncomeEntryResponse
 from app.models.income import IncomeEntry
 from app.models.user import User
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.utils.pagination import keyset, fetch_page, stream_ndjson
+from app.services.rollups import RollupMaintainer, snapshot_income
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.post("/", response_model=IncomeEntryResponse)
 def create_income_entry(
@@ -22,28 +27,33 @@ def create_income_entry(
         **income_entry.dict()
     )
     db.add(db_income)
+    RollupMaintainer(db).income_changed(current_user.id, None, snapshot_income(db_income))
     db.commit()
     db.refresh(db_income)
     return db_income
 
 @router.get("/", response_model=List[IncomeEntryResponse])
-def get_income_entries(
-    skip: int = 0,
-    limit: int = 100,
+async def get_income_entries(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
     start_date: date = None,
     end_date: date = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(IncomeEntry).filter(IncomeEntry.user_id == current_user.id)
+    query = select(IncomeEntry).where(IncomeEntry.user_id == current_user.id)
     
     if start_date:
-        query = query.filter(IncomeEntry.harvest_date >= start_date)
+        query = query.where(IncomeEntry.harvest_date >= start_date)
     if end_date:
-        query = query.filter(IncomeEntry.harvest_date <= end_date)
+        query = query.where(IncomeEntry.harvest_date <= end_date)
     
-    income_entries = query.offset(skip).limit(limit).all()
-    return income_entries
+    query = keyset(query, IncomeEntry.harvest_date, IncomeEntry.id, cursor)
+    if response_format == "ndjson":
+        return stream_ndjson(query, IncomeEntryResponse)
+    return await fetch_page(db, query, "harvest_date", limit, response)
 
 @router.get("/{income_id}", response_model=IncomeEntryResponse)
 def get_income_entry(
@@ -76,10 +86,12 @@ def update_income_entry(
     if not income_entry:
         raise HTTPException(status_code=404, detail="Income entry not found")
     
+    before = snapshot_income(income_entry)
     update_data = income_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(income_entry, field, value)
     
+    RollupMaintainer(db).income_changed(current_user.id, before, snapshot_income(income_entry))
     db.commit()
     db.refresh(income_entry)
     return income_entry
@@ -98,6 +110,7 @@ def delete_income_entry(
     if not income_entry:
         raise HTTPException(status_code=404, detail="Income entry not found")
     
+    RollupMaintainer(db).income_changed(current_user.id, snapshot_income(income_entry), None)
     db.delete(income_entry)
     db.commit()
     return {"message": "Income entry deleted successfully"}
@@ -1,193 +1,207 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional
 
-from app.core.database import get_db
-from app.schemas.summary_calculation import SummaryCalculationResponse, ProfitLossSummary, CostBreakdown, RevenueBreakdown, EquipmentAnalysis
-from app.models.summary_calculation import SummaryCalculation
+from app.core.database import get_db, get_async_db
+from app.core.query_audit import query_budget
+from app.core.profiling import ProfiledRoute
+from app.schemas.summary_calculation import SummaryCalculationResponse, ProfitLossSummary, CostBreakdown, RevenueBreakdown, EquipmentAnalysis, SummaryOverview, RecalculationJobResponse, EquipmentCostAcrossSeasons, SummaryHistoryResponse
+from app.models.summary_calculation import SummaryCalculation, SummaryEquipmentCost, SummaryHistory
 from app.models.harvest_season import HarvestSeason
 from app.models.user import User
-from app.utils.auth import get_current_active_user
-from app.services.calculation_engine import HarvestCalculationEngine
+from app.utils.auth import get_current_active_user, get_current_active_user_async
+from app.services.recalculation_jobs import recalculation_jobs
+from app.services.summary_cache import summary_cache
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
-@router.get("/harvest-season/{harvest_season_id}", response_model=SummaryCalculationResponse)
-def get_summary_calculation(
-    harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
-        HarvestSeason.id == harvest_season_id,
-        HarvestSeason.user_id == current_user.id
-    ).first()
+def _build_summary_views(summary: SummaryCalculation) -> Dict[str, Any]:
+    """Build every view served by this router from a summary"""
+    revenue_by_crop = summary.revenue_by_crop or {}
+    equipment_cost_breakdown = summary.equipment_cost_breakdown or {}
     
-    if not harvest_season:
-        raise HTTPException(status_code=404, detail="Harvest season not found")
+    # Calculate cost per acre by equipment
+    cost_per_acre_by_equipment = {}
+    acres_billed = summary.acres_billed or 1
+    for equipment_name, cost in equipment_cost_breakdown.items():
+        cost_per_acre_by_equipment[equipment_name] = cost / acres_billed
     
-    summary = db.query(SummaryCalculation).filter(
-        SummaryCalculation.harvest_season_id == harvest_season_id
-    ).order_by(SummaryCalculation.calculated_at.desc()).first()
+    return {
+        'summary': SummaryCalculationResponse.model_validate(summary),
+        'profit_loss': ProfitLossSummary(
+            harvest_duration_days=summary.harvest_duration_days or 0,
+            acres_billed=summary.acres_billed or 0,
+            total_revenue=summary.total_revenue,
+            total_expenses=summary.total_expenses,
+            gross_profit=summary.gross_profit,
+            net_profit=summary.net_profit,
+            profit_margin=summary.profit_margin,
+            cost_per_acre=summary.cost_per_acre,
+            revenue_per_acre=summary.revenue_per_acre,
+            profit_per_acre=summary.profit_per_acre
+        ),
+        'cost_breakdown': CostBreakdown(
+            equipment_cost=summary.total_equipment_cost,
+            housing_cost=summary.total_housing_cost,
+            employee_cost=summary.total_employee_cost,
+            fuel_cost=summary.total_fuel_cost,
+            maintenance_cost=summary.total_maintenance_cost,
+            insurance_cost=summary.total_insurance_cost,
+            tax_cost=summary.total_tax_cost,
+            other_cost=summary.total_other_cost,
+            total_cost=summary.total_expenses
+        ),
+        'revenue_breakdown': RevenueBreakdown(
+            total_revenue=summary.total_revenue,
+            revenue_by_crop=revenue_by_crop,
+            revenue_per_acre=summary.revenue_per_acre
+        ),
+        'equipment_analysis': EquipmentAnalysis(
+            equipment_cost_breakdown=equipment_cost_breakdown,
+            cost_per_acre_by_equipment=cost_per_acre_by_equipment
+        )
+    }
+
+async def get_summary_views(harvest_season_id: int, current_user: User, db: AsyncSession) -> Dict[str, Any]:
+    """Ownership check and current-summary lookup in one query, built views from cache"""
+    latest = (await db.execute(
+        select(
+            HarvestSeason.id,
+            SummaryCalculation.id.label('summary_id'),
+            SummaryCalculation.version,
+            SummaryCalculation.updated_at
+        ).outerjoin(
+            SummaryCalculation, SummaryCalculation.harvest_season_id == HarvestSeason.id
+        ).where(
+            HarvestSeason.id == harvest_season_id,
+            HarvestSeason.user_id == current_user.id
+        )
+    )).first()
+    
+    if not latest:
+        raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    if not summary:
+    if latest.summary_id is None:
         raise HTTPException(status_code=404, detail="No summary calculation found for this harvest season")
     
-    return summary
+    views = summary_cache.get(harvest_season_id, latest.summary_id, latest.version, latest.updated_at)
+    if views is None:
+        summary = await db.get(SummaryCalculation, latest.summary_id)
+        views = _build_summary_views(summary)
+        summary_cache.put(harvest_season_id, summary.id, summary.version, summary.updated_at, views)
+    
+    return views
+
+@router.get("/harvest-season/{harvest_season_id}", response_model=SummaryCalculationResponse)
+@query_budget(3)
+async def get_summary_calculation(
+    harvest_season_id: int,
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return (await get_summary_views(harvest_season_id, current_user, db))['summary']
+
+@router.get("/harvest-season/{harvest_season_id}/overview", response_model=SummaryOverview)
+@query_budget(3)
+async def get_summary_overview(
+    harvest_season_id: int,
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """All summary views for a harvest season from a single lookup"""
+    return SummaryOverview(**(await get_summary_views(harvest_season_id, current_user, db)))
 
 @router.get("/harvest-season/{harvest_season_id}/profit-loss", response_model=ProfitLossSummary)
-def get_profit_loss_summary(
+@query_budget(3)
+async def get_profit_loss_summary(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
-        HarvestSeason.id == harvest_season_id,
-        HarvestSeason.user_id == current_user.id
-    ).first()
-    
-    if not harvest_season:
-        raise HTTPException(status_code=404, detail="Harvest season not found")
-    
-    summary = db.query(SummaryCalculation).filter(
-        SummaryCalculation.harvest_season_id == harvest_season_id
-    ).order_by(SummaryCalculation.calculated_at.desc()).first()
-    
-    if not summary:
-        raise HTTPException(status_code=404, detail="No summary calculation found for this harvest season")
-    
-    return ProfitLossSummary(
-        harvest_duration_days=summary.harvest_duration_days or 0,
-        acres_billed=summary.acres_billed or 0,
-        total_revenue=summary.total_revenue,
-        total_expenses=summary.total_expenses,
-        gross_profit=summary.gross_profit,
-        net_profit=summary.net_profit,
-        profit_margin=summary.profit_margin,
-        cost_per_acre=summary.cost_per_acre,
-        revenue_per_acre=summary.revenue_per_acre,
-        profit_per_acre=summary.profit_per_acre
-    )
+    return (await get_summary_views(harvest_season_id, current_user, db))['profit_loss']
 
 @router.get("/harvest-season/{harvest_season_id}/cost-breakdown", response_model=CostBreakdown)
-def get_cost_breakdown(
+@query_budget(3)
+async def get_cost_breakdown(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
-        HarvestSeason.id == harvest_season_id,
-        HarvestSeason.user_id == current_user.id
-    ).first()
-    
-    if not harvest_season:
-        raise HTTPException(status_code=404, detail="Harvest season not found")
-    
-    summary = db.query(SummaryCalculation).filter(
-        SummaryCalculation.harvest_season_id == harvest_season_id
-    ).order_by(SummaryCalculation.calculated_at.desc()).first()
-    
-    if not summary:
-        raise HTTPException(status_code=404, detail="No summary calculation found for this harvest season")
-    
-    return CostBreakdown(
-        equipment_cost=summary.total_equipment_cost,
-        housing_cost=summary.total_housing_cost,
-        employee_cost=summary.total_employee_cost,
-        fuel_cost=summary.total_fuel_cost,
-        maintenance_cost=summary.total_maintenance_cost,
-        insurance_cost=summary.total_insurance_cost,
-        tax_cost=summary.total_tax_cost,
-        other_cost=summary.total_other_cost,
-        total_cost=summary.total_expenses
-    )
+    return (await get_summary_views(harvest_season_id, current_user, db))['cost_breakdown']
 
 @router.get("/harvest-season/{harvest_season_id}/revenue-breakdown", response_model=RevenueBreakdown)
-def get_revenue_breakdown(
+@query_budget(3)
+async def get_revenue_breakdown(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
-        HarvestSeason.id == harvest_season_id,
-        HarvestSeason.user_id == current_user.id
-    ).first()
-    
-    if not harvest_season:
-        raise HTTPException(status_code=404, detail="Harvest season not found")
-    
-    summary = db.query(SummaryCalculation).filter(
-        SummaryCalculation.harvest_season_id == harvest_season_id
-    ).order_by(SummaryCalculation.calculated_at.desc()).first()
-    
-    if not summary:
-        raise HTTPException(status_code=404, detail="No summary calculation found for this harvest season")
-    
-    revenue_by_crop = {}
-    if summary.revenue_by_crop:
-        try:
-            revenue_by_crop = json.loads(summary.revenue_by_crop)
-        except json.JSONDecodeError:
-            revenue_by_crop = {}
-    
-    return RevenueBreakdown(
-        total_revenue=summary.total_revenue,
-        revenue_by_crop=revenue_by_crop,
-        revenue_per_acre=summary.revenue_per_acre
-    )
+    return (await get_summary_views(harvest_season_id, current_user, db))['revenue_breakdown']
 
 @router.get("/harvest-season/{harvest_season_id}/equipment-analysis", response_model=EquipmentAnalysis)
-def get_equipment_analysis(
+@query_budget(3)
+async def get_equipment_analysis(
     harvest_season_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Verify harvest season belongs to user
-    harvest_season = db.query(HarvestSeason).filter(
+    return (await get_summary_views(harvest_season_id, current_user, db))['equipment_analysis']
+
+@router.get("/harvest-season/{harvest_season_id}/history", response_model=List[SummaryHistoryResponse])
+@query_budget(3)
+async def get_summary_history(
+    harvest_season_id: int,
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Recalculated summary versions of a harvest season, newest first"""
+    harvest_season_id = await db.scalar(select(HarvestSeason.id).where(
         HarvestSeason.id == harvest_season_id,
         HarvestSeason.user_id == current_user.id
-    ).first()
-    
-    if not harvest_season:
+    ))
+    if harvest_season_id is None:
         raise HTTPException(status_code=404, detail="Harvest season not found")
-    
-    summary = db.query(SummaryCalculation).filter(
-        SummaryCalculation.harvest_season_id == harvest_season_id
-    ).order_by(SummaryCalculation.calculated_at.desc()).first()
-    
-    if not summary:
-        raise HTTPException(status_code=404, detail="No summary calculation found for this harvest season")
-    
-    equipment_cost_breakdown = {}
-    if summary.equipment_cost_breakdown:
-        try:
-            equipment_cost_breakdown = json.loads(summary.equipment_cost_breakdown)
-        except json.JSONDecodeError:
-            equipment_cost_breakdown = {}
-    
-    # Calculate cost per acre by equipment
-    cost_per_acre_by_equipment = {}
-    acres_billed = summary.acres_billed or 1
-    for equipment_name, cost in equipment_cost_breakdown.items():
-        cost_per_acre_by_equipment[equipment_name] = cost / acres_billed
-    
-    return EquipmentAnalysis(
-        equipment_cost_breakdown=equipment_cost_breakdown,
-        cost_per_acre_by_equipment=cost_per_acre_by_equipment
-    )
 
-@router.post("/harvest-season/{harvest_season_id}/recalculate")
+    return (await db.execute(
+        select(SummaryHistory).where(
+            SummaryHistory.harvest_season_id == harvest_season_id
+        ).order_by(SummaryHistory.version.desc()).limit(limit)
+    )).scalars().all()
+
+@router.get("/equipment-costs", response_model=List[EquipmentCostAcrossSeasons])
+async def get_equipment_costs_across_seasons(
+    equipment_name: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Season cost of each equipment item summed over all of the user's summaries"""
+    query = select(
+        SummaryEquipmentCost.equipment_name,
+        func.sum(SummaryEquipmentCost.cost).label('total_cost'),
+        func.count(func.distinct(SummaryEquipmentCost.harvest_season_id)).label('seasons')
+    ).join(
+        HarvestSeason, HarvestSeason.id == SummaryEquipmentCost.harvest_season_id
+    ).where(
+        HarvestSeason.user_id == current_user.id
+    ).group_by(SummaryEquipmentCost.equipment_name).order_by(SummaryEquipmentCost.equipment_name)
+    if equipment_name is not None:
+        query = query.where(SummaryEquipmentCost.equipment_name == equipment_name)
+
+    return [
+        EquipmentCostAcrossSeasons(equipment_name=row.equipment_name, total_cost=row.total_cost, seasons=row.seasons)
+        for row in (await db.execute(query)).all()
+    ]
+
+@router.post("/harvest-season/{harvest_season_id}/recalculate", response_model=RecalculationJobResponse, status_code=202)
 def recalculate_summary(
     harvest_season_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Recalculate all summary metrics for a harvest season"""
+    """Queue a recalculation of all summary metrics for a harvest season"""
     # Verify harvest season belongs to user
     harvest_season = db.query(HarvestSeason).filter(
         HarvestSeason.id == harvest_season_id,
@@ -197,11 +211,17 @@ def recalculate_summary(
     if not harvest_season:
         raise HTTPException(status_code=404, detail="Harvest season not found")
     
-    calculation_engine = HarvestCalculationEngine(db)
-    summary = calculation_engine.recalculate_harvest_season(harvest_season_id)
+    return recalculation_jobs.submit(harvest_season_id, current_user.id)
+
+@router.get("/jobs/{job_id}", response_model=RecalculationJobResponse)
+def get_recalculation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Report the status and progress of a recalculation job"""
+    job = recalculation_jobs.get(job_id)
+    
+    if not job or job['user_id'] != current_user.id:
+        raise HTTPException(status_code=404, detail="Recalculation job not found")
     
-    return {
-        "message": "Summary calculation completed successfully",
-        "summary_id": summary.id,
-        "calculated_at": summary.calculated_at
-    }
+    return job
@@ -3,11 +3,12 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
+from app.core.profiling import ProfiledRoute
 from app.schemas.user import UserResponse, UserUpdate
 from app.models.user import User
-from app.utils.auth import get_current_active_user, get_current_admin_user
+from app.utils.auth import get_current_active_user, get_current_admin_user, principal_cache
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
@@ -25,6 +26,7 @@ def update_current_user_profile(
     
     db.commit()
     db.refresh(current_user)
+    principal_cache.invalidate(current_user.email)
     return current_user
 
 @router.get("/", response_model=List[UserResponse])
@@ -1,17 +1,163 @@
+from threading import Lock
+from typing import Dict, Any
+import time
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.query_audit import audit_engine, start_request_audit, finish_request_audit
+from app.core.slow_queries import record_slow_queries
+
+class PoolWaitStatsMixin:
+    """Records how long pool checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+class InstrumentedQueuePool(PoolWaitStatsMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(PoolWaitStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+# Async drivers used in place of the configured sync driver
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+def _engine_options(database_url: str, use_async: bool = False) -> Dict[str, Any]:
+    backend = make_url(database_url).get_backend_name()
+    if backend == "sqlite":
+        # Local development: keep SQLAlchemy's default SQLite pooling
+        return {}
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        if use_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+instrument_engine(engine)
+if settings.QUERY_AUDIT_ENABLED:
+    audit_engine(engine)
+if settings.SLOW_QUERY_THRESHOLD_MS >= 0:
+    record_slow_queries(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    audit = start_request_audit(request, db) if settings.QUERY_AUDIT_ENABLED else None
     try:
         yield db
     finally:
         db.close()
+        if audit is not None:
+            finish_request_audit(audit)
+
+# The async engine is created on first use so the async driver is only
+# required by processes that serve async endpoints
+_async_engine = None
+_async_session_factory = None
+
+def get_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = make_url(settings.DATABASE_URL)
+        url = url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}")
+        _async_engine = create_async_engine(url, **_engine_options(settings.DATABASE_URL, use_async=True))
+        instrument_engine(_async_engine.sync_engine)
+        if settings.QUERY_AUDIT_ENABLED:
+            audit_engine(_async_engine.sync_engine)
+        if settings.SLOW_QUERY_THRESHOLD_MS >= 0:
+            # Plans are captured through the sync engine, placeholders rewritten for its driver
+            record_slow_queries(_async_engine.sync_engine, explain_engine=engine)
+        _async_session_factory = async_sessionmaker(_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def get_async_session_factory():
+    get_async_engine()
+    return _async_session_factory
+
+async def get_async_db(request: Request):
+    async with get_async_session_factory()() as db:
+        audit = start_request_audit(request, db.sync_session) if settings.QUERY_AUDIT_ENABLED else None
+        try:
+            yield db
+        finally:
+            if audit is not None:
+                await db.close()
+                finish_request_audit(audit)
+
+async def dispose_async_engine():
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+def get_pool_status() -> Dict[str, Any]:
+    """Connection pool occupancy and checkout wait times for this worker process"""
+    status = _describe_pool(engine.pool)
+    if _async_engine is not None:
+        status["async"] = _describe_pool(_async_engine.pool)
+    return status
+
+def _describe_pool(pool) -> Dict[str, Any]:
+    status = {"pool_class": type(pool).__name__}
+    if not isinstance(pool, QueuePool):
+        return status
+
+    status.update({
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    })
+    if isinstance(pool, PoolWaitStatsMixin):
+        with pool._stats_lock:
+            status.update({
+                "checkouts": pool.checkouts,
+                "timeouts": pool.timeouts,
+                "avg_wait_ms": pool.total_wait_seconds / pool.checkouts * 1000 if pool.checkouts else 0.0,
+                "max_wait_ms": pool.max_wait_seconds * 1000,
+            })
+    return status
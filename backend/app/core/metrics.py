@@ -0,0 +1,178 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Optional, Sequence, Tuple
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements issued by one request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Counter:
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return "\n".join(lines)
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1.0):
+        self.inc(labels, -amount)
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # Per label set: bucket counts (last slot is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[list, list]] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        with self._lock:
+            counts, total = self._values.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{float(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total[0]}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return "\n".join(lines)
+
+class RequestQueryStats:
+    """SQL statements issued while serving one request"""
+
+    __slots__ = ('count', 'seconds', 'scope')
+
+    def __init__(self, scope=None):
+        self.count = 0
+        self.seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> str:
+        return f'{self.scope["method"]} {route_template(self.scope)}'
+
+# Set by the middleware for the duration of a request. Sync handlers run in
+# the threadpool with a copy of the context, so they share the same object.
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed by route", ("method", "route"))
+DB_STATEMENT_SECONDS = Counter("db_statement_duration_seconds_total", "Time spent executing SQL statements by route", ("method", "route"))
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request", "SQL statements executed by a single request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+
+METRICS = [REQUESTS, REQUEST_LATENCY, REQUESTS_IN_FLIGHT, DB_STATEMENTS, DB_STATEMENT_SECONDS, DB_STATEMENTS_PER_REQUEST]
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    return "\n".join(metric.render() for metric in METRICS) + "\n"
+
+def instrument_engine(engine: Engine):
+    """Time every statement on the engine and charge it to the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_times', []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_start_times'].pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - started
+
+def route_template(scope) -> str:
+    """Path template of the route that served the request, e.g. /api/equipment/{equipment_id}"""
+    # Routes of included routers only know their own relative path; FastAPI
+    # records the prefixed one on the effective route context
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    route = effective or scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQL work per route.
+
+    Requests are labelled with the matched route's path template rather than
+    the raw path, so ids in URLs do not create a series each.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = current_query_stats.set(stats)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            current_query_stats.reset(token)
+
+            labels = (scope["method"], route_template(scope))
+            REQUESTS.inc(labels + (str(status[0]),))
+            REQUEST_LATENCY.observe(elapsed, labels)
+            DB_STATEMENTS.inc(labels, stats.count)
+            DB_STATEMENT_SECONDS.inc(labels, stats.seconds)
+            DB_STATEMENTS_PER_REQUEST.observe(stats.count, labels)
@@ -0,0 +1,293 @@
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from threading import Lock, Thread
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import functools
+import inspect
+import json
+import random
+import re
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+
+import anyio
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+from app.core.metrics import route_template
+from app.utils.auth import is_admin_token
+
+BACKEND_ROOT = str(Path(__file__).resolve().parents[2])
+STDLIB_ROOT = sysconfig.get_paths()["stdlib"]
+PROFILE_HEADER = b"x-profile"
+REPORT_ID = re.compile(r"^\d{8}T\d{12}-[0-9a-f]{8}$")
+
+class Profile:
+    """Collapsed stacks sampled while one request was being served.
+
+    The request runs on the event loop in its own task and, for a sync
+    endpoint, on a threadpool thread; the loop thread is sampled only while
+    the request's task is the one running and a pool thread only while it
+    is registered with track_thread.
+    """
+
+    def __init__(self, trigger: str):
+        self.id = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        self.trigger = trigger
+        self.created_at = datetime.utcnow()
+        self.stacks = Counter()
+        self.samples = 0
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        self.threads = set()
+
+    def thread_ids(self) -> List[int]:
+        """Threads currently running this request's code"""
+        thread_ids = list(self.threads)
+        if asyncio.current_task(self.loop) is self.task:
+            thread_ids.append(self.loop_thread)
+        return thread_ids
+
+current_profile: ContextVar[Optional[Profile]] = ContextVar("current_profile", default=None)
+
+def track_thread(func: Callable) -> Callable:
+    """Sample the calling thread into the request's profile while func runs.
+
+    The profile is read from a contextvar, which Starlette copies into the
+    threadpool thread running a sync endpoint.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        thread_id = threading.get_ident()
+        profile.threads.add(thread_id)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.threads.discard(thread_id)
+    return wrapper
+
+class ProfiledRoute(APIRoute):
+    """Route whose sync endpoint's threadpool thread is sampled into the request's profile"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not (inspect.iscoroutinefunction(endpoint) or inspect.isgeneratorfunction(endpoint)):
+            endpoint = track_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+class StackSampler:
+    """Samples the threads serving each active profile's request.
+
+    Each profile only gets the stacks of its own threads (see Profile), so
+    requests served concurrently on the same worker stay out of each
+    other's reports. The thread exits when no profile is active.
+    """
+
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000
+        self._profiles = set()
+        self._thread = None
+        self._labels: Dict[CodeType, str] = {}
+        self._lock = Lock()
+
+    def start(self, profile: Profile):
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self, profile: Profile):
+        with self._lock:
+            self._profiles.discard(profile)
+
+    def _run(self):
+        own_thread = threading.get_ident()
+        while True:
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+            frames = sys._current_frames()
+            stacks = {}
+            for profile in profiles:
+                for thread_id in profile.thread_ids():
+                    if thread_id == own_thread or thread_id not in frames:
+                        continue
+                    if thread_id not in stacks:
+                        stacks[thread_id] = self._collapse(frames[thread_id])
+                    profile.stacks[stacks[thread_id]] += 1
+                profile.samples += 1
+            time.sleep(self.interval)
+
+    def _collapse(self, frame: Optional[FrameType]) -> str:
+        """Stack as root;...;leaf"""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _label(code)
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+def _label(code: CodeType) -> str:
+    filename = code.co_filename
+    if "site-packages" in filename:
+        filename = filename.split("site-packages", 1)[1].lstrip("/\\")
+    elif filename.startswith(BACKEND_ROOT):
+        filename = filename[len(BACKEND_ROOT):].lstrip("/\\")
+    elif filename.startswith(STDLIB_ROOT):
+        filename = filename[len(STDLIB_ROOT):].lstrip("/\\")
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+class ProfileStore:
+    """Reports on disk: <id>.folded collapsed stacks plus <id>.json metadata"""
+
+    def __init__(self, directory: str, max_reports: int):
+        self.directory = Path(directory)
+        self.max_reports = max_reports
+
+    def save(self, profile: Profile, metadata: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        folded = "".join(f"{stack} {count}\n" for stack, count in profile.stacks.most_common())
+        (self.directory / f"{profile.id}.folded").write_text(folded)
+        (self.directory / f"{profile.id}.json").write_text(json.dumps(metadata))
+        self._prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        reports = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                reports.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return reports
+
+    def path(self, report_id: str) -> Optional[Path]:
+        if not REPORT_ID.match(report_id):
+            return None
+        path = self.directory / f"{report_id}.folded"
+        return path if path.exists() else None
+
+    def _prune(self):
+        if self.max_reports <= 0:
+            return
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[self.max_reports:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+class RequestProfiler:
+    """Decides which requests to profile: admin header or a sampling rate.
+
+    The sampling settings are held per worker process.
+    """
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.path_prefix: Optional[str] = None
+        self.sampler = StackSampler(settings.PROFILE_SAMPLE_INTERVAL_MS)
+        self.store = ProfileStore(settings.PROFILE_REPORT_DIR, settings.PROFILE_MAX_REPORTS)
+
+    def configure(self, sample_rate: float, path_prefix: Optional[str] = None):
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'sample_rate': self.sample_rate,
+            'path_prefix': self.path_prefix,
+            'sample_interval_ms': settings.PROFILE_SAMPLE_INTERVAL_MS
+        }
+
+    def sampled(self, path: str) -> bool:
+        if self.sample_rate <= 0:
+            return False
+        if self.path_prefix and not path.startswith(self.path_prefix):
+            return False
+        return random.random() < self.sample_rate
+
+request_profiler = RequestProfiler()
+
+class ProfilingMiddleware:
+    """Runs selected requests under the stack sampler and stores a report.
+
+    A request is profiled when an admin sends X-Profile: 1 or when it is
+    picked by the sampling rate set through the admin API. The report id is
+    returned in the X-Profile-Id response header. Unprofiled requests only
+    pay for a header lookup.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = None
+        if request_profiler.sampled(scope["path"]):
+            trigger = "sampling"
+        elif _header(scope, PROFILE_HEADER) in (b"1", b"true") and await _is_admin(_header(scope, b"authorization")):
+            trigger = "header"
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(trigger)
+        token = current_profile.set(profile)
+        status = [500]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        request_profiler.sampler.start(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_profiler.sampler.stop(profile)
+            current_profile.reset(token)
+            metadata = {
+                'id': profile.id,
+                'created_at': profile.created_at.isoformat(),
+                'trigger': profile.trigger,
+                'method': scope["method"],
+                'path': scope["path"],
+                'route': route_template(scope),
+                'status': status[0],
+                'duration_ms': round(elapsed * 1000, 3),
+                'samples': profile.samples,
+                'sample_interval_ms': settings.PROFILE_SAMPLE_INTERVAL_MS
+            }
+            await anyio.to_thread.run_sync(request_profiler.store.save, profile, metadata)
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+async def _is_admin(authorization: Optional[bytes]) -> bool:
+    if not authorization:
+        return False
+    return await anyio.to_thread.run_sync(is_admin_token, authorization.decode("latin-1"))
@@ -0,0 +1,137 @@
+from collections import Counter
+from typing import Callable, List, Optional
+import logging
+import re
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_IN_LISTS = re.compile(r"\bIN\s*\([^()]*\)", re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_SELECT_LIST = re.compile(r"^SELECT .*? FROM ")
+
+class QueryBudgetExceeded(AssertionError):
+    """A route issued more SQL statements than its declared budget"""
+
+def query_budget(max_statements: int) -> Callable:
+    """Declare the most SQL statements a route may issue per request, auth lookup included"""
+    def decorator(endpoint):
+        endpoint.query_budget = max_statements
+        return endpoint
+    return decorator
+
+def fingerprint(statement: str) -> str:
+    """Statement text with IN lists, literals and whitespace normalised"""
+    statement = _IN_LISTS.sub("IN (...)", statement)
+    statement = _LITERALS.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+def _abbreviate(shape: str) -> str:
+    return _SELECT_LIST.sub("SELECT ... FROM ", shape)
+
+class QueryAudit:
+    """Every SQL statement issued while serving one request.
+
+    Flags statements repeated with identical parameters, statements of the
+    same shape issued QUERY_AUDIT_BURST times or more (N+1 loops) and
+    relationships lazy-loaded that often, and checks the route's budget.
+    """
+
+    def __init__(self, method: str, route: str, budget: Optional[int] = None):
+        self.method = method
+        self.route = route
+        self.budget = budget
+        self.statements: List[str] = []
+        self.exact = Counter()
+        self.lazy_loads = Counter()
+        self.sessions = 0
+
+    def record(self, statement: str, parameters):
+        shape = fingerprint(statement)
+        self.statements.append(shape)
+        self.exact[(shape, repr(parameters))] += 1
+
+    def record_lazy_load(self, relationship: str):
+        self.lazy_loads[relationship] += 1
+
+    def problems(self) -> List[str]:
+        problems = []
+        for (shape, _), count in self.exact.items():
+            if count > 1:
+                problems.append(f"identical statement issued {count} times: {_abbreviate(shape)}")
+        for shape, count in Counter(self.statements).items():
+            if count >= settings.QUERY_AUDIT_BURST and count > self.exact_count(shape):
+                problems.append(f"statement issued {count} times with different parameters: {_abbreviate(shape)}")
+        for relationship, count in self.lazy_loads.items():
+            if count >= settings.QUERY_AUDIT_BURST:
+                problems.append(f"{relationship} lazy-loaded {count} times")
+        return problems
+
+    def exact_count(self, shape: str) -> int:
+        return max(count for (other, _), count in self.exact.items() if other == shape)
+
+    def over_budget(self) -> bool:
+        return self.budget is not None and len(self.statements) > self.budget
+
+    def report(self):
+        """Log any problems; raise QueryBudgetExceeded if enforcing budgets"""
+        problems = self.problems()
+        if self.over_budget():
+            problems.insert(0, f"{len(self.statements)} statements, budget is {self.budget}")
+        if not problems:
+            return
+        summary = f"{self.method} {self.route}:\n  " + "\n  ".join(problems)
+        logger.warning("Query audit %s", summary)
+        if self.over_budget() and settings.QUERY_AUDIT_ENFORCE_BUDGETS:
+            raise QueryBudgetExceeded(summary)
+
+def audit_engine(engine: Engine):
+    """Charge statements on the engine to the audit of the session that issued them"""
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        audit = conn.info.get('query_audit')
+        if audit is not None:
+            audit.record(statement, parameters)
+
+    @event.listens_for(engine, "checkin")
+    def clear_audit(dbapi_connection, connection_record):
+        connection_record.info.pop('query_audit', None)
+
+def start_request_audit(request: Request, session: Session) -> QueryAudit:
+    """Audit the session's statements as part of the request's audit.
+
+    Sync and async sessions opened for the same request share one audit,
+    so the budget covers everything the request runs.
+    """
+    audit = getattr(request.state, 'query_audit', None)
+    if audit is None:
+        budget = getattr(request.scope.get("endpoint"), 'query_budget', None)
+        audit = QueryAudit(request.method, route_template(request.scope), budget)
+        request.state.query_audit = audit
+    audit.sessions += 1
+
+    @event.listens_for(session, "after_begin")
+    def bind_connection(session, transaction, connection):
+        connection.info['query_audit'] = audit
+
+    @event.listens_for(session, "do_orm_execute")
+    def record_lazy_load(orm_execute_state: ORMExecuteState):
+        if orm_execute_state.lazy_loaded_from is not None:
+            audit.record_lazy_load(str(orm_execute_state.loader_strategy_path.path[-1]))
+
+    return audit
+
+def finish_request_audit(audit: QueryAudit):
+    """Report once the last session of the request is closed"""
+    audit.sessions -= 1
+    if audit.sessions == 0:
+        audit.report()
@@ -0,0 +1,166 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import count
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("select", "with")
+LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+_DOLLAR_PLACEHOLDERS = re.compile(r"'(?:[^']|'')*'|\$(\d+)|%")
+
+def parameter_shape(parameters, executemany: bool = False) -> Any:
+    """Types of the bound parameters, never their values"""
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'row': parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+def dollar_to_format(statement: str, parameters) -> Tuple[str, tuple]:
+    """Rewrite asyncpg's $n placeholders as %s, with parameters in placeholder order"""
+    ordered = []
+
+    def replace(match):
+        if match.group(1):
+            ordered.append(parameters[int(match.group(1)) - 1])
+            return "%s"
+        return match.group(0).replace("%", "%%")
+
+    return _DOLLAR_PLACEHOLDERS.sub(replace, statement), tuple(ordered)
+
+# (statement paramstyle, explain engine paramstyle) -> rewrite
+PARAMSTYLE_TRANSLATIONS = {
+    ("numeric_dollar", "format"): dollar_to_format,
+    ("numeric_dollar", "pyformat"): dollar_to_format
+}
+
+class SlowQueryLog:
+    """Ring buffer of statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Each entry is logged and kept with its route and parameter shape; the
+    plan is captured afterwards on a single background thread by running
+    EXPLAIN (ANALYZE) (EXPLAIN QUERY PLAN on SQLite) on a connection of the
+    sync engine, so the request that hit the slow statement is not delayed.
+    Only SELECTs are explained, since ANALYZE executes the statement, and
+    those with a FOR UPDATE/SHARE clause get a plain EXPLAIN so the row locks
+    are not taken again. On PostgreSQL the explain transaction runs under
+    SLOW_QUERY_EXPLAIN_LOCK_TIMEOUT_MS and SLOW_QUERY_EXPLAIN_TIMEOUT_MS.
+    """
+
+    def __init__(self, max_entries: int):
+        self._entries = deque(maxlen=max_entries)
+        self._ids = count(1)
+        self._executor = None
+        self._lock = Lock()
+
+    def record(self, explain_engine: Optional[Engine], statement: str, parameters, executemany: bool, duration: float,
+               translate: Optional[Callable] = None):
+        stats = current_query_stats.get()
+        entry = {
+            'id': next(self._ids),
+            'recorded_at': datetime.utcnow(),
+            'duration_ms': round(duration * 1000, 3),
+            'route': stats.route if stats is not None and stats.scope is not None else None,
+            'statement': statement,
+            'parameter_shape': parameter_shape(parameters, executemany),
+            'plan': None,
+            'plan_status': 'pending'
+        }
+        logger.warning("Slow query %.1f ms on %s: %s", entry['duration_ms'], entry['route'] or "no request", statement)
+
+        if not settings.SLOW_QUERY_EXPLAIN or explain_engine is None:
+            entry['plan_status'] = 'disabled' if not settings.SLOW_QUERY_EXPLAIN else 'unavailable'
+        elif executemany or not statement.lstrip().lower().startswith(EXPLAINABLE):
+            entry['plan_status'] = 'skipped'
+        with self._lock:
+            self._entries.append(entry)
+            if entry['plan_status'] == 'pending':
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+                self._executor.submit(self._explain, explain_engine, entry, statement, parameters, translate)
+
+    def _explain(self, explain_engine: Engine, entry: Dict[str, Any], statement: str, parameters, translate: Optional[Callable] = None):
+        dialect = explain_engine.dialect.name
+        if dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif dialect == "postgresql" and not LOCKING_CLAUSE.search(statement):
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+        else:
+            prefix = "EXPLAIN "
+        try:
+            if translate is not None:
+                statement, parameters = translate(statement, parameters)
+            with explain_engine.connect() as conn:
+                conn = conn.execution_options(slow_query_log=False)
+                with conn.begin():
+                    if dialect == "postgresql":
+                        conn.exec_driver_sql(f"SET LOCAL lock_timeout = {int(settings.SLOW_QUERY_EXPLAIN_LOCK_TIMEOUT_MS)}")
+                        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+                    rows = conn.exec_driver_sql(prefix + statement, parameters or ()).all()
+            if dialect == "sqlite":
+                plan = "\n".join(row[-1] for row in rows)
+            else:
+                plan = "\n".join(str(row[0]) for row in rows)
+            status = 'captured'
+        except Exception as exc:
+            plan, status = None, f"failed: {exc.__class__.__name__}: {exc}"
+        with self._lock:
+            entry['plan'] = plan
+            entry['plan_status'] = status
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Newest first"""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
+
+def record_slow_queries(engine: Engine, explain_engine: Optional[Engine] = None):
+    """Time statements on the engine and log those over the threshold.
+
+    Plans are captured on explain_engine (the engine itself by default).
+    Statements are rewritten for its paramstyle where PARAMSTYLE_TRANSLATIONS
+    knows how; otherwise slow statements are logged without a plan.
+    """
+    explain_engine = explain_engine or engine
+    translate = None
+    if explain_engine.dialect.paramstyle != engine.dialect.paramstyle:
+        translate = PARAMSTYLE_TRANSLATIONS.get((engine.dialect.paramstyle, explain_engine.dialect.paramstyle))
+        if translate is None:
+            explain_engine = None
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_start_times', []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def check_duration(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['slow_query_start_times'].pop()
+        if duration >= threshold and conn.get_execution_options().get('slow_query_log', True):
+            slow_query_log.record(explain_engine, statement, parameters, executemany, duration, translate)
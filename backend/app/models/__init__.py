@@ -5,4 +5,5 @@ from .harvest_season import HarvestSeason, PayCycle
 from .equipment import Equipment, EquipmentCost, EquipmentType, OwnershipType
 from .harvest_expense import HarvestExpense, HousingExpense, EmployeeExpense, ExpenseCategory as HarvestExpenseCategory, HousingType, EmployeeExpenseType
 from .revenue import RevenueEntry, IncomeRateStructure, CropType, PricingModel
-from .summary_calculation import SummaryCalculation
+from .summary_calculation import SummaryCalculation, SummaryCropRevenue, SummaryEquipmentCost, SummaryHistory
+from .rollup import DailyIncomeRollup, DailyExpenseRollup
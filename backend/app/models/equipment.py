@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Enum, Text, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Enum, Text, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -22,7 +22,7 @@ class Equipment(Base):
     __tablename__ = "equipment"
 
     id = Column(Integer, primary_key=True, index=True)
-    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
     
     # Equipment Details
     name = Column(String, nullable=False)
@@ -55,10 +55,13 @@ class Equipment(Base):
 
 class EquipmentCost(Base):
     __tablename__ = "equipment_costs"
+    __table_args__ = (
+        Index('ix_equipment_costs_harvest_season_id_period_start', 'harvest_season_id', 'period_start'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
-    equipment_id = Column(Integer, ForeignKey("equipment.id"), nullable=False)
+    equipment_id = Column(Integer, ForeignKey("equipment.id"), nullable=False, index=True)
     
     # Cost Details
     period_start = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -16,6 +16,9 @@ class ExpenseCategory(str, enum.Enum):
 
 class ExpenseEntry(Base):
     __tablename__ = "expense_entries"
+    __table_args__ = (
+        Index('ix_expense_entries_user_id_expense_date_category', 'user_id', 'expense_date', 'category', postgresql_include=['amount']),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -30,12 +30,15 @@ class EmployeeExpenseType(str, enum.Enum):
 
 class HarvestExpense(Base):
     __tablename__ = "harvest_expenses"
+    __table_args__ = (
+        Index('ix_harvest_expenses_harvest_season_id_category', 'harvest_season_id', 'category', postgresql_include=['amount']),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
     
     # Expense Details
-    category = Column(Enum(ExpenseCategory), nullable=False)
+    category = Column(Enum(ExpenseCategory, name="harvestexpensecategory"), nullable=False)
     subcategory = Column(String, nullable=True)  # For housing type, employee type, etc.
     description = Column(Text, nullable=True)
     
@@ -58,7 +61,7 @@ class HousingExpense(Base):
     __tablename__ = "housing_expenses"
 
     id = Column(Integer, primary_key=True, index=True)
-    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
     
     # Housing Details
     housing_type = Column(Enum(HousingType), nullable=False)
@@ -83,7 +86,7 @@ class EmployeeExpense(Base):
     __tablename__ = "employee_expenses"
 
     id = Column(Integer, primary_key=True, index=True)
-    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
     
     # Employee Details
     expense_type = Column(Enum(EmployeeExpenseType), nullable=False)
@@ -14,7 +14,7 @@ class HarvestSeason(Base):
     __tablename__ = "harvest_seasons"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Business Information
     business_name = Column(String, nullable=False)
@@ -39,8 +39,9 @@ class HarvestSeason(Base):
 
     # Relationships
     user = relationship("User", back_populates="harvest_seasons")
-    equipment = relationship("Equipment", back_populates="harvest_season", cascade="all, delete-orphan")
+    equipment = relationship("Equipment", back_populates="harvest_season", cascade="all, delete-orphan", order_by="Equipment.id")
     equipment_costs = relationship("EquipmentCost", back_populates="harvest_season", cascade="all, delete-orphan")
-    expenses = relationship("HarvestExpense", back_populates="harvest_season", cascade="all, delete-orphan")
-    revenue_entries = relationship("RevenueEntry", back_populates="harvest_season", cascade="all, delete-orphan")
+    expenses = relationship("HarvestExpense", back_populates="harvest_season", cascade="all, delete-orphan", order_by="HarvestExpense.id")
+    revenue_entries = relationship("RevenueEntry", back_populates="harvest_season", cascade="all, delete-orphan", order_by="RevenueEntry.id")
     summary_calculations = relationship("SummaryCalculation", back_populates="harvest_season", cascade="all, delete-orphan")
+    summary_history = relationship("SummaryHistory", back_populates="harvest_season", cascade="all, delete-orphan")
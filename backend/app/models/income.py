@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class IncomeEntry(Base):
     __tablename__ = "income_entries"
+    __table_args__ = (
+        Index('ix_income_entries_user_id_harvest_date', 'user_id', 'harvest_date', postgresql_include=['total_earned']),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
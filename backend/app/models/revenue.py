@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -19,6 +19,9 @@ class PricingModel(str, enum.Enum):
 
 class RevenueEntry(Base):
     __tablename__ = "revenue_entries"
+    __table_args__ = (
+        Index('ix_revenue_entries_harvest_season_id_crop_type', 'harvest_season_id', 'crop_type', postgresql_include=['quantity', 'total_revenue', 'pricing_model']),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
@@ -52,7 +55,7 @@ class IncomeRateStructure(Base):
     __tablename__ = "income_rate_structures"
 
     id = Column(Integer, primary_key=True, index=True)
-    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
     
     # Rate Structure
     crop_type = Column(Enum(CropType), nullable=False)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, Enum, UniqueConstraint, Index
+from app.core.database import Base
+from app.models.expense import ExpenseCategory
+
+class DailyIncomeRollup(Base):
+    __tablename__ = "daily_income_rollups"
+    __table_args__ = (
+        UniqueConstraint('user_id', 'day', name='uq_daily_income_rollups_user_day'),
+        Index('ix_daily_income_rollups_day', 'day'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    
+    # Aggregates of income_entries.total_earned for the day
+    income_sum = Column(Float, nullable=False, default=0.0)
+    income_count = Column(Integer, nullable=False, default=0)
+
+class DailyExpenseRollup(Base):
+    __tablename__ = "daily_expense_rollups"
+    __table_args__ = (
+        UniqueConstraint('user_id', 'day', 'category', name='uq_daily_expense_rollups_user_day_category'),
+        Index('ix_daily_expense_rollups_day', 'day'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    category = Column(Enum(ExpenseCategory), nullable=False)
+    
+    # Aggregates of expense_entries.amount for the day and category
+    expense_sum = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
@@ -1,13 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from typing import Dict
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# JSONB on PostgreSQL, the generic JSON type (stored as text) elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class SummaryCalculation(Base):
     __tablename__ = "summary_calculations"
 
     id = Column(Integer, primary_key=True, index=True)
-    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    # One current summary per season; earlier versions live in summary_history
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, unique=True, index=True)
+    version = Column(Integer, nullable=False, default=1)
     
     # Harvest Summary
     harvest_duration_days = Column(Float, nullable=True)
@@ -26,7 +33,7 @@ class SummaryCalculation(Base):
     
     # Revenue Summary
     total_revenue = Column(Float, default=0.0)
-    revenue_by_crop = Column(Text, nullable=True)  # JSON string
+    revenue_by_crop = Column(JSONType, nullable=True)  # {crop: revenue}
     
     # Profit/Loss
     gross_profit = Column(Float, default=0.0)
@@ -39,7 +46,7 @@ class SummaryCalculation(Base):
     profit_per_acre = Column(Float, default=0.0)
     
     # Equipment Analysis
-    equipment_cost_breakdown = Column(Text, nullable=True)  # JSON string
+    equipment_cost_breakdown = Column(JSONType, nullable=True)  # {equipment name: cost}
     
     # Calculation timestamp
     calculated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -48,3 +55,87 @@ class SummaryCalculation(Base):
 
     # Relationships
     harvest_season = relationship("HarvestSeason", back_populates="summary_calculations")
+    crop_revenues = relationship("SummaryCropRevenue", back_populates="summary_calculation", cascade="all, delete-orphan")
+    equipment_costs = relationship("SummaryEquipmentCost", back_populates="summary_calculation", cascade="all, delete-orphan")
+
+    def set_revenue_by_crop(self, revenue_by_crop: Dict[str, float]):
+        """Store the per-crop revenue in the JSON column and its child rows"""
+        self.revenue_by_crop = dict(revenue_by_crop)
+        _sync_breakdown_rows(self.crop_revenues, 'crop_type', 'total_revenue', revenue_by_crop,
+                             lambda crop, revenue: SummaryCropRevenue(
+                                 harvest_season_id=self.harvest_season_id, crop_type=crop, total_revenue=revenue))
+
+    def set_equipment_cost_breakdown(self, equipment_cost_breakdown: Dict[str, float]):
+        """Store the per-equipment season cost in the JSON column and its child rows"""
+        self.equipment_cost_breakdown = dict(equipment_cost_breakdown)
+        _sync_breakdown_rows(self.equipment_costs, 'equipment_name', 'cost', equipment_cost_breakdown,
+                             lambda name, cost: SummaryEquipmentCost(
+                                 harvest_season_id=self.harvest_season_id, equipment_name=name, cost=cost))
+
+def _sync_breakdown_rows(rows, key_attr: str, value_attr: str, breakdown: Dict[str, float], factory):
+    """Update child rows in place so only changed keys are written"""
+    existing = {getattr(row, key_attr): row for row in rows}
+    for key, row in existing.items():
+        if key not in breakdown:
+            rows.remove(row)
+    for key, value in breakdown.items():
+        if key in existing:
+            setattr(existing[key], value_attr, value)
+        else:
+            rows.append(factory(key, value))
+
+class SummaryCropRevenue(Base):
+    """Revenue of one crop in a summary, queryable across seasons"""
+    __tablename__ = "summary_crop_revenues"
+    __table_args__ = (
+        Index('ix_summary_crop_revenues_crop_type_harvest_season_id', 'crop_type', 'harvest_season_id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    summary_calculation_id = Column(Integer, ForeignKey("summary_calculations.id", ondelete="CASCADE"), nullable=False, index=True)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
+    crop_type = Column(String, nullable=False)
+    total_revenue = Column(Float, nullable=False, default=0.0)
+
+    summary_calculation = relationship("SummaryCalculation", back_populates="crop_revenues")
+
+class SummaryEquipmentCost(Base):
+    """Season cost of one equipment item in a summary, queryable across seasons"""
+    __tablename__ = "summary_equipment_costs"
+    __table_args__ = (
+        Index('ix_summary_equipment_costs_equipment_name_harvest_season_id', 'equipment_name', 'harvest_season_id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    summary_calculation_id = Column(Integer, ForeignKey("summary_calculations.id", ondelete="CASCADE"), nullable=False, index=True)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False, index=True)
+    equipment_name = Column(String, nullable=False)
+    cost = Column(Float, nullable=False, default=0.0)
+
+    summary_calculation = relationship("SummaryCalculation", back_populates="equipment_costs")
+
+class SummaryHistory(Base):
+    """Compact, append-only record of each recalculated summary version"""
+    __tablename__ = "summary_history"
+    __table_args__ = (
+        UniqueConstraint('harvest_season_id', 'version', name='uq_summary_history_harvest_season_id_version'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    harvest_season_id = Column(Integer, ForeignKey("harvest_seasons.id"), nullable=False)
+    version = Column(Integer, nullable=False)
+    calculated_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    harvest_duration_days = Column(Float, nullable=True)
+    acres_billed = Column(Float, nullable=True)
+    total_equipment_cost = Column(Float, default=0.0)
+    total_expenses = Column(Float, default=0.0)
+    total_revenue = Column(Float, default=0.0)
+    gross_profit = Column(Float, default=0.0)
+    net_profit = Column(Float, default=0.0)
+    profit_margin = Column(Float, default=0.0)
+    cost_per_acre = Column(Float, default=0.0)
+    revenue_per_acre = Column(Float, default=0.0)
+    profit_per_acre = Column(Float, default=0.0)
+
+    harvest_season = relationship("HarvestSeason", back_populates="summary_history")
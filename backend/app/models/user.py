@@ -16,7 +16,7 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
-    state = Column(String, nullable=False)
+    state = Column(String, nullable=False, index=True)
     billing_method = Column(Enum(BillingMethod), nullable=False)
     equipment_owned = Column(Boolean, default=True)
     equipment_details = Column(String, nullable=True)
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class BulkImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[BulkImportRowError]
+    errors_truncated: bool
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional
+
+class ProfilingSettings(BaseModel):
+    sample_rate: float = Field(0.0, ge=0, le=1)  # Fraction of requests profiled on this worker
+    path_prefix: Optional[str] = None  # Only sample requests under this path
+
+class ProfilingStatus(ProfilingSettings):
+    sample_interval_ms: int
+
+class ProfileReport(BaseModel):
+    id: str
+    created_at: datetime
+    trigger: str
+    method: str
+    path: str
+    route: str
+    status: int
+    duration_ms: float
+    samples: int
+    sample_interval_ms: int
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+
+class SlowQueryEntry(BaseModel):
+    id: int
+    recorded_at: datetime
+    duration_ms: float
+    route: Optional[str] = None  # "GET /api/..." when issued while serving a request
+    statement: str
+    parameter_shape: Any  # Parameter types, never values
+    plan: Optional[str] = None
+    plan_status: str  # pending, captured, skipped, disabled, unavailable or failed: <error>
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class SummaryCalculationBase(BaseModel):
@@ -15,18 +15,19 @@ class SummaryCalculationBase(BaseModel):
     total_other_cost: float = Field(default=0.0, ge=0)
     total_expenses: float = Field(default=0.0, ge=0)
     total_revenue: float = Field(default=0.0, ge=0)
-    revenue_by_crop: Optional[str] = None  # JSON string
+    revenue_by_crop: Optional[Dict[str, float]] = None
     gross_profit: float = Field(default=0.0)
     net_profit: float = Field(default=0.0)
     profit_margin: float = Field(default=0.0)
     cost_per_acre: float = Field(default=0.0, ge=0)
     revenue_per_acre: float = Field(default=0.0, ge=0)
     profit_per_acre: float = Field(default=0.0)
-    equipment_cost_breakdown: Optional[str] = None  # JSON string
+    equipment_cost_breakdown: Optional[Dict[str, float]] = None
 
 class SummaryCalculationResponse(SummaryCalculationBase):
     id: int
     harvest_season_id: int
+    version: int
     calculated_at: datetime
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -34,6 +35,25 @@ class SummaryCalculationResponse(SummaryCalculationBase):
     class Config:
         from_attributes = True
 
+class SummaryHistoryResponse(BaseModel):
+    harvest_season_id: int
+    version: int
+    calculated_at: datetime
+    harvest_duration_days: Optional[float] = None
+    acres_billed: Optional[float] = None
+    total_equipment_cost: float
+    total_expenses: float
+    total_revenue: float
+    gross_profit: float
+    net_profit: float
+    profit_margin: float
+    cost_per_acre: float
+    revenue_per_acre: float
+    profit_per_acre: float
+
+    class Config:
+        from_attributes = True
+
 class ProfitLossSummary(BaseModel):
     harvest_duration_days: float
     acres_billed: float
@@ -65,3 +85,52 @@ class RevenueBreakdown(BaseModel):
 class EquipmentAnalysis(BaseModel):
     equipment_cost_breakdown: Dict[str, float]
     cost_per_acre_by_equipment: Dict[str, float]
+
+class EquipmentCostAcrossSeasons(BaseModel):
+    equipment_name: str
+    total_cost: float
+    seasons: int
+
+class SummaryOverview(BaseModel):
+    summary: SummaryCalculationResponse
+    profit_loss: ProfitLossSummary
+    cost_breakdown: CostBreakdown
+    revenue_breakdown: RevenueBreakdown
+    equipment_analysis: EquipmentAnalysis
+
+class BatchRecalculationRequest(BaseModel):
+    season_ids: Optional[List[int]] = None  # All seasons when omitted
+    workers: Optional[int] = Field(None, ge=1)
+    chunk_size: Optional[int] = Field(None, ge=1)
+
+class BatchRecalculationResponse(BaseModel):
+    requested_seasons: int
+    recalculated_seasons: int
+    chunks: int
+    failed_chunks: List[Dict[str, Any]]
+    workers: int
+    elapsed_seconds: float
+    seasons_per_second: float
+
+class BatchRecalculationJobResponse(BaseModel):
+    job_id: str
+    status: str
+    completed_chunks: int
+    chunks: Optional[int] = None  # Known once the batch has started
+    result: Optional[BatchRecalculationResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class RecalculationJobResponse(BaseModel):
+    job_id: str
+    harvest_season_id: int
+    status: str
+    stage: str
+    progress: float
+    summary_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,91 @@
+from typing import Dict, Any
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from app.models.harvest_season import HarvestSeason
+from app.models.harvest_expense import HarvestExpense
+from app.models.revenue import RevenueEntry, PricingModel
+from app.models.summary_calculation import SummaryCalculation
+from app.services.calculation_engine import HarvestCalculationEngine
+
+class SqlAggregateCalculationEngine(HarvestCalculationEngine):
+    """Calculation engine that pushes expense and revenue aggregation into SQL.
+
+    Category sums, crop sums and per-acre quantity come from GROUP BY queries
+    against harvest_expenses and revenue_entries, so only one row per category
+    or crop is transferred instead of every ORM row of the season.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self._revenue_groups = {}
+
+    def query_revenue_groups(self, harvest_season: HarvestSeason) -> list:
+        """Revenue and per-acre quantity per crop, in order of first entry"""
+        if harvest_season.id in self._revenue_groups:
+            return self._revenue_groups[harvest_season.id]
+
+        groups = self.db.query(
+            RevenueEntry.crop_type,
+            func.sum(RevenueEntry.total_revenue).label('total_revenue'),
+            func.sum(
+                case((RevenueEntry.pricing_model == PricingModel.PER_ACRE, RevenueEntry.quantity), else_=0.0)
+            ).label('acres_billed')
+        ).filter(
+            RevenueEntry.harvest_season_id == harvest_season.id
+        ).group_by(
+            RevenueEntry.crop_type
+        ).order_by(
+            func.min(RevenueEntry.id)
+        ).all()
+
+        self._revenue_groups[harvest_season.id] = groups
+        return groups
+
+    def calculate_expense_totals(self, harvest_season: HarvestSeason) -> Dict[str, float]:
+        """Calculate total expenses by category"""
+        totals = {
+            'fuel': 0.0,
+            'maintenance': 0.0,
+            'housing': 0.0,
+            'employees': 0.0,
+            'insurance': 0.0,
+            'taxes': 0.0,
+            'other': 0.0
+        }
+
+        category_sums = self.db.query(
+            HarvestExpense.category,
+            func.sum(HarvestExpense.amount)
+        ).filter(
+            HarvestExpense.harvest_season_id == harvest_season.id
+        ).group_by(HarvestExpense.category).all()
+
+        for category, amount in category_sums:
+            if category.value in totals:
+                totals[category.value] += amount
+
+        return totals
+
+    def calculate_revenue_totals(self, harvest_season: HarvestSeason) -> Dict[str, Any]:
+        """Calculate total revenue and breakdown by crop"""
+        revenue_by_crop = {
+            group.crop_type.value: group.total_revenue
+            for group in self.query_revenue_groups(harvest_season)
+        }
+
+        return {
+            'total_revenue': sum(revenue_by_crop.values(), 0.0),
+            'revenue_by_crop': revenue_by_crop
+        }
+
+    def calculate_acres_billed(self, harvest_season: HarvestSeason) -> float:
+        """Calculate acres billed from per-acre revenue entries"""
+        return sum(group.acres_billed for group in self.query_revenue_groups(harvest_season))
+
+    def calculate_profit_loss(self, harvest_season: HarvestSeason) -> SummaryCalculation:
+        """Calculate comprehensive profit/loss summary"""
+        self._revenue_groups.pop(harvest_season.id, None)
+        try:
+            return super().calculate_profit_loss(harvest_season)
+        finally:
+            self._revenue_groups.pop(harvest_season.id, None)
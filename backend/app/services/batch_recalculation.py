@@ -0,0 +1,174 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from threading import Lock
+from typing import Callable, Dict, List, Any, Optional
+import multiprocessing
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models.harvest_season import HarvestSeason
+from app.services.calculation_engine import get_calculation_engine
+from app.services.summary_store import save_summaries
+from app.services.summary_cache import summary_cache
+from app.services.recalculation_jobs import JobStatus
+
+def _init_worker():
+    # Never reuse a parent's pooled connections, whatever the start method
+    engine.dispose(close=False)
+
+def recalculate_chunk(season_ids: List[int], backend: Optional[str] = None) -> int:
+    """Recalculate one chunk of seasons in a single transaction.
+
+    Runs inside a worker process with its own session. The chunk's current
+    summaries are upserted together and their history appended in one insert.
+    """
+    db = SessionLocal()
+    try:
+        calculation_engine = get_calculation_engine(db, backend)
+        harvest_seasons = db.query(HarvestSeason).filter(
+            HarvestSeason.id.in_(season_ids)
+        ).all()
+        summaries = [calculation_engine.calculate_profit_loss(season) for season in harvest_seasons]
+
+        save_summaries(db, summaries)
+        db.commit()
+        return len(summaries)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def get_all_season_ids(user_id: Optional[int] = None) -> List[int]:
+    db = SessionLocal()
+    try:
+        query = db.query(HarvestSeason.id)
+        if user_id is not None:
+            query = query.filter(HarvestSeason.user_id == user_id)
+        return [season_id for (season_id,) in query.order_by(HarvestSeason.id).all()]
+    finally:
+        db.close()
+
+def recalculate_seasons(
+    season_ids: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    backend: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """Recalculate many seasons across a process pool and report throughput.
+
+    Workers are spawned rather than forked: the web worker runs several
+    threads (job pools, bcrypt, peer stats, profiler), and a child forked
+    while one of them holds a lock can deadlock. progress is called with
+    (finished chunks, total chunks) as chunks complete.
+    """
+    if season_ids is None:
+        season_ids = get_all_season_ids()
+    workers = workers or settings.BATCH_RECALCULATION_WORKERS
+    chunk_size = chunk_size or settings.BATCH_RECALCULATION_CHUNK_SIZE
+
+    chunks = [season_ids[i:i + chunk_size] for i in range(0, len(season_ids), chunk_size)]
+    recalculated = 0
+    failed_chunks = []
+
+    started = time.perf_counter()
+    if chunks:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        ) as executor:
+            futures = {executor.submit(recalculate_chunk, chunk, backend): chunk for chunk in chunks}
+            for finished, future in enumerate(as_completed(futures), start=1):
+                try:
+                    recalculated += future.result()
+                except Exception as e:
+                    failed_chunks.append({'season_ids': futures[future], 'error': str(e)})
+                if progress is not None:
+                    progress(finished, len(chunks))
+    elapsed = time.perf_counter() - started
+
+    for season_id in season_ids:
+        summary_cache.evict(season_id)
+
+    return {
+        'requested_seasons': len(season_ids),
+        'recalculated_seasons': recalculated,
+        'chunks': len(chunks),
+        'failed_chunks': failed_chunks,
+        'workers': workers,
+        'elapsed_seconds': elapsed,
+        'seasons_per_second': recalculated / elapsed if elapsed > 0 else 0.0
+    }
+
+class BatchRecalculationJobManager:
+    """Runs admin batch recalculations in the background, one at a time.
+
+    Like the per-season jobs, state lives in this process only, so status
+    must be polled against the worker that accepted the batch.
+    """
+
+    def __init__(self, max_finished_jobs: int):
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = None
+        self._jobs = {}
+        self._finished = []
+        self._lock = Lock()
+
+    def submit(self, season_ids: Optional[List[int]], workers: Optional[int], chunk_size: Optional[int]) -> Dict[str, Any]:
+        with self._lock:
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'status': JobStatus.QUEUED,
+                'completed_chunks': 0,
+                'chunks': None,
+                'result': None,
+                'error': None,
+                'created_at': datetime.utcnow(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._jobs[job['job_id']] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-recalculation")
+            self._executor.submit(self._run, job['job_id'], season_ids, workers, chunk_size)
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields, finished_at=datetime.utcnow())
+            self._finished.append(job_id)
+            while len(self._finished) > self.max_finished_jobs:
+                self._jobs.pop(self._finished.pop(0), None)
+
+    def _run(self, job_id: str, season_ids: Optional[List[int]], workers: Optional[int], chunk_size: Optional[int]):
+        self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        try:
+            result = recalculate_seasons(
+                season_ids=season_ids,
+                workers=workers,
+                chunk_size=chunk_size,
+                progress=lambda finished, total: self._update(job_id, completed_chunks=finished, chunks=total)
+            )
+            self._finish(job_id, status=JobStatus.COMPLETED, result=result)
+        except Exception as e:
+            self._finish(job_id, status=JobStatus.FAILED, error=str(e))
+
+batch_recalculation_jobs = BatchRecalculationJobManager(settings.RECALCULATION_JOB_HISTORY)
@@ -0,0 +1,144 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+import csv
+import io
+
+from fastapi import UploadFile
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.harvest_expense import HarvestExpense, HousingExpense, EmployeeExpense
+from app.models.harvest_season import HarvestSeason
+from app.models.revenue import RevenueEntry, PricingModel
+from app.schemas.harvest_expense import HarvestExpenseCreate, HousingExpenseCreate, EmployeeExpenseCreate
+from app.schemas.revenue import RevenueEntryCreate
+from app.services.summary_maintenance import SummaryMaintainer
+
+def csv_lines(upload: UploadFile) -> io.TextIOWrapper:
+    """Decode an uploaded file lazily, so the CSV is parsed as it is read"""
+    return io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+
+class BulkImporter:
+    """Imports CSV rows for one model in chunked, bulk-insert transactions.
+
+    Rows are read one at a time from the CSV stream and validated with the
+    model's Create schema. Each chunk of valid rows is written with a single
+    executemany INSERT and committed together with its summary deltas, so a
+    bad row never rolls back the rows before it and memory stays bounded by
+    the chunk size.
+    """
+
+    model: Type = None
+    schema: Type[BaseModel] = None
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.season_ids: Set[int] = {
+            season_id for (season_id,) in db.query(HarvestSeason.id).filter(HarvestSeason.user_id == user_id)
+        }
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def run(self, lines: Iterable[str]) -> Dict[str, Any]:
+        reader = csv.DictReader(lines)
+        chunk: List[Dict[str, Any]] = []
+        # Line 1 is the header
+        row_number = 1
+        try:
+            for row_number, record in enumerate(reader, start=2):
+                row = self.validate(row_number, record)
+                if row is not None:
+                    chunk.append(row)
+                if len(chunk) >= settings.BULK_IMPORT_CHUNK_SIZE:
+                    self.write(chunk)
+                    chunk = []
+        except (csv.Error, UnicodeDecodeError) as e:
+            # The rest of the file cannot be parsed; keep what was read so far
+            self.reject(row_number + 1, [f"Could not read CSV: {e}"])
+        if chunk:
+            self.write(chunk)
+
+        return {
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+    def validate(self, row_number: int, record: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+        """Validated insert values for a CSV record, or None after reporting its errors"""
+        if None in record:
+            return self.reject(row_number, ["Row has more columns than the header"])
+
+        # Blank cells mean "not given", so optional columns fall back to their defaults
+        values = {field: value.strip() for field, value in record.items() if value is not None and value.strip() != ""}
+        try:
+            row = self.schema.model_validate(values).model_dump()
+        except ValidationError as e:
+            return self.reject(row_number, [
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()
+            ])
+
+        if row['harvest_season_id'] not in self.season_ids:
+            return self.reject(row_number, ["harvest_season_id: Harvest season not found"])
+        return row
+
+    def reject(self, row_number: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            self.errors.append({'row': row_number, 'errors': messages})
+        return None
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self.db.execute(insert(self.model), rows)
+        self.apply_summary_deltas(rows)
+        self.db.commit()
+        self.imported += len(rows)
+
+    def apply_summary_deltas(self, rows: List[Dict[str, Any]]):
+        """Models that feed the season summary fold the chunk into it here"""
+
+class RevenueImporter(BulkImporter):
+    model = RevenueEntry
+    schema = RevenueEntryCreate
+
+    def apply_summary_deltas(self, rows):
+        # One aggregated delta per season, crop and pricing model instead of one per row
+        totals: Dict[Tuple[int, str, bool], List[float]] = defaultdict(lambda: [0.0, 0.0])
+        for row in rows:
+            key = (row['harvest_season_id'], row['crop_type'].value, row['pricing_model'] == PricingModel.PER_ACRE)
+            totals[key][0] += row['quantity']
+            totals[key][1] += row['total_revenue']
+
+        maintainer = SummaryMaintainer(self.db)
+        for (season_id, crop_type, per_acre), (quantity, total_revenue) in totals.items():
+            maintainer.revenue_changed(season_id, None, {
+                'crop_type': crop_type,
+                'per_acre': per_acre,
+                'quantity': quantity,
+                'total_revenue': total_revenue
+            })
+
+class HarvestExpenseImporter(BulkImporter):
+    model = HarvestExpense
+    schema = HarvestExpenseCreate
+
+    def apply_summary_deltas(self, rows):
+        totals: Dict[Tuple[int, str], float] = defaultdict(float)
+        for row in rows:
+            totals[(row['harvest_season_id'], row['category'].value)] += row['amount']
+
+        maintainer = SummaryMaintainer(self.db)
+        for (season_id, category), amount in totals.items():
+            maintainer.expense_changed(season_id, None, {'category': category, 'amount': amount})
+
+class HousingExpenseImporter(BulkImporter):
+    model = HousingExpense
+    schema = HousingExpenseCreate
+
+class EmployeeExpenseImporter(BulkImporter):
+    model = EmployeeExpense
+    schema = EmployeeExpenseCreate
@@ -1,12 +1,26 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.services.summary_cache import summary_cache
+from app.services.summary_store import save_summaries
 from app.models.harvest_season import HarvestSeason, PayCycle
 from app.models.equipment import Equipment, EquipmentCost, OwnershipType
 from app.models.harvest_expense import HarvestExpense, HousingExpense, EmployeeExpense
 from app.models.revenue import RevenueEntry, CropType, PricingModel
 from app.models.summary_calculation import SummaryCalculation
-import json
+
+# Summary column holding the total of each harvest expense category
+EXPENSE_CATEGORY_COLUMNS = {
+    'fuel': 'total_fuel_cost',
+    'maintenance': 'total_maintenance_cost',
+    'housing': 'total_housing_cost',
+    'employees': 'total_employee_cost',
+    'insurance': 'total_insurance_cost',
+    'taxes': 'total_tax_cost',
+    'other': 'total_other_cost'
+}
 
 class HarvestCalculationEngine:
     def __init__(self, db: Session):
@@ -104,30 +118,65 @@ class HarvestCalculationEngine:
             'total_cost': 0.0
         }
 
-    def calculate_period_costs(self, harvest_season: HarvestSeason) -> List[EquipmentCost]:
-        """Calculate equipment costs for each pay period"""
+    def has_pay_periods(self, harvest_season: HarvestSeason) -> bool:
+        """Whether the season dates produce at least one pay period"""
+        start_date = harvest_season.actual_start_date or harvest_season.estimated_start_date
+        end_date = harvest_season.actual_end_date or harvest_season.estimated_end_date
+        return bool(start_date and end_date and start_date < end_date)
+
+    def calculate_period_fractions(self, periods: List[Dict[str, datetime]]) -> List[float]:
+        """Share of the season covered by each pay period, by period length"""
+        lengths = [(period['end'] - period['start']).total_seconds() for period in periods]
+        total_length = sum(lengths)
+        if total_length <= 0:
+            return [0.0 for _ in periods]
+        return [length / total_length for length in lengths]
+
+    def calculate_equipment_season_cost(self, equipment: Equipment, harvest_season: HarvestSeason) -> float:
+        """Season total for one equipment item.
+
+        Period costs are the season cost prorated by period length, so they
+        sum back to the season cost whenever the season has pay periods.
+        """
+        if not self.has_pay_periods(harvest_season):
+            return 0.0
+        return self.calculate_equipment_cost(equipment, harvest_season)['total_cost']
+
+    def build_period_cost_rows(self, harvest_season: HarvestSeason, equipment_list: Optional[List[Equipment]] = None) -> List[Dict[str, Any]]:
+        """Build equipment cost rows for each pay period, prorated by period length"""
         periods = self.get_pay_periods(harvest_season)
-        equipment_costs = []
+        fractions = self.calculate_period_fractions(periods)
+        if equipment_list is None:
+            equipment_list = harvest_season.equipment
         
-        for period in periods:
-            for equipment in harvest_season.equipment:
-                cost_data = self.calculate_equipment_cost(equipment, harvest_season)
-                
-                # Create equipment cost record
-                equipment_cost = EquipmentCost(
-                    harvest_season_id=harvest_season.id,
-                    equipment_id=equipment.id,
-                    period_start=period['start'],
-                    period_end=period['end'],
-                    lease_cost=cost_data['lease_cost'],
-                    interest_cost=cost_data['interest_cost'],
-                    depreciation_cost=cost_data['depreciation_cost'],
-                    total_cost=cost_data['total_cost']
-                )
-                
-                equipment_costs.append(equipment_cost)
+        rows = []
+        for equipment in equipment_list:
+            cost_data = self.calculate_equipment_cost(equipment, harvest_season)
+            
+            for period, fraction in zip(periods, fractions):
+                rows.append({
+                    'harvest_season_id': harvest_season.id,
+                    'equipment_id': equipment.id,
+                    'period_start': period['start'],
+                    'period_end': period['end'],
+                    'lease_cost': cost_data['lease_cost'] * fraction,
+                    'interest_cost': cost_data['interest_cost'] * fraction,
+                    'depreciation_cost': cost_data['depreciation_cost'] * fraction,
+                    'total_cost': cost_data['total_cost'] * fraction
+                })
         
-        return equipment_costs
+        return rows
+
+    def calculate_period_costs(self, harvest_season: HarvestSeason, equipment_list: Optional[List[Equipment]] = None) -> List[EquipmentCost]:
+        """Calculate equipment costs for each pay period"""
+        return [EquipmentCost(**row) for row in self.build_period_cost_rows(harvest_season, equipment_list)]
+
+    def persist_period_costs(self, harvest_season: HarvestSeason, equipment_list: Optional[List[Equipment]] = None) -> int:
+        """Bulk insert per-period equipment cost rows; the caller commits"""
+        rows = self.build_period_cost_rows(harvest_season, equipment_list)
+        if rows:
+            self.db.execute(insert(EquipmentCost), rows)
+        return len(rows)
 
     def calculate_expense_totals(self, harvest_season: HarvestSeason) -> Dict[str, float]:
         """Calculate total expenses by category"""
@@ -165,74 +214,82 @@ class HarvestCalculationEngine:
             'revenue_by_crop': revenue_by_crop
         }
 
-    def calculate_profit_loss(self, harvest_season: HarvestSeason) -> SummaryCalculation:
-        """Calculate comprehensive profit/loss summary"""
-        # Calculate all components
-        harvest_duration = self.calculate_harvest_duration(harvest_season)
-        expense_totals = self.calculate_expense_totals(harvest_season)
-        revenue_data = self.calculate_revenue_totals(harvest_season)
-        
-        # Calculate equipment costs
-        equipment_costs = self.calculate_period_costs(harvest_season)
-        total_equipment_cost = sum(cost.total_cost for cost in equipment_costs)
+    def calculate_acres_billed(self, harvest_season: HarvestSeason) -> float:
+        """Calculate acres billed from per-acre revenue entries"""
+        return sum(entry.quantity for entry in harvest_season.revenue_entries 
+                   if entry.pricing_model == PricingModel.PER_ACRE)
+
+    def calculate_equipment_totals(self, harvest_season: HarvestSeason) -> Dict[str, Any]:
+        """Calculate total equipment cost and breakdown by equipment name"""
+        equipment_costs = [
+            (equipment.name, self.calculate_equipment_season_cost(equipment, harvest_season))
+            for equipment in harvest_season.equipment
+        ]
         
+        return {
+            'total_equipment_cost': sum((cost for _, cost in equipment_costs), 0.0),
+            'equipment_cost_breakdown': dict(equipment_costs)
+        }
+
+    def update_derived_metrics(self, summary: SummaryCalculation) -> SummaryCalculation:
+        """Recompute total expenses, profit and per-acre metrics from the component totals"""
         # Calculate total expenses
-        total_expenses = (
-            total_equipment_cost +
-            expense_totals['fuel'] +
-            expense_totals['maintenance'] +
-            expense_totals['housing'] +
-            expense_totals['employees'] +
-            expense_totals['insurance'] +
-            expense_totals['taxes'] +
-            expense_totals['other']
+        summary.total_expenses = (
+            summary.total_equipment_cost +
+            summary.total_fuel_cost +
+            summary.total_maintenance_cost +
+            summary.total_housing_cost +
+            summary.total_employee_cost +
+            summary.total_insurance_cost +
+            summary.total_tax_cost +
+            summary.total_other_cost
         )
         
         # Calculate profit/loss
-        gross_profit = revenue_data['total_revenue'] - total_expenses
-        profit_margin = (gross_profit / revenue_data['total_revenue'] * 100) if revenue_data['total_revenue'] > 0 else 0
+        summary.gross_profit = summary.total_revenue - summary.total_expenses
+        summary.net_profit = summary.gross_profit  # Assuming no additional taxes/fees
+        summary.profit_margin = (summary.gross_profit / summary.total_revenue * 100) if summary.total_revenue > 0 else 0
         
         # Calculate per-acre metrics
-        acres_billed = sum(entry.quantity for entry in harvest_season.revenue_entries 
-                          if entry.pricing_model == PricingModel.PER_ACRE)
+        acres_billed = summary.acres_billed
+        summary.cost_per_acre = summary.total_expenses / acres_billed if acres_billed > 0 else 0
+        summary.revenue_per_acre = summary.total_revenue / acres_billed if acres_billed > 0 else 0
+        summary.profit_per_acre = summary.revenue_per_acre - summary.cost_per_acre
         
-        cost_per_acre = total_expenses / acres_billed if acres_billed > 0 else 0
-        revenue_per_acre = revenue_data['total_revenue'] / acres_billed if acres_billed > 0 else 0
-        profit_per_acre = profit_per_acre = revenue_per_acre - cost_per_acre
+        return summary
+
+    def calculate_profit_loss(self, harvest_season: HarvestSeason) -> SummaryCalculation:
+        """Calculate comprehensive profit/loss summary"""
+        # Calculate all components
+        harvest_duration = self.calculate_harvest_duration(harvest_season)
+        expense_totals = self.calculate_expense_totals(harvest_season)
+        revenue_data = self.calculate_revenue_totals(harvest_season)
+        equipment_data = self.calculate_equipment_totals(harvest_season)
+        acres_billed = self.calculate_acres_billed(harvest_season)
         
         # Create summary calculation
         summary = SummaryCalculation(
             harvest_season_id=harvest_season.id,
             harvest_duration_days=harvest_duration,
             acres_billed=acres_billed,
-            total_equipment_cost=total_equipment_cost,
-            total_housing_cost=expense_totals['housing'],
-            total_employee_cost=expense_totals['employees'],
-            total_fuel_cost=expense_totals['fuel'],
-            total_maintenance_cost=expense_totals['maintenance'],
-            total_insurance_cost=expense_totals['insurance'],
-            total_tax_cost=expense_totals['taxes'],
-            total_other_cost=expense_totals['other'],
-            total_expenses=total_expenses,
-            total_revenue=revenue_data['total_revenue'],
-            revenue_by_crop=json.dumps(revenue_data['revenue_by_crop']),
-            gross_profit=gross_profit,
-            net_profit=gross_profit,  # Assuming no additional taxes/fees
-            profit_margin=profit_margin,
-            cost_per_acre=cost_per_acre,
-            revenue_per_acre=revenue_per_acre,
-            profit_per_acre=profit_per_acre,
-            equipment_cost_breakdown=json.dumps({
-                equipment.name: sum(cost.total_cost for cost in equipment_costs 
-                                  if cost.equipment_id == equipment.id)
-                for equipment in harvest_season.equipment
-            })
+            total_equipment_cost=equipment_data['total_equipment_cost'],
+            total_revenue=revenue_data['total_revenue']
         )
+        summary.set_revenue_by_crop(revenue_data['revenue_by_crop'])
+        summary.set_equipment_cost_breakdown(equipment_data['equipment_cost_breakdown'])
+        for category, column in EXPENSE_CATEGORY_COLUMNS.items():
+            setattr(summary, column, expense_totals[category])
         
-        return summary
+        return self.update_derived_metrics(summary)
 
-    def recalculate_harvest_season(self, harvest_season_id: int) -> SummaryCalculation:
-        """Recalculate all metrics for a harvest season"""
+    def recalculate_harvest_season(self, harvest_season_id: int, progress: Optional[Callable[[str, float], None]] = None) -> SummaryCalculation:
+        """Recalculate all metrics for a harvest season.
+
+        progress, when given, is called with a stage name and completed fraction.
+        """
+        progress = progress or (lambda stage, fraction: None)
+        
+        progress('loading', 0.1)
         harvest_season = self.db.query(HarvestSeason).filter(
             HarvestSeason.id == harvest_season_id
         ).first()
@@ -240,17 +297,32 @@ class HarvestCalculationEngine:
         if not harvest_season:
             raise ValueError("Harvest season not found")
         
-        # Delete existing calculations
-        self.db.query(SummaryCalculation).filter(
-            SummaryCalculation.harvest_season_id == harvest_season_id
-        ).delete()
-        
         # Calculate new summary
-        summary = self.calculate_profit_loss(harvest_season)
+        progress('calculating', 0.3)
+        computed = self.calculate_profit_loss(harvest_season)
         
-        # Save to database
-        self.db.add(summary)
+        # Save as the season's current version
+        progress('saving', 0.9)
+        summary = save_summaries(self.db, [computed])[0]
         self.db.commit()
         self.db.refresh(summary)
+        summary_cache.evict(harvest_season_id)
         
         return summary
+
+
+def get_calculation_engine(db: Session, backend: Optional[str] = None) -> HarvestCalculationEngine:
+    """Return the calculation engine selected by CALCULATION_BACKEND"""
+    backend = backend or settings.CALCULATION_BACKEND
+    
+    if backend == "numpy":
+        # Imported lazily so numpy stays an optional dependency
+        from app.services.columnar_engine import ColumnarCalculationEngine
+        return ColumnarCalculationEngine(db)
+    elif backend == "sql":
+        from app.services.aggregate_engine import SqlAggregateCalculationEngine
+        return SqlAggregateCalculationEngine(db)
+    elif backend == "python":
+        return HarvestCalculationEngine(db)
+    
+    raise ValueError(f"Unknown calculation backend: {backend}")
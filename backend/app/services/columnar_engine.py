@@ -0,0 +1,180 @@
+from typing import Dict, Any
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.harvest_season import HarvestSeason
+from app.models.equipment import Equipment, OwnershipType
+from app.models.harvest_expense import HarvestExpense
+from app.models.revenue import RevenueEntry, CropType, PricingModel
+from app.models.summary_calculation import SummaryCalculation
+from app.services.calculation_engine import HarvestCalculationEngine
+
+EXPENSE_CATEGORIES = ['fuel', 'maintenance', 'housing', 'employees', 'insurance', 'taxes', 'other']
+CROP_TYPES = [crop.value for crop in CropType]
+
+class ColumnarCalculationEngine(HarvestCalculationEngine):
+    """Calculation engine that loads season rows as typed arrays.
+
+    Only the columns needed for the totals are selected, and every total is a
+    grouped reduction (np.bincount) over those arrays. bincount accumulates in
+    row order and both engines load rows ordered by id, so the results match
+    the row-by-row Python engine exactly.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self._revenue_columns = {}
+
+    def load_expense_columns(self, harvest_season: HarvestSeason) -> Dict[str, np.ndarray]:
+        """Load expense category codes and amounts for a harvest season"""
+        rows = self.db.query(HarvestExpense.category, HarvestExpense.amount).filter(
+            HarvestExpense.harvest_season_id == harvest_season.id
+        ).order_by(HarvestExpense.id).all()
+
+        codes = {category: index for index, category in enumerate(EXPENSE_CATEGORIES)}
+        return {
+            'category': np.fromiter((codes.get(row.category.value, -1) for row in rows), dtype=np.int64, count=len(rows)),
+            'amount': np.fromiter((row.amount for row in rows), dtype=np.float64, count=len(rows))
+        }
+
+    def load_revenue_columns(self, harvest_season: HarvestSeason) -> Dict[str, np.ndarray]:
+        """Load crop codes, per-acre flags, quantities and revenue for a harvest season"""
+        if harvest_season.id in self._revenue_columns:
+            return self._revenue_columns[harvest_season.id]
+
+        rows = self.db.query(
+            RevenueEntry.crop_type,
+            RevenueEntry.pricing_model,
+            RevenueEntry.quantity,
+            RevenueEntry.total_revenue
+        ).filter(
+            RevenueEntry.harvest_season_id == harvest_season.id
+        ).order_by(RevenueEntry.id).all()
+
+        codes = {crop: index for index, crop in enumerate(CROP_TYPES)}
+        columns = {
+            'crop': np.fromiter((codes[row.crop_type.value] for row in rows), dtype=np.int64, count=len(rows)),
+            'per_acre': np.fromiter((row.pricing_model == PricingModel.PER_ACRE for row in rows), dtype=bool, count=len(rows)),
+            'quantity': np.fromiter((row.quantity for row in rows), dtype=np.float64, count=len(rows)),
+            'total_revenue': np.fromiter((row.total_revenue for row in rows), dtype=np.float64, count=len(rows))
+        }
+        self._revenue_columns[harvest_season.id] = columns
+        return columns
+
+    def load_equipment_columns(self, harvest_season: HarvestSeason) -> Dict[str, np.ndarray]:
+        """Load the cost inputs of every equipment item in a harvest season"""
+        rows = self.db.query(
+            Equipment.id,
+            Equipment.name,
+            Equipment.ownership_type,
+            Equipment.purchase_price,
+            Equipment.current_value,
+            Equipment.years_ownership,
+            Equipment.lease_rate,
+            Equipment.monthly_payment,
+            Equipment.working_days
+        ).filter(
+            Equipment.harvest_season_id == harvest_season.id
+        ).order_by(Equipment.id).all()
+
+        def column(field):
+            # Missing values become 0.0, which the cost formulas treat like None
+            return np.fromiter((getattr(row, field) or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+
+        return {
+            'name': [row.name for row in rows],
+            'ownership_type': np.array([row.ownership_type.value for row in rows], dtype=object),
+            'purchase_price': column('purchase_price'),
+            'current_value': column('current_value'),
+            'years_ownership': column('years_ownership'),
+            'lease_rate': column('lease_rate'),
+            'monthly_payment': column('monthly_payment'),
+            'working_days': column('working_days')
+        }
+
+    def calculate_equipment_cost_columns(self, columns: Dict[str, np.ndarray], harvest_season: HarvestSeason) -> np.ndarray:
+        """Vectorized calculate_equipment_cost: total cost per equipment item"""
+        harvest_duration = self.calculate_harvest_duration(harvest_season)
+        working_days = np.where(columns['working_days'] != 0, columns['working_days'], harvest_duration)
+        ownership = columns['ownership_type']
+        purchase_price = columns['purchase_price']
+        years_ownership = columns['years_ownership']
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Owned equipment: depreciation + interest
+            depreciation_cost = purchase_price / years_ownership / 365 * working_days
+            remaining_value = np.where(columns['current_value'] != 0, columns['current_value'], purchase_price)
+            interest_cost = remaining_value * (harvest_season.interest_rate / 100) / 365 * working_days
+            owned_cost = depreciation_cost + interest_cost
+
+        # Leased and financed equipment: monthly rate prorated
+        leased_cost = columns['lease_rate'] * (working_days / 30)
+        financed_cost = columns['monthly_payment'] * (working_days / 30)
+
+        owned = (ownership == OwnershipType.OWNED.value) & (purchase_price != 0) & (years_ownership != 0)
+        leased = (ownership == OwnershipType.LEASED.value) & (columns['lease_rate'] != 0)
+        financed = (ownership == OwnershipType.FINANCED.value) & (columns['monthly_payment'] != 0)
+
+        return np.select([owned, leased, financed], [owned_cost, leased_cost, financed_cost], default=0.0)
+
+    def calculate_expense_totals(self, harvest_season: HarvestSeason) -> Dict[str, float]:
+        """Calculate total expenses by category"""
+        columns = self.load_expense_columns(harvest_season)
+        known = columns['category'] >= 0
+        sums = np.bincount(
+            columns['category'][known],
+            weights=columns['amount'][known],
+            minlength=len(EXPENSE_CATEGORIES)
+        )
+
+        return dict(zip(EXPENSE_CATEGORIES, sums.tolist()))
+
+    def calculate_revenue_totals(self, harvest_season: HarvestSeason) -> Dict[str, Any]:
+        """Calculate total revenue and breakdown by crop"""
+        columns = self.load_revenue_columns(harvest_season)
+        revenue = columns['total_revenue']
+        total_revenue = np.bincount(np.zeros(len(revenue), dtype=np.int64), weights=revenue, minlength=1)[0]
+
+        # Order crops by first appearance, as the row-by-row engine does
+        crop_sums = np.bincount(columns['crop'], weights=revenue, minlength=len(CROP_TYPES))
+        crops, first_seen = np.unique(columns['crop'], return_index=True)
+        revenue_by_crop = {
+            CROP_TYPES[crop]: crop_sums[crop].item()
+            for crop in crops[np.argsort(first_seen)]
+        }
+
+        return {
+            'total_revenue': total_revenue.item(),
+            'revenue_by_crop': revenue_by_crop
+        }
+
+    def calculate_acres_billed(self, harvest_season: HarvestSeason) -> float:
+        """Calculate acres billed from per-acre revenue entries"""
+        columns = self.load_revenue_columns(harvest_season)
+        quantity = columns['quantity'][columns['per_acre']]
+        if not len(quantity):
+            return 0
+
+        return np.bincount(np.zeros(len(quantity), dtype=np.int64), weights=quantity)[0].item()
+
+    def calculate_equipment_totals(self, harvest_season: HarvestSeason) -> Dict[str, Any]:
+        """Calculate total equipment cost and breakdown by equipment name"""
+        columns = self.load_equipment_columns(harvest_season)
+        if self.has_pay_periods(harvest_season):
+            costs = self.calculate_equipment_cost_columns(columns, harvest_season)
+        else:
+            costs = np.zeros(len(columns['name']))
+
+        total_equipment_cost = np.bincount(np.zeros(len(costs), dtype=np.int64), weights=costs, minlength=1)[0]
+
+        return {
+            'total_equipment_cost': total_equipment_cost.item(),
+            'equipment_cost_breakdown': dict(zip(columns['name'], costs.tolist()))
+        }
+
+    def calculate_profit_loss(self, harvest_season: HarvestSeason) -> SummaryCalculation:
+        """Calculate comprehensive profit/loss summary"""
+        self._revenue_columns.pop(harvest_season.id, None)
+        try:
+            return super().calculate_profit_loss(harvest_season)
+        finally:
+            self._revenue_columns.pop(harvest_season.id, None)
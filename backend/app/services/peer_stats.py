@@ -0,0 +1,236 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, datetime
+from itertools import accumulate
+from threading import Event, Lock, Thread
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.rollup import DailyIncomeRollup, DailyExpenseRollup
+from app.services.quantile_sketch import KllSketch, build_sketch, merge_sketches
+
+logger = logging.getLogger(__name__)
+
+class DailySeries:
+    """Per-day sums and counts with prefix totals for O(log n) range lookups"""
+
+    def __init__(self, rows: Dict[date, List[float]]):
+        self.days = sorted(rows)
+        self._prefix = [
+            [0.0] + list(accumulate(rows[day][column] for day in self.days))
+            for column in range(4)
+        ]
+
+    def totals(self, start_date: date, end_date: date) -> List[float]:
+        """[income_sum, income_count, expense_sum, expense_count] over an inclusive day range"""
+        lo = bisect_left(self.days, start_date)
+        hi = bisect_right(self.days, end_date)
+        return [prefix[hi] - prefix[lo] for prefix in self._prefix]
+
+class PeerStatsCache:
+    """In-process peer averages served to every dashboard request.
+
+    A background thread rebuilds per-state and national daily series from
+    the rollup tables joined with users, grouped by users.state. Requests
+    only read the last snapshot, so dashboard latency no longer depends on
+    how many harvesters are registered.
+
+    Percentiles come from KLL sketches of per-user income and expense totals,
+    kept per date window and state. National sketches are merged from the
+    state sketches. Writes mark a state dirty for the windows they fall in
+    and only that state is re-sketched on its next lookup.
+    """
+
+    def __init__(self, refresh_seconds: int, sketch_k: int = 200, max_windows: int = 32):
+        self.refresh_seconds = refresh_seconds
+        self.sketch_k = sketch_k
+        self.max_windows = max_windows
+        self.refreshed_at = None
+        self._states = {}
+        self._national = DailySeries({})
+        self._windows = OrderedDict()
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+
+    def refresh(self):
+        """Rebuild the snapshot with one grouped query per rollup table"""
+        db = SessionLocal()
+        try:
+            income_rows = db.query(
+                User.state,
+                DailyIncomeRollup.day,
+                func.sum(DailyIncomeRollup.income_sum),
+                func.sum(DailyIncomeRollup.income_count)
+            ).join(User, User.id == DailyIncomeRollup.user_id).group_by(
+                User.state, DailyIncomeRollup.day
+            ).all()
+            expense_rows = db.query(
+                User.state,
+                DailyExpenseRollup.day,
+                func.sum(DailyExpenseRollup.expense_sum),
+                func.sum(DailyExpenseRollup.expense_count)
+            ).join(User, User.id == DailyExpenseRollup.user_id).group_by(
+                User.state, DailyExpenseRollup.day
+            ).all()
+        finally:
+            db.close()
+
+        states = {}
+        national = {}
+        for rows, offset in ((income_rows, 0), (expense_rows, 2)):
+            for state, day, total, count in rows:
+                for series in (states.setdefault(state, {}), national):
+                    values = series.setdefault(day, [0.0, 0, 0.0, 0])
+                    values[offset] += total or 0
+                    values[offset + 1] += count or 0
+
+        with self._lock:
+            self._states = {state: DailySeries(rows) for state, rows in states.items()}
+            self._national = DailySeries(national)
+            self._windows.clear()
+            self.refreshed_at = datetime.utcnow()
+
+    def get_averages(self, state: str, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Average income and expense entry amounts for a state and nationally"""
+        if self.refreshed_at is None:
+            self.refresh()
+        with self._lock:
+            state_series = self._states.get(state)
+            national_series = self._national
+
+        state_totals = state_series.totals(start_date, end_date) if state_series else [0.0, 0, 0.0, 0]
+        national_totals = national_series.totals(start_date, end_date)
+        return {
+            'state_avg_income': _average(state_totals[0], state_totals[1]),
+            'state_avg_expenses': _average(state_totals[2], state_totals[3]),
+            'national_avg_income': _average(national_totals[0], national_totals[1]),
+            'national_avg_expenses': _average(national_totals[2], national_totals[3]),
+            'refreshed_at': self.refreshed_at
+        }
+
+    def get_percentiles(self, state: str, start_date: date, end_date: date, income: float, expenses: float) -> Dict[str, int]:
+        """Percentile of a user's income and expense totals among state and national peers"""
+        window = self._get_window(state, start_date, end_date)
+        state_sketches = window['states'].get(state, {})
+        result = {}
+        for metric, value in (('income', income), ('expenses', expenses)):
+            state_sketch = state_sketches.get(metric)
+            result[f'state_{metric}_percentile'] = _percentile(state_sketch, value)
+            result[f'national_{metric}_percentile'] = _percentile(window['national'][metric], value)
+        return result
+
+    def entries_changed(self, state: str, days: List[date]):
+        """Mark a state's sketches stale in every cached window covering one of the days"""
+        with self._lock:
+            for (start_date, end_date), window in self._windows.items():
+                if any(start_date <= day <= end_date for day in days):
+                    window['dirty'].add(state)
+
+    def _get_window(self, state: str, start_date: date, end_date: date) -> Dict[str, Any]:
+        key = (start_date, end_date)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None:
+                self._windows.move_to_end(key)
+                dirty = set(window['dirty'])
+                window['dirty'].clear()
+            else:
+                dirty = None
+
+        if window is None:
+            window = {'states': self._build_state_sketches(start_date, end_date), 'dirty': set()}
+        elif dirty:
+            states = dict(window['states'])
+            for dirty_state in dirty:
+                states.pop(dirty_state, None)
+                states.update(self._build_state_sketches(start_date, end_date, dirty_state))
+            window = {'states': states, 'dirty': window['dirty']}
+        else:
+            return window
+
+        window['national'] = {
+            metric: merge_sketches(
+                [sketches[metric] for sketches in window['states'].values() if metric in sketches],
+                self.sketch_k
+            )
+            for metric in ('income', 'expenses')
+        }
+        with self._lock:
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+        return window
+
+    def _build_state_sketches(self, start_date: date, end_date: date, state: Optional[str] = None) -> Dict[str, Dict[str, KllSketch]]:
+        """Sketch per-user totals over a window, for one state or all of them"""
+        db = SessionLocal()
+        try:
+            per_user_totals = {
+                'income': _user_totals(db, DailyIncomeRollup.user_id, DailyIncomeRollup.day,
+                                       DailyIncomeRollup.income_sum, DailyIncomeRollup.income_count,
+                                       start_date, end_date, state),
+                'expenses': _user_totals(db, DailyExpenseRollup.user_id, DailyExpenseRollup.day,
+                                         DailyExpenseRollup.expense_sum, DailyExpenseRollup.expense_count,
+                                         start_date, end_date, state)
+            }
+        finally:
+            db.close()
+
+        values = {}
+        for metric, rows in per_user_totals.items():
+            for user_state, total in rows:
+                values.setdefault(user_state, {}).setdefault(metric, []).append(total)
+        return {
+            user_state: {metric: build_sketch(totals, self.sketch_k) for metric, totals in metrics.items()}
+            for user_state, metrics in values.items()
+        }
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="peer-stats-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Peer stats refresh failed")
+            self._stop.wait(self.refresh_seconds)
+
+def _user_totals(db, user_id_column, day_column, sum_column, count_column, start_date: date, end_date: date, state: Optional[str]) -> List[Tuple[str, float]]:
+    """(state, total) for every user with entries in the window"""
+    query = db.query(
+        User.state,
+        func.sum(sum_column)
+    ).join(User, User.id == user_id_column).filter(
+        day_column >= start_date,
+        day_column <= end_date
+    )
+    if state is not None:
+        query = query.filter(User.state == state)
+    return query.group_by(user_id_column, User.state).having(func.sum(count_column) > 0).all()
+
+def _average(total: float, count: int) -> float:
+    return total / count if count > 0 else 0
+
+def _percentile(sketch: Optional[KllSketch], value: float) -> int:
+    return int(round(sketch.rank(value) * 100)) if sketch else 0
+
+peer_stats_cache = PeerStatsCache(
+    settings.PEER_STATS_REFRESH_SECONDS,
+    settings.PEER_SKETCH_K,
+    settings.PEER_SKETCH_WINDOWS
+)
@@ -0,0 +1,91 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+import math
+import random
+
+class KllSketch:
+    """Mergeable KLL quantile sketch.
+
+    Level h holds items of weight 2**h. When the sketch grows past its
+    capacity the lowest full level is sorted and every other item promoted,
+    so memory stays O(k) while rank error is about 1.7/k. Rank lookups use
+    a sorted, cumulative-weight view built once after the last update; it
+    is swapped in as a single tuple so concurrent readers of a finished
+    sketch never see half of it.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._levels = [[]]
+        self._random = random.Random(seed)
+        self._view = None
+
+    def update(self, value: float):
+        self._levels[0].append(value)
+        self.count += 1
+        self._view = None
+        self._compress()
+
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KllSketch"):
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.count += other.count
+        self._view = None
+        self._compress()
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of inserted values <= value"""
+        if self.count == 0:
+            return 0.0
+        values, cumulative = self._view or self._build_view()
+        index = bisect_right(values, value)
+        return cumulative[index - 1] / cumulative[-1] if index else 0.0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        while sum(len(items) for items in self._levels) > sum(self._capacity(level) for level in range(len(self._levels))):
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    break
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+
+            items.sort()
+            # An odd item out stays behind at its level
+            leftover = [items.pop()] if len(items) % 2 else []
+            offset = self._random.randint(0, 1)
+            self._levels[level + 1].extend(items[offset::2])
+            self._levels[level] = leftover
+
+    def _build_view(self) -> Tuple[List[float], List[int]]:
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self._levels)
+            for value in items
+        )
+        self._view = ([value for value, _ in weighted], list(accumulate(weight for _, weight in weighted)))
+        return self._view
+
+def build_sketch(values: Iterable[float], k: int = 200) -> KllSketch:
+    sketch = KllSketch(k)
+    sketch.extend(values)
+    sketch._build_view()
+    return sketch
+
+def merge_sketches(sketches: List[KllSketch], k: int = 200) -> KllSketch:
+    merged = KllSketch(k)
+    for sketch in sketches:
+        merged.merge(sketch)
+    merged._build_view()
+    return merged
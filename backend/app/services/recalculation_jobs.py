@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Any, Optional
+import enum
+import uuid
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.calculation_engine import get_calculation_engine
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class RecalculationJobManager:
+    """Runs season recalculations on an in-process worker pool.
+
+    A request for a season that already has a queued or running job joins
+    that job instead of starting another. Job state lives in this process
+    only, so status must be polled against the worker that accepted it.
+    """
+
+    def __init__(self, max_workers: int, max_finished_jobs: int):
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self._executor = None
+        self._jobs = {}
+        self._active_by_season = {}
+        self._finished = []
+        self._lock = Lock()
+
+    def submit(self, harvest_season_id: int, user_id: int) -> Dict[str, Any]:
+        """Queue a recalculation, or return the job already active for the season"""
+        with self._lock:
+            active_job_id = self._active_by_season.get(harvest_season_id)
+            if active_job_id:
+                return dict(self._jobs[active_job_id])
+
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'harvest_season_id': harvest_season_id,
+                'user_id': user_id,
+                'status': JobStatus.QUEUED,
+                'stage': 'queued',
+                'progress': 0.0,
+                'summary_id': None,
+                'error': None,
+                'created_at': datetime.utcnow(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._jobs[job['job_id']] = job
+            self._active_by_season[harvest_season_id] = job['job_id']
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="recalculation")
+            self._executor.submit(self._run, job['job_id'])
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields, finished_at=datetime.utcnow())
+            self._active_by_season.pop(job['harvest_season_id'], None)
+
+            # Keep a bounded history of finished jobs
+            self._finished.append(job_id)
+            while len(self._finished) > self.max_finished_jobs:
+                self._jobs.pop(self._finished.pop(0), None)
+
+    def _run(self, job_id: str):
+        job = self.get(job_id)
+        self._update(job_id, status=JobStatus.RUNNING, stage='starting', started_at=datetime.utcnow())
+
+        db = SessionLocal()
+        try:
+            calculation_engine = get_calculation_engine(db)
+            summary = calculation_engine.recalculate_harvest_season(
+                job['harvest_season_id'],
+                progress=lambda stage, fraction: self._update(job_id, stage=stage, progress=fraction)
+            )
+            self._finish(job_id, status=JobStatus.COMPLETED, stage='completed', progress=1.0, summary_id=summary.id)
+        except Exception as e:
+            db.rollback()
+            self._finish(job_id, status=JobStatus.FAILED, stage='failed', error=str(e))
+        finally:
+            db.close()
+
+recalculation_jobs = RecalculationJobManager(
+    settings.RECALCULATION_JOB_WORKERS,
+    settings.RECALCULATION_JOB_HISTORY
+)
@@ -0,0 +1,162 @@
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.income import IncomeEntry
+from app.models.expense import ExpenseEntry, ExpenseCategory
+from app.models.rollup import DailyIncomeRollup, DailyExpenseRollup
+from app.services.peer_stats import peer_stats_cache
+
+def snapshot_income(entry: IncomeEntry) -> Dict[str, Any]:
+    """Fields of an income entry that feed the daily rollups"""
+    return {
+        'day': _to_day(entry.harvest_date),
+        'amount': entry.total_earned
+    }
+
+def snapshot_expense(entry: ExpenseEntry) -> Dict[str, Any]:
+    """Fields of an expense entry that feed the daily rollups"""
+    return {
+        'day': _to_day(entry.expense_date),
+        'category': ExpenseCategory(entry.category),
+        'amount': entry.amount
+    }
+
+def _to_day(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+class RollupMaintainer:
+    """Keeps the daily per-user income and expense rollups current.
+
+    Write handlers pass before/after snapshots (None for create or delete)
+    and the matching rollup rows are adjusted with an atomic upsert in the
+    caller's transaction. Once that transaction commits, the peer stats
+    cache is told which days changed for the user's state.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._changed_days = {}
+
+    def income_changed(self, user_id: int, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot:
+                self._upsert(
+                    DailyIncomeRollup,
+                    {'user_id': user_id, 'day': snapshot['day']},
+                    'income_sum', sign * snapshot['amount'],
+                    'income_count', sign
+                )
+
+    def expense_changed(self, user_id: int, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot:
+                self._upsert(
+                    DailyExpenseRollup,
+                    {'user_id': user_id, 'day': snapshot['day'], 'category': snapshot['category']},
+                    'expense_sum', sign * snapshot['amount'],
+                    'expense_count', sign
+                )
+
+    def _upsert(self, model, keys: Dict[str, Any], sum_column: str, sum_delta: float, count_column: str, count_delta: int):
+        if not self._changed_days:
+            event.listen(self.db, 'after_commit', self._notify_peer_stats, once=True)
+        # Resolved now: no SQL may be emitted from after_commit
+        state = self.db.get(User, keys['user_id']).state
+        self._changed_days.setdefault(state, set()).add(keys['day'])
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+            table = model.__table__
+            statement = dialect_insert(table).values(**keys, **{sum_column: sum_delta, count_column: count_delta})
+            statement = statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={
+                    sum_column: table.c[sum_column] + statement.excluded[sum_column],
+                    count_column: table.c[count_column] + statement.excluded[count_column]
+                }
+            )
+            self.db.execute(statement)
+            return
+
+        # Other databases: read-modify-write under a row lock
+        rollup = self.db.query(model).filter_by(**keys).with_for_update().first()
+        if not rollup:
+            rollup = model(**keys, **{sum_column: 0.0, count_column: 0})
+            self.db.add(rollup)
+        setattr(rollup, sum_column, getattr(rollup, sum_column) + sum_delta)
+        setattr(rollup, count_column, getattr(rollup, count_column) + count_delta)
+
+    def _notify_peer_stats(self, session: Session):
+        for state, days in self._changed_days.items():
+            peer_stats_cache.entries_changed(state, list(days))
+        self._changed_days = {}
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None):
+    """Rebuild rollups from the raw entries (backfill and reconciliation); the caller commits"""
+    income_day = func.date(IncomeEntry.harvest_date)
+    expense_day = func.date(ExpenseEntry.expense_date)
+
+    income_source = select(
+        IncomeEntry.user_id,
+        income_day,
+        func.sum(IncomeEntry.total_earned),
+        func.count(IncomeEntry.id)
+    ).group_by(IncomeEntry.user_id, income_day)
+    expense_source = select(
+        ExpenseEntry.user_id,
+        expense_day,
+        ExpenseEntry.category,
+        func.sum(ExpenseEntry.amount),
+        func.count(ExpenseEntry.id)
+    ).group_by(ExpenseEntry.user_id, expense_day, ExpenseEntry.category)
+
+    income_rollups = db.query(DailyIncomeRollup)
+    expense_rollups = db.query(DailyExpenseRollup)
+    if user_id is not None:
+        income_source = income_source.where(IncomeEntry.user_id == user_id)
+        expense_source = expense_source.where(ExpenseEntry.user_id == user_id)
+        income_rollups = income_rollups.filter(DailyIncomeRollup.user_id == user_id)
+        expense_rollups = expense_rollups.filter(DailyExpenseRollup.user_id == user_id)
+
+    income_rollups.delete(synchronize_session=False)
+    expense_rollups.delete(synchronize_session=False)
+    db.execute(insert(DailyIncomeRollup).from_select(
+        ['user_id', 'day', 'income_sum', 'income_count'], income_source
+    ))
+    db.execute(insert(DailyExpenseRollup).from_select(
+        ['user_id', 'day', 'category', 'expense_sum', 'expense_count'], expense_source
+    ))
+
+def get_income_total(db: Session, user_id: int, start_date: date, end_date: date) -> Tuple[float, int]:
+    """Income sum and entry count for a user over an inclusive day range"""
+    income_sum, income_count = db.query(
+        func.sum(DailyIncomeRollup.income_sum),
+        func.sum(DailyIncomeRollup.income_count)
+    ).filter(
+        DailyIncomeRollup.user_id == user_id,
+        DailyIncomeRollup.day >= start_date,
+        DailyIncomeRollup.day <= end_date
+    ).one()
+    return income_sum or 0, income_count or 0
+
+def get_expense_totals_by_category(db: Session, user_id: int, start_date: date, end_date: date) -> List[Tuple[ExpenseCategory, float]]:
+    """Expense sum per category for a user over an inclusive day range"""
+    return db.query(
+        DailyExpenseRollup.category,
+        func.sum(DailyExpenseRollup.expense_sum).label('total')
+    ).filter(
+        DailyExpenseRollup.user_id == user_id,
+        DailyExpenseRollup.day >= start_date,
+        DailyExpenseRollup.day <= end_date
+    ).group_by(
+        DailyExpenseRollup.category
+    ).having(
+        func.sum(DailyExpenseRollup.expense_count) > 0
+    ).all()
@@ -0,0 +1,149 @@
+from typing import Any, Callable, Dict, List
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from sqlalchemy import JSON, Boolean, Date, DateTime, Enum, Float, Integer, select
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.models.equipment import Equipment, EquipmentCost
+from app.models.harvest_expense import HarvestExpense, HousingExpense, EmployeeExpense
+from app.models.harvest_season import HarvestSeason
+from app.models.revenue import RevenueEntry, IncomeRateStructure
+from app.models.summary_calculation import SummaryCalculation, SummaryCropRevenue, SummaryEquipmentCost, SummaryHistory
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# File extension of each export format
+EXPORT_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Exported tables and the column tying each row to its harvest season
+SEASON_TABLES = {
+    'harvest_seasons': HarvestSeason.id,
+    'equipment': Equipment.harvest_season_id,
+    'equipment_costs': EquipmentCost.harvest_season_id,
+    'harvest_expenses': HarvestExpense.harvest_season_id,
+    'housing_expenses': HousingExpense.harvest_season_id,
+    'employee_expenses': EmployeeExpense.harvest_season_id,
+    'revenue_entries': RevenueEntry.harvest_season_id,
+    'income_rate_structures': IncomeRateStructure.harvest_season_id,
+    'summary_calculations': SummaryCalculation.harvest_season_id,
+    'summary_crop_revenues': SummaryCropRevenue.harvest_season_id,
+    'summary_equipment_costs': SummaryEquipmentCost.harvest_season_id,
+    'summary_history': SummaryHistory.harvest_season_id
+}
+
+class ExportUnavailable(Exception):
+    """Raised when pyarrow is not installed"""
+
+def require_pyarrow():
+    if pa is None:
+        raise ExportUnavailable("Parquet/Arrow export requires pyarrow; install it with 'pip install pyarrow'")
+
+def season_ids_for_user(user_id: int):
+    """Subquery of a user's harvest season ids, for exporting all of their seasons"""
+    return select(HarvestSeason.id).where(HarvestSeason.user_id == user_id).scalar_subquery()
+
+def arrow_type(column) -> "pa.DataType":
+    column_type = column.type
+    # JSON documents are written as their text
+    if isinstance(column_type, JSON):
+        return pa.string()
+    # Enum subclasses String, so it has to be matched first
+    if isinstance(column_type, Enum):
+        return pa.string()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us', tz='UTC' if column_type.timezone else None)
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+def export_table(connection: Connection, season_column, season_ids, fmt: str, path: str) -> int:
+    """Stream one table's rows for the given seasons into a Parquet or Arrow file.
+
+    Rows come from a server-side cursor in EXPORT_BATCH_SIZE partitions and
+    each partition is written as one record batch, so only a single batch is
+    held in memory. Returns the number of rows written.
+    """
+    table = season_column.table
+    schema = pa.schema([pa.field(column.name, arrow_type(column)) for column in table.columns])
+    enum_positions = [i for i, column in enumerate(table.columns) if isinstance(column.type, Enum)]
+    json_positions = [i for i, column in enumerate(table.columns) if isinstance(column.type, JSON)]
+    query = select(table).where(
+        season_column == season_ids if isinstance(season_ids, int) else season_column.in_(season_ids)
+    ).order_by(table.primary_key.columns.values()[0])
+
+    writer = pq.ParquetWriter(path, schema) if fmt == 'parquet' else pa.ipc.new_file(path, schema)
+    rows_written = 0
+    try:
+        result = connection.execution_options(
+            stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE
+        ).execute(query)
+        for partition in result.partitions():
+            columns: List[List[Any]] = [list(values) for values in zip(*partition)]
+            for i in enum_positions:
+                columns[i] = [value.value if value is not None else None for value in columns[i]]
+            for i in json_positions:
+                columns[i] = [json.dumps(value) if value is not None else None for value in columns[i]]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            rows_written += len(partition)
+    finally:
+        writer.close()
+    return rows_written
+
+def export_seasons(connection: Connection, season_ids, fmt: str, directory: str,
+                   progress: Callable[[str, int], None] = None) -> Dict[str, int]:
+    """Write every season table to <directory>/<table>.<ext>.
+
+    season_ids is a single season id, or a list or subquery of ids.
+    Returns the row count of each file.
+    """
+    require_pyarrow()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    counts = {}
+    for name, season_column in SEASON_TABLES.items():
+        path = os.path.join(directory, name + EXPORT_FORMATS[fmt])
+        counts[name] = export_table(connection, season_column, season_ids, fmt, path)
+        if progress:
+            progress(name, counts[name])
+    return counts
+
+def export_archive(connection: Connection, season_ids, fmt: str) -> str:
+    """Export the season tables into a zip file in a new temporary directory.
+
+    The caller removes the directory (os.path.dirname of the returned path)
+    once the archive has been sent.
+    """
+    require_pyarrow()
+    directory = tempfile.mkdtemp(prefix="season-export-")
+    try:
+        tables = os.path.join(directory, "tables")
+        os.mkdir(tables)
+        export_seasons(connection, season_ids, fmt, tables)
+
+        # Parquet pages are already compressed; Arrow IPC files are not
+        compression = zipfile.ZIP_STORED if fmt == 'parquet' else zipfile.ZIP_DEFLATED
+        archive = os.path.join(directory, "export.zip")
+        with zipfile.ZipFile(archive, "w", compression=compression) as zf:
+            for name in sorted(os.listdir(tables)):
+                zf.write(os.path.join(tables, name), name)
+        shutil.rmtree(tables)
+        return archive
+    except Exception:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
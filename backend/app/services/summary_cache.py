@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Any, Optional
+from app.core.config import settings
+
+class SummaryCache:
+    """In-process LRU cache of decoded summary views.
+
+    Entries are keyed on (harvest season id, summary id, version) and
+    remember the summary's updated_at, so a summary recalculated or changed
+    in place by another worker is detected on the next lookup. Recalculation and incremental updates
+    evict the season explicitly.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, harvest_season_id: int, summary_id: int, version: int, updated_at: Optional[datetime]) -> Optional[Dict[str, Any]]:
+        key = (harvest_season_id, summary_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['updated_at'] != updated_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry['views']
+
+    def put(self, harvest_season_id: int, summary_id: int, version: int, updated_at: Optional[datetime], views: Dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        key = (harvest_season_id, summary_id, version)
+        with self._lock:
+            self._entries[key] = {'updated_at': updated_at, 'views': views}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, harvest_season_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == harvest_season_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+summary_cache = SummaryCache(settings.SUMMARY_CACHE_MAX_ENTRIES)
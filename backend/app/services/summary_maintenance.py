@@ -0,0 +1,140 @@
+from typing import Dict, Any, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.harvest_season import HarvestSeason
+from app.models.equipment import Equipment
+from app.models.harvest_expense import HarvestExpense
+from app.models.revenue import RevenueEntry, PricingModel
+from app.models.summary_calculation import SummaryCalculation
+from app.services.calculation_engine import HarvestCalculationEngine, EXPENSE_CATEGORY_COLUMNS
+from app.services.summary_cache import summary_cache
+
+def snapshot_expense(expense: HarvestExpense) -> Dict[str, Any]:
+    """Fields of a harvest expense that feed the season summary"""
+    return {
+        'category': expense.category.value,
+        'amount': expense.amount
+    }
+
+def snapshot_revenue(entry: RevenueEntry) -> Dict[str, Any]:
+    """Fields of a revenue entry that feed the season summary"""
+    return {
+        'crop_type': entry.crop_type.value,
+        'per_acre': entry.pricing_model == PricingModel.PER_ACRE,
+        'quantity': entry.quantity,
+        'total_revenue': entry.total_revenue
+    }
+
+class SummaryMaintainer:
+    """Applies write deltas to the current SummaryCalculation of a season.
+
+    Handlers snapshot a row before and after a change and pass both here
+    (None for create or delete). The summary is updated in the caller's
+    transaction, so it stays current without a rescan; the recalculate
+    endpoints remain the full recompute used for reconciliation.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.engine = HarvestCalculationEngine(db)
+
+    def get_current_summary(self, harvest_season_id: int) -> Optional[SummaryCalculation]:
+        """Current summary for a season, locked for update"""
+        if not settings.INCREMENTAL_SUMMARIES:
+            return None
+
+        summary_cache.evict(harvest_season_id)
+        return self.db.query(SummaryCalculation).filter(
+            SummaryCalculation.harvest_season_id == harvest_season_id
+        ).with_for_update().first()
+
+    def snapshot_equipment(self, equipment: Equipment, harvest_season: HarvestSeason) -> Dict[str, Any]:
+        """Name and season cost of an equipment item"""
+        return {
+            'name': equipment.name,
+            'cost': self.engine.calculate_equipment_season_cost(equipment, harvest_season)
+        }
+
+    def expense_changed(self, harvest_season_id: int, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """Apply a harvest expense create/update/delete to the season summary"""
+        summary = self.get_current_summary(harvest_season_id)
+        if not summary:
+            return
+
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot and snapshot['category'] in EXPENSE_CATEGORY_COLUMNS:
+                column = EXPENSE_CATEGORY_COLUMNS[snapshot['category']]
+                setattr(summary, column, (getattr(summary, column) or 0.0) + sign * snapshot['amount'])
+
+        self.engine.update_derived_metrics(summary)
+
+    def revenue_changed(self, harvest_season_id: int, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """Apply a revenue entry create/update/delete to the season summary"""
+        summary = self.get_current_summary(harvest_season_id)
+        if not summary:
+            return
+
+        revenue_by_crop = dict(summary.revenue_by_crop or {})
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if not snapshot:
+                continue
+            crop = snapshot['crop_type']
+            summary.total_revenue = (summary.total_revenue or 0.0) + sign * snapshot['total_revenue']
+            revenue_by_crop[crop] = revenue_by_crop.get(crop, 0.0) + sign * snapshot['total_revenue']
+            if snapshot['per_acre']:
+                summary.acres_billed = (summary.acres_billed or 0.0) + sign * snapshot['quantity']
+
+        # Drop crops whose last entry went away, as a full recompute would
+        if before and before['crop_type'] != (after or {}).get('crop_type'):
+            self.db.flush()
+            crop_remaining = self.db.query(RevenueEntry.id).filter(
+                RevenueEntry.harvest_season_id == harvest_season_id,
+                RevenueEntry.crop_type == before['crop_type']
+            ).first()
+            if not crop_remaining:
+                revenue_by_crop.pop(before['crop_type'], None)
+
+        summary.set_revenue_by_crop(revenue_by_crop)
+        self.engine.update_derived_metrics(summary)
+
+    def equipment_changed(self, harvest_season_id: int, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """Apply an equipment create/update/delete to the season summary"""
+        summary = self.get_current_summary(harvest_season_id)
+        if not summary:
+            return
+
+        equipment_cost_breakdown = dict(summary.equipment_cost_breakdown or {})
+        if before:
+            summary.total_equipment_cost = (summary.total_equipment_cost or 0.0) - before['cost']
+        if after:
+            summary.total_equipment_cost = (summary.total_equipment_cost or 0.0) + after['cost']
+            equipment_cost_breakdown[after['name']] = after['cost']
+
+        # Equipment can share a name; a full recompute keeps the cost of the
+        # last item with that name, so re-derive names an update or delete touched
+        if before:
+            self.db.flush()
+            for name in {before['name'], (after or {}).get('name')} - {None}:
+                last_with_name = self.db.query(Equipment).filter(
+                    Equipment.harvest_season_id == harvest_season_id,
+                    Equipment.name == name
+                ).order_by(Equipment.id.desc()).first()
+                if last_with_name:
+                    equipment_cost_breakdown[name] = self.engine.calculate_equipment_season_cost(last_with_name, summary.harvest_season)
+                else:
+                    equipment_cost_breakdown.pop(name, None)
+
+        summary.set_equipment_cost_breakdown(equipment_cost_breakdown)
+        self.engine.update_derived_metrics(summary)
+
+    def season_changed(self, harvest_season: HarvestSeason):
+        """Refresh duration and equipment costs after season dates or interest rate change"""
+        summary = self.get_current_summary(harvest_season.id)
+        if not summary:
+            return
+
+        equipment_data = self.engine.calculate_equipment_totals(harvest_season)
+        summary.harvest_duration_days = self.engine.calculate_harvest_duration(harvest_season)
+        summary.total_equipment_cost = equipment_data['total_equipment_cost']
+        summary.set_equipment_cost_breakdown(equipment_data['equipment_cost_breakdown'])
+        self.engine.update_derived_metrics(summary)
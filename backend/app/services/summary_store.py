@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.models.summary_calculation import SummaryCalculation, SummaryHistory
+
+# Scalar summary columns copied onto the current row by a recalculation
+SUMMARY_VALUE_COLUMNS = [
+    'harvest_duration_days', 'acres_billed',
+    'total_equipment_cost', 'total_housing_cost', 'total_employee_cost', 'total_fuel_cost',
+    'total_maintenance_cost', 'total_insurance_cost', 'total_tax_cost', 'total_other_cost', 'total_expenses',
+    'total_revenue', 'gross_profit', 'net_profit', 'profit_margin',
+    'cost_per_acre', 'revenue_per_acre', 'profit_per_acre'
+]
+
+# Columns of the compact history record
+HISTORY_VALUE_COLUMNS = [column.name for column in SummaryHistory.__table__.columns
+                         if column.name not in ('id', 'harvest_season_id', 'version', 'calculated_at')]
+
+def save_summaries(db: Session, summaries: List[SummaryCalculation]) -> List[SummaryCalculation]:
+    """Upsert freshly calculated summaries as the current row of their seasons.
+
+    Existing rows are updated in place and their version bumped, so the
+    table keeps one row per season and its indexes are not churned. Every
+    saved version is also appended to summary_history, which is then pruned
+    to the retention policy. The caller commits and evicts the summary cache.
+    """
+    season_ids = [summary.harvest_season_id for summary in summaries]
+    _insert_missing_rows(db, season_ids)
+    current = {
+        summary.harvest_season_id: summary for summary in db.query(SummaryCalculation).options(
+            selectinload(SummaryCalculation.crop_revenues),
+            selectinload(SummaryCalculation.equipment_costs)
+        ).filter(SummaryCalculation.harvest_season_id.in_(season_ids)).with_for_update()
+    }
+
+    calculated_at = datetime.utcnow()
+    saved = []
+    for computed in summaries:
+        summary = current.get(computed.harvest_season_id)
+        if summary is None:
+            summary = computed
+            summary.version = 1
+            db.add(summary)
+        else:
+            for column in SUMMARY_VALUE_COLUMNS:
+                setattr(summary, column, getattr(computed, column))
+            summary.set_revenue_by_crop(computed.revenue_by_crop or {})
+            summary.set_equipment_cost_breakdown(computed.equipment_cost_breakdown or {})
+            summary.version += 1
+        summary.calculated_at = calculated_at
+        saved.append(summary)
+
+    if saved:
+        db.execute(insert(SummaryHistory), [{
+            'harvest_season_id': summary.harvest_season_id,
+            'version': summary.version,
+            'calculated_at': calculated_at,
+            **{column: getattr(summary, column) for column in HISTORY_VALUE_COLUMNS}
+        } for summary in saved])
+        prune_history(db, season_ids)
+    return saved
+
+def _insert_missing_rows(db: Session, season_ids: List[int]):
+    """Insert an empty version 0 row for seasons without a summary.
+
+    ON CONFLICT DO NOTHING waits for a concurrent transaction inserting the
+    same season and then skips, so every row exists before it is locked and
+    concurrent recalculations serialise on the row lock instead of failing
+    on the unique harvest_season_id.
+    """
+    dialect = db.get_bind().dialect.name
+    if not season_ids or dialect not in ('postgresql', 'sqlite'):
+        return
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    statement = dialect_insert(SummaryCalculation.__table__).values([
+        {'harvest_season_id': season_id, 'version': 0} for season_id in season_ids
+    ]).on_conflict_do_nothing(index_elements=['harvest_season_id'])
+    db.execute(statement)
+
+def prune_history(db: Session, season_ids: List[int]):
+    """Delete history beyond SUMMARY_HISTORY_MAX_VERSIONS or older than SUMMARY_HISTORY_RETENTION_DAYS"""
+    expired = []
+    if settings.SUMMARY_HISTORY_MAX_VERSIONS > 0:
+        ranked = select(
+            SummaryHistory.id,
+            func.row_number().over(
+                partition_by=SummaryHistory.harvest_season_id,
+                order_by=SummaryHistory.version.desc()
+            ).label('newer_versions')
+        ).where(SummaryHistory.harvest_season_id.in_(season_ids)).subquery()
+        expired.append(SummaryHistory.id.in_(
+            select(ranked.c.id).where(ranked.c.newer_versions > settings.SUMMARY_HISTORY_MAX_VERSIONS)
+        ))
+    if settings.SUMMARY_HISTORY_RETENTION_DAYS > 0:
+        expired.append(SummaryHistory.calculated_at < datetime.utcnow() - timedelta(days=settings.SUMMARY_HISTORY_RETENTION_DAYS))
+
+    if expired:
+        db.execute(delete(SummaryHistory).where(
+            SummaryHistory.harvest_season_id.in_(season_ids), or_(*expired)
+        ).execution_options(synchronize_session=False))
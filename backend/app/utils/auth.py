@@ -1,19 +1,90 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from threading import Lock
 from typing import Optional
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db, get_async_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.utils.password_hashing import password_hashing, PasswordHashingBusy
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+# Pinning min/max to the configured rounds makes needs_update flag any hash
+# made with different rounds, so it is rehashed on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 security = HTTPBearer()
 
+class PrincipalCache:
+    """TTL + LRU cache of authenticated users keyed by token subject.
+
+    Entries are detached copies of the user's column values. A hit is
+    attached to the request session with merge(load=False), so no SELECT
+    is issued. Writes that change a user invalidate its entry in this
+    worker; other workers pick the change up when the TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, db: Session, subject: str) -> Optional[User]:
+        snapshot = self._lookup(subject)
+        return db.merge(snapshot, load=False) if snapshot is not None else None
+
+    async def get_async(self, db: AsyncSession, subject: str) -> Optional[User]:
+        snapshot = self._lookup(subject)
+        return await db.merge(snapshot, load=False) if snapshot is not None else None
+
+    def _lookup(self, subject: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return snapshot
+
+    def put(self, subject: str, user: User):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     # Truncate password to 72 bytes to avoid bcrypt limitation
     if len(plain_password.encode('utf-8')) > 72:
@@ -26,6 +97,27 @@ def get_password_hash(password: str) -> str:
         password = password[:72]
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """Verify a password and return (valid, new_hash); new_hash is set when the stored hash is outdated"""
+    # Truncate password to 72 bytes to avoid bcrypt limitation
+    if len(plain_password.encode('utf-8')) > 72:
+        plain_password = plain_password[:72]
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def run_password_hashing(fn, *args):
+    """Run bcrypt work on the dedicated pool, answering 429 when it is saturated"""
+    try:
+        return await password_hashing.run(fn, *args)
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many authentication requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_password_hashing(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -47,29 +139,55 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    credentials_exception = HTTPException(
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+    """authenticate_user for async handlers: DB work on the threadpool, bcrypt on its own pool"""
+    user = await run_in_threadpool(get_user_by_email, db, email)
+    if not user:
+        return None
+    valid, new_hash = await run_password_hashing(verify_and_update_password, password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(_save_password_hash, db, user, new_hash)
+    return user
+
+def _save_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _decode_token(credentials: HTTPAuthorizationCredentials) -> TokenData:
     try:
         token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email)
+            raise _credentials_exception()
+        return TokenData(email=email)
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    token_data = _decode_token(credentials)
+    
+    user = principal_cache.get(db, token_data.email)
+    if user is not None:
+        return user
     
     user = get_user_by_email(db, email=token_data.email)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal_cache.put(token_data.email, user)
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -77,6 +195,45 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user for async endpoints, attached to the request's AsyncSession"""
+    token_data = _decode_token(credentials)
+    
+    user = await principal_cache.get_async(db, token_data.email)
+    if user is not None:
+        return user
+    
+    user = (await db.execute(select(User).where(User.email == token_data.email))).scalars().first()
+    if user is None:
+        raise _credentials_exception()
+    principal_cache.put(token_data.email, user)
+    return user
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+def is_admin_token(authorization: str) -> bool:
+    """Whether an Authorization header carries a valid token of an active admin"""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        token_data = _decode_token(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+    except HTTPException:
+        return False
+    
+    db = SessionLocal()
+    try:
+        user = get_user_by_email(db, email=token_data.email)
+        return user is not None and user.is_active and user.is_admin
+    finally:
+        db.close()
+
 def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
@@ -0,0 +1,85 @@
+from datetime import date, datetime
+from typing import Any, Optional, Type
+import base64
+import json
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_session_factory
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps({"v": sort_value, "id": row_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_column=None):
+    """Return (sort value, id) from a cursor made by encode_cursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        sort_value, row_id = payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if sort_value is not None and sort_column is not None:
+        python_type = sort_column.type.python_type
+        try:
+            if python_type is datetime:
+                sort_value = datetime.fromisoformat(sort_value)
+            elif python_type is date:
+                sort_value = date.fromisoformat(sort_value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort_value, row_id
+
+def keyset(query, sort_column, id_column, cursor: Optional[str]):
+    """Order a select by (sort column, id) and continue after the cursor's row.
+
+    sort_column may be None to page on id alone.
+    """
+    if sort_column is None:
+        query = query.order_by(id_column)
+        if cursor:
+            _, last_id = decode_cursor(cursor)
+            query = query.where(id_column > last_id)
+        return query
+
+    query = query.order_by(sort_column, id_column)
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort_column)
+        query = query.where(or_(
+            sort_column > last_value,
+            and_(sort_column == last_value, id_column > last_id)
+        ))
+    return query
+
+async def fetch_page(db: AsyncSession, query, sort_attribute: Optional[str], limit: int, response: Response):
+    """Run a keyset query and advertise the next cursor when the page is full"""
+    rows = (await db.execute(query.limit(limit))).scalars().all()
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, sort_attribute) if sort_attribute else None, last.id
+        )
+    return rows
+
+def stream_ndjson(query, schema: Type[BaseModel]) -> StreamingResponse:
+    """Stream rows as NDJSON from a server-side cursor, one validated row at a time.
+
+    The rows are read on a session of their own, because the request's
+    session is closed once the handler returns.
+    """
+    async def rows():
+        async with get_async_session_factory()() as db:
+            result = await db.stream(query.execution_options(yield_per=1000))
+            async for row in result.scalars():
+                yield schema.model_validate(row).model_dump_json() + "\n"
+
+    return StreamingResponse(rows(), media_type=NDJSON_MEDIA_TYPE)
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict
+import asyncio
+import time
+
+from app.core.config import settings
+
+class PasswordHashingBusy(Exception):
+    """Raised when the bcrypt queue is full and the request should be retried later"""
+
+class PasswordHashingExecutor:
+    """Dedicated, size-limited thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so a few threads keep CPUs busy without
+    occupying the request worker threads. At most max_workers + max_queue
+    operations are admitted; anything beyond that is rejected immediately
+    so callers can answer 429 instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusy()
+            self._in_flight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+
+        submitted = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._timed, submitted, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': self._in_flight - self._running,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'avg_wait_ms': self._wait_seconds / self._completed * 1000 if self._completed else 0.0,
+                'avg_run_ms': self._run_seconds / self._completed * 1000 if self._completed else 0.0
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _timed(self, submitted: float, fn: Callable, *args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._wait_seconds += started - submitted
+                self._run_seconds += finished - started
+
+password_hashing = PasswordHashingExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
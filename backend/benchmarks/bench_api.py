@@ -0,0 +1,32 @@
+from datetime import date
+
+import pytest
+
+from app.services.summary_cache import summary_cache
+from benchmarks.generator import START
+
+SUMMARY_VIEWS = ["", "/overview", "/profit-loss", "/cost-breakdown", "/revenue-breakdown", "/equipment-analysis", "/history"]
+
+def get_ok(client, url, **kwargs):
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200, response.text
+    return response
+
+@pytest.mark.parametrize("view", SUMMARY_VIEWS, ids=lambda view: view.strip("/") or "summary")
+def bench_summary_view(benchmark, client, auth_headers, dataset, view):
+    url = f"/api/summary/harvest-season/{dataset['season_ids'][0]}{view}"
+    benchmark(get_ok, client, url, headers=auth_headers)
+
+def bench_summary_overview_uncached(benchmark, client, auth_headers, dataset):
+    url = f"/api/summary/harvest-season/{dataset['season_ids'][0]}/overview"
+    benchmark.pedantic(get_ok, args=(client, url), kwargs={'headers': auth_headers},
+                       setup=summary_cache.clear, rounds=50)
+
+def bench_dashboard_analytics(benchmark, client, auth_headers):
+    params = {'start_date': START.date().isoformat(), 'end_date': date(START.year, 8, 31).isoformat()}
+    response = benchmark(get_ok, client, "/api/analytics/dashboard", headers=auth_headers, params=params)
+    assert response.json()['peer_comparisons']
+
+def bench_revenue_page(benchmark, client, auth_headers, dataset):
+    url = f"/api/harvest-revenue/harvest-season/{dataset['season_ids'][0]}"
+    benchmark(get_ok, client, url, headers=auth_headers, params={'limit': 100})
@@ -0,0 +1,46 @@
+import pytest
+
+from app.models import HarvestSeason, PayCycle
+from app.services.calculation_engine import get_calculation_engine
+
+BACKENDS = ["python", "numpy", "sql"]
+
+def largest_season(db, dataset) -> HarvestSeason:
+    return db.get(HarvestSeason, dataset['season_ids'][0])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def bench_calculate_profit_loss(benchmark, db, dataset, backend):
+    calculation_engine = get_calculation_engine(db, backend)
+    season = largest_season(db, dataset)
+
+    summary = benchmark(calculation_engine.calculate_profit_loss, season)
+    assert summary.total_revenue > 0
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def bench_calculate_equipment_totals(benchmark, db, dataset, backend):
+    calculation_engine = get_calculation_engine(db, backend)
+    season = largest_season(db, dataset)
+
+    totals = benchmark(calculation_engine.calculate_equipment_totals, season)
+    assert totals['equipment_cost_breakdown']
+
+@pytest.mark.parametrize("pay_cycle", list(PayCycle), ids=lambda pay_cycle: pay_cycle.value)
+def bench_get_pay_periods(benchmark, db, dataset, pay_cycle):
+    calculation_engine = get_calculation_engine(db, "python")
+    season = db.query(HarvestSeason).filter(
+        HarvestSeason.id.in_(dataset['season_ids']),
+        HarvestSeason.pay_cycle == pay_cycle
+    ).first()
+    if season is None:
+        pytest.skip(f"No {pay_cycle.value} season at this dataset size")
+
+    periods = benchmark(calculation_engine.get_pay_periods, season)
+    assert periods
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def bench_recalculate_harvest_season(benchmark, db, dataset, backend):
+    calculation_engine = get_calculation_engine(db, backend)
+    season_id = dataset['season_ids'][0]
+
+    summary = benchmark.pedantic(calculation_engine.recalculate_harvest_season, args=(season_id,), rounds=10, iterations=1)
+    assert summary.harvest_season_id == season_id
@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import pytest
+
+def pytest_addoption(parser):
+    group = parser.getgroup("harvester benchmarks")
+    group.addoption("--bench-database-url", default=None,
+                    help="Scratch database to seed; it is dropped and recreated. Defaults to a temporary SQLite file")
+    group.addoption("--bench-users", type=int, default=20, help="Synthetic users")
+    group.addoption("--bench-seasons-per-user", type=int, default=2, help="Harvest seasons per user")
+    group.addoption("--bench-equipment", type=int, default=10, help="Equipment items per season")
+    group.addoption("--bench-expenses", type=int, default=200, help="Harvest expenses per season")
+    group.addoption("--bench-revenue", type=int, default=500, help="Revenue tickets per season")
+    group.addoption("--bench-entries-per-user", type=int, default=200, help="Income and expense entries per user")
+
+def pytest_configure(config):
+    # The app builds its engine from DATABASE_URL on import, so point it at the scratch database first
+    url = config.getoption("--bench-database-url")
+    if url is None:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="harvester-bench-"), "benchmark.db")
+    os.environ["DATABASE_URL"] = url
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    """Seed the scratch database once per run and precompute every season summary"""
+    from app.core.database import Base, SessionLocal, engine
+    from app.services.batch_recalculation import recalculate_chunk
+    from app.services.peer_stats import peer_stats_cache
+    from app.services.rollups import rebuild_rollups
+    from benchmarks.generator import generate
+
+    option = request.config.getoption
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ids = generate(
+            connection,
+            users=option("--bench-users"),
+            seasons_per_user=option("--bench-seasons-per-user"),
+            equipment_per_season=option("--bench-equipment"),
+            expenses_per_season=option("--bench-expenses"),
+            revenue_per_season=option("--bench-revenue"),
+            entries_per_user=option("--bench-entries-per-user")
+        )
+
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db)
+        db.commit()
+    finally:
+        db.close()
+    recalculate_chunk(ids['season_ids'])
+    peer_stats_cache.refresh()
+    return ids
+
+@pytest.fixture
+def db(dataset):
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    from fastapi.testclient import TestClient
+    import main
+
+    return TestClient(main.app)
+
+@pytest.fixture(scope="session")
+def auth_headers(dataset):
+    from app.utils.auth import create_access_token
+    from benchmarks.generator import user_email
+
+    return {"Authorization": "Bearer " + create_access_token({"sub": user_email(0)})}
@@ -0,0 +1,127 @@
+"""
+Deterministic synthetic data for the benchmarks
+
+The same arguments always produce the same users, seasons and entries, so
+timings taken on different commits run against identical data.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+
+from app.models import (
+    User, BillingMethod, IncomeEntry, ExpenseEntry, ExpenseCategory, HarvestSeason, PayCycle,
+    Equipment, EquipmentType, OwnershipType, HarvestExpense, HarvestExpenseCategory,
+    HousingExpense, HousingType, EmployeeExpense, EmployeeExpenseType,
+    RevenueEntry, CropType, PricingModel
+)
+
+STATES = ["Kansas", "Nebraska", "Oklahoma", "Texas", "South Dakota", "North Dakota", "Montana", "Colorado"]
+START = datetime(2024, 5, 1)
+EMAIL_DOMAIN = "bench.example.com"
+
+def user_email(index: int) -> str:
+    return f"harvester-{index}@{EMAIL_DOMAIN}"
+
+def generate(
+    connection: Connection,
+    users: int = 20,
+    seasons_per_user: int = 2,
+    equipment_per_season: int = 10,
+    expenses_per_season: int = 200,
+    revenue_per_season: int = 500,
+    entries_per_user: int = 200,
+    seed: int = 42
+) -> Dict[str, List[int]]:
+    """Bulk insert a synthetic dataset and return the generated user and season ids.
+
+    Users are spread round-robin across STATES and seasons cycle through
+    every PayCycle, so each pay period path of the engine is exercised.
+    """
+    rnd = random.Random(seed)
+
+    connection.execute(insert(User), [{
+        'email': user_email(i),
+        'name': f"Harvester {i}",
+        'hashed_password': "x",
+        'state': STATES[i % len(STATES)],
+        'billing_method': list(BillingMethod)[i % len(BillingMethod)],
+        'is_active': True,
+        'is_admin': False
+    } for i in range(users)])
+    user_ids = list(connection.execute(
+        select(User.id).where(User.email.like(f"%@{EMAIL_DOMAIN}")).order_by(User.id)
+    ).scalars())
+
+    income_rows, expense_rows, season_rows = [], [], []
+    pay_cycles = list(PayCycle)
+    for user_index, user_id in enumerate(user_ids):
+        for i in range(entries_per_user):
+            day = START + timedelta(days=i % 120, hours=rnd.randint(6, 20))
+            income_rows.append({
+                'user_id': user_id, 'acres_harvested': rnd.uniform(10, 500), 'rate_per_unit': rnd.uniform(20, 40),
+                'total_earned': rnd.uniform(200, 20000), 'harvest_date': day
+            })
+            expense_rows.append({
+                'user_id': user_id, 'category': rnd.choice(list(ExpenseCategory)), 'amount': rnd.uniform(10, 5000),
+                'expense_date': day
+            })
+        for i in range(seasons_per_user):
+            start = START + timedelta(days=rnd.randint(0, 20))
+            season_rows.append({
+                'user_id': user_id, 'business_name': f"Harvester {user_index} season {i}",
+                'actual_start_date': start, 'actual_end_date': start + timedelta(days=rnd.randint(45, 150)),
+                'pay_cycle': pay_cycles[(user_index * seasons_per_user + i) % len(pay_cycles)],
+                'interest_rate': rnd.uniform(3, 9), 'is_active': True
+            })
+    if income_rows:
+        connection.execute(insert(IncomeEntry), income_rows)
+        connection.execute(insert(ExpenseEntry), expense_rows)
+    if season_rows:
+        connection.execute(insert(HarvestSeason), season_rows)
+
+    season_ids = list(connection.execute(
+        select(HarvestSeason.id).where(HarvestSeason.user_id.in_(user_ids)).order_by(HarvestSeason.id)
+    ).scalars())
+
+    rows: Dict[Any, List[Dict[str, Any]]] = {
+        Equipment: [], HarvestExpense: [], RevenueEntry: [], HousingExpense: [], EmployeeExpense: []
+    }
+    for season_id in season_ids:
+        for i in range(equipment_per_season):
+            rows[Equipment].append({
+                'harvest_season_id': season_id, 'name': f"{rnd.choice(list(EquipmentType)).value} {i}",
+                'equipment_type': rnd.choice(list(EquipmentType)), 'ownership_type': rnd.choice(list(OwnershipType)),
+                'purchase_price': rnd.uniform(1e4, 5e5), 'current_value': rnd.uniform(1e4, 3e5),
+                'years_ownership': rnd.uniform(1, 10), 'lease_rate': rnd.uniform(500, 5000),
+                'monthly_payment': rnd.uniform(500, 5000), 'working_days': rnd.uniform(10, 90), 'is_active': True
+            })
+        for i in range(expenses_per_season):
+            period = START + timedelta(days=rnd.randint(0, 120))
+            rows[HarvestExpense].append({
+                'harvest_season_id': season_id, 'category': rnd.choice(list(HarvestExpenseCategory)),
+                'amount': rnd.uniform(10, 5000), 'period_start': period, 'period_end': period + timedelta(days=7)
+            })
+        for i in range(revenue_per_season):
+            rows[RevenueEntry].append({
+                'harvest_season_id': season_id, 'crop_type': rnd.choice(list(CropType)),
+                'pricing_model': rnd.choice(list(PricingModel)), 'quantity': rnd.uniform(10, 500),
+                'rate': rnd.uniform(10, 50), 'total_revenue': rnd.uniform(300, 15000),
+                'harvest_date': START + timedelta(days=rnd.randint(0, 120))
+            })
+        rows[HousingExpense].append({
+            'harvest_season_id': season_id, 'housing_type': rnd.choice(list(HousingType)),
+            'total_amount': rnd.uniform(500, 5000), 'period_start': START, 'period_end': START + timedelta(days=90)
+        })
+        rows[EmployeeExpense].append({
+            'harvest_season_id': season_id, 'expense_type': rnd.choice(list(EmployeeExpenseType)),
+            'amount': rnd.uniform(1000, 10000), 'period_start': START, 'period_end': START + timedelta(days=90)
+        })
+    for model, model_rows in rows.items():
+        if model_rows:
+            connection.execute(insert(model), model_rows)
+
+    return {'user_ids': user_ids, 'season_ids': season_ids}
@@ -1,12 +1,19 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
 import uvicorn
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_pool_status, dispose_async_engine
+from app.core.metrics import MetricsMiddleware, render_metrics, PROMETHEUS_CONTENT_TYPE
+from app.core.profiling import ProfilingMiddleware
+from app.core.slow_queries import slow_query_log
 from app.api import auth, users, income, expenses, analytics, admin, harvest_seasons, equipment, harvest_expenses, harvest_revenue, summary
+from app.services.recalculation_jobs import recalculation_jobs
+from app.services.batch_recalculation import batch_recalculation_jobs
+from app.services.peer_stats import peer_stats_cache
+from app.utils.password_hashing import password_hashing
 
 app = FastAPI(
     title="Harvester Tracking API",
@@ -21,8 +28,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# On-demand request profiling, reports under /api/admin/profiles
+app.add_middleware(ProfilingMiddleware)
+
+# Request and SQL metrics, scraped from /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -38,6 +53,22 @@ app.include_router(harvest_expenses.router, prefix="/api/harvest-expenses", tags
 app.include_router(harvest_revenue.router, prefix="/api/harvest-revenue", tags=["harvest-revenue"])
 app.include_router(summary.router, prefix="/api/summary", tags=["summary"])
 
+@app.on_event("startup")
+def start_background_workers():
+    peer_stats_cache.start()
+
+@app.on_event("shutdown")
+def shutdown_background_workers():
+    recalculation_jobs.shutdown()
+    batch_recalculation_jobs.shutdown()
+    peer_stats_cache.stop()
+    password_hashing.shutdown()
+    slow_query_log.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
 @app.get("/")
 async def root():
     return {"message": "Harvester Tracking API", "version": "1.0.0"}
@@ -46,5 +77,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+async def database_health_check():
+    return {"status": "healthy", "pool": get_pool_status()}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Script to check that hot API queries are served by indexes.
+
+Builds the schema of an empty scratch PostgreSQL database with
+`alembic upgrade head`, so the indexes checked are the ones the migrations
+create, seeds a large synthetic dataset into it, then EXPLAINs each hot
+query and exits non-zero if any of them falls back to a sequential scan.
+The application database is refused.
+"""
+
+import sys
+import os
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, insert, select, func, text
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+from app.models import (
+    User, IncomeEntry, ExpenseEntry, ExpenseCategory, HarvestSeason, PayCycle,
+    Equipment, EquipmentCost, EquipmentType, OwnershipType, HarvestExpense, HarvestExpenseCategory,
+    HousingExpense, HousingType, EmployeeExpense, EmployeeExpenseType,
+    RevenueEntry, IncomeRateStructure, CropType, PricingModel, SummaryCalculation, SummaryEquipmentCost, SummaryHistory,
+    DailyIncomeRollup, DailyExpenseRollup
+)
+
+STATES = ["Kansas", "Nebraska", "Oklahoma", "Texas", "South Dakota", "North Dakota", "Montana"]
+START = datetime(2024, 5, 1)
+
+def seed(connection, users: int, entries_per_user: int, seasons_per_user: int):
+    """Bulk insert synthetic users, entries and harvest seasons"""
+    rnd = random.Random(42)
+    user_rows = [{
+        'email': f"plan-check-{i}@example.com",
+        'name': f"Harvester {i}",
+        'hashed_password': "x",
+        'state': rnd.choice(STATES),
+        'billing_method': 'per_acre',
+        'is_active': True,
+        'is_admin': False
+    } for i in range(users)]
+    connection.execute(insert(User), user_rows)
+    user_ids = [user_id for (user_id,) in connection.execute(select(User.id).where(User.email.like("plan-check-%")))]
+
+    def day(i):
+        return START + timedelta(days=i % 365, hours=rnd.randint(0, 23))
+
+    income_rows, expense_rows, season_rows = [], [], []
+    for user_id in user_ids:
+        for i in range(entries_per_user):
+            income_rows.append({
+                'user_id': user_id, 'acres_harvested': rnd.uniform(10, 500), 'rate_per_unit': rnd.uniform(20, 40),
+                'total_earned': rnd.uniform(200, 20000), 'harvest_date': day(i)
+            })
+            expense_rows.append({
+                'user_id': user_id, 'category': rnd.choice(list(ExpenseCategory)), 'amount': rnd.uniform(10, 5000),
+                'expense_date': day(i)
+            })
+        for i in range(seasons_per_user):
+            season_rows.append({
+                'user_id': user_id, 'business_name': f"Season {i}", 'actual_start_date': START,
+                'actual_end_date': START + timedelta(days=90), 'pay_cycle': PayCycle.WEEKLY,
+                'interest_rate': 6.0, 'is_active': True
+            })
+    connection.execute(insert(IncomeEntry), income_rows)
+    connection.execute(insert(ExpenseEntry), expense_rows)
+    connection.execute(insert(HarvestSeason), season_rows)
+
+    season_ids = [season_id for (season_id,) in connection.execute(
+        select(HarvestSeason.id).where(HarvestSeason.user_id.in_(user_ids))
+    )]
+    equipment_rows, expense_rows, revenue_rows, summary_rows = [], [], [], []
+    housing_rows, employee_rows, rate_rows = [], [], []
+    for season_id in season_ids:
+        for i in range(3):
+            equipment_rows.append({
+                'harvest_season_id': season_id, 'name': f"Combine {i}", 'equipment_type': EquipmentType.COMBINE,
+                'ownership_type': OwnershipType.OWNED, 'purchase_price': 400000.0, 'is_active': True
+            })
+        for i in range(10):
+            period = day(i)
+            expense_rows.append({
+                'harvest_season_id': season_id, 'category': rnd.choice(list(HarvestExpenseCategory)),
+                'amount': rnd.uniform(10, 5000), 'period_start': period, 'period_end': period
+            })
+            revenue_rows.append({
+                'harvest_season_id': season_id, 'crop_type': rnd.choice(list(CropType)),
+                'pricing_model': PricingModel.PER_ACRE, 'quantity': rnd.uniform(10, 500), 'rate': 30.0,
+                'total_revenue': rnd.uniform(300, 15000), 'harvest_date': period
+            })
+        housing_rows.append({
+            'harvest_season_id': season_id, 'housing_type': HousingType.CAMPER, 'total_amount': 1500.0,
+            'period_start': START, 'period_end': START
+        })
+        employee_rows.append({
+            'harvest_season_id': season_id, 'expense_type': EmployeeExpenseType.WAGES, 'amount': 3000.0,
+            'period_start': START, 'period_end': START
+        })
+        rate_rows.append({'harvest_season_id': season_id, 'crop_type': CropType.CORN, 'state': rnd.choice(STATES)})
+        summary_rows.append({'harvest_season_id': season_id, 'total_revenue': 0.0})
+    connection.execute(insert(Equipment), equipment_rows)
+    connection.execute(insert(HarvestExpense), expense_rows)
+    connection.execute(insert(RevenueEntry), revenue_rows)
+    connection.execute(insert(HousingExpense), housing_rows)
+    connection.execute(insert(EmployeeExpense), employee_rows)
+    connection.execute(insert(IncomeRateStructure), rate_rows)
+    connection.execute(insert(SummaryCalculation), summary_rows)
+
+    equipment = connection.execute(select(Equipment.id, Equipment.harvest_season_id).where(
+        Equipment.harvest_season_id.in_(season_ids)
+    )).all()
+    connection.execute(insert(EquipmentCost), [{
+        'harvest_season_id': season_id, 'equipment_id': equipment_id, 'period_start': START,
+        'period_end': START + timedelta(days=7), 'total_cost': 1000.0
+    } for equipment_id, season_id in equipment])
+
+    summaries = connection.execute(select(SummaryCalculation.id, SummaryCalculation.harvest_season_id).where(
+        SummaryCalculation.harvest_season_id.in_(season_ids)
+    )).all()
+    connection.execute(insert(SummaryEquipmentCost), [{
+        'summary_calculation_id': summary_id, 'harvest_season_id': season_id, 'equipment_name': f"Combine {i}",
+        'cost': rnd.uniform(1000, 50000)
+    } for summary_id, season_id in summaries for i in range(3)])
+    connection.execute(insert(SummaryHistory), [{
+        'harvest_season_id': season_id, 'version': version, 'calculated_at': START + timedelta(days=version),
+        'total_revenue': rnd.uniform(1000, 50000)
+    } for season_id in season_ids for version in range(1, 6)])
+
+    income_day = func.date(IncomeEntry.harvest_date)
+    expense_day = func.date(ExpenseEntry.expense_date)
+    connection.execute(insert(DailyIncomeRollup).from_select(
+        ['user_id', 'day', 'income_sum', 'income_count'],
+        select(IncomeEntry.user_id, income_day, func.sum(IncomeEntry.total_earned), func.count(IncomeEntry.id))
+        .where(IncomeEntry.user_id.in_(user_ids)).group_by(IncomeEntry.user_id, income_day)
+    ))
+    connection.execute(insert(DailyExpenseRollup).from_select(
+        ['user_id', 'day', 'category', 'expense_sum', 'expense_count'],
+        select(ExpenseEntry.user_id, expense_day, ExpenseEntry.category, func.sum(ExpenseEntry.amount), func.count(ExpenseEntry.id))
+        .where(ExpenseEntry.user_id.in_(user_ids)).group_by(ExpenseEntry.user_id, expense_day, ExpenseEntry.category)
+    ))
+    return user_ids[len(user_ids) // 2], season_ids[len(season_ids) // 2]
+
+def hot_queries(user_id: int, season_id: int):
+    """Queries issued on every dashboard, list and summary request"""
+    start, end = START + timedelta(days=30), START + timedelta(days=60)
+    return {
+        'income by user and date': select(IncomeEntry.total_earned).where(
+            IncomeEntry.user_id == user_id, IncomeEntry.harvest_date >= start, IncomeEntry.harvest_date <= end),
+        'expenses by user, date and category': select(ExpenseEntry.amount).where(
+            ExpenseEntry.user_id == user_id, ExpenseEntry.expense_date >= start, ExpenseEntry.expense_date <= end,
+            ExpenseEntry.category == ExpenseCategory.FUEL),
+        'harvest seasons by user': select(HarvestSeason).where(HarvestSeason.user_id == user_id),
+        'equipment by season': select(Equipment).where(Equipment.harvest_season_id == season_id),
+        'equipment costs by season': select(EquipmentCost).where(EquipmentCost.harvest_season_id == season_id),
+        'harvest expenses by season': select(HarvestExpense.category, func.sum(HarvestExpense.amount)).where(
+            HarvestExpense.harvest_season_id == season_id).group_by(HarvestExpense.category),
+        'housing expenses by season': select(HousingExpense).where(HousingExpense.harvest_season_id == season_id),
+        'employee expenses by season': select(EmployeeExpense).where(EmployeeExpense.harvest_season_id == season_id),
+        'revenue by season': select(RevenueEntry.crop_type, func.sum(RevenueEntry.total_revenue)).where(
+            RevenueEntry.harvest_season_id == season_id).group_by(RevenueEntry.crop_type),
+        'rate structures by season': select(IncomeRateStructure).where(IncomeRateStructure.harvest_season_id == season_id),
+        'summary by season': select(SummaryCalculation).where(SummaryCalculation.harvest_season_id == season_id),
+        'summary history by season': select(SummaryHistory).where(
+            SummaryHistory.harvest_season_id == season_id).order_by(SummaryHistory.version.desc()),
+        'equipment summary cost by name across seasons': select(func.sum(SummaryEquipmentCost.cost)).where(
+            SummaryEquipmentCost.equipment_name == "Combine 1"),
+        'income rollups by user and day': select(func.sum(DailyIncomeRollup.income_sum)).where(
+            DailyIncomeRollup.user_id == user_id, DailyIncomeRollup.day >= start.date(), DailyIncomeRollup.day <= end.date()),
+        'expense rollups by user and day': select(DailyExpenseRollup.category, func.sum(DailyExpenseRollup.expense_sum)).where(
+            DailyExpenseRollup.user_id == user_id, DailyExpenseRollup.day >= start.date(), DailyExpenseRollup.day <= end.date()
+        ).group_by(DailyExpenseRollup.category),
+    }
+
+def sequential_scans(connection, statement):
+    """Tables read by a sequential scan in the statement's plan"""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    plan = connection.execute(text("EXPLAIN (FORMAT JSON) " + sql)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scans = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan':
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return scans
+
+def migrate(database_url: str):
+    """Build the schema with the migrations, as deployments do"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config = Config(os.path.join(backend_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+    # alembic/env.py takes the URL from DATABASE_URL
+    os.environ["DATABASE_URL"] = database_url
+    command.upgrade(config, "head")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot query falls back to a sequential scan")
+    parser.add_argument("--database-url", required=True, help="Empty scratch PostgreSQL database to migrate, seed and check")
+    parser.add_argument("--users", type=int, default=2000, help="Synthetic users to seed")
+    parser.add_argument("--entries-per-user", type=int, default=50, help="Income and expense entries per user")
+    parser.add_argument("--seasons-per-user", type=int, default=2, help="Harvest seasons per user")
+    args = parser.parse_args()
+
+    url = make_url(args.database_url)
+    if url.get_backend_name() != "postgresql":
+        parser.error("the query plan check needs a PostgreSQL database; the migrations are PostgreSQL-specific")
+    if url.render_as_string(hide_password=False) == make_url(settings.DATABASE_URL).render_as_string(hide_password=False):
+        parser.error("--database-url is the application database; point it at a scratch database")
+
+    engine = create_engine(url)
+    existing_tables = inspect(engine).get_table_names()
+    if existing_tables:
+        parser.error(f"{url.render_as_string()} is not empty ({len(existing_tables)} tables); use a fresh scratch database")
+    migrate(args.database_url)
+
+    with engine.begin() as connection:
+        user_id, season_id = seed(connection, args.users, args.entries_per_user, args.seasons_per_user)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+    failures = 0
+    with engine.connect() as connection:
+        for name, statement in hot_queries(user_id, season_id).items():
+            scans = sequential_scans(connection, statement)
+            if scans:
+                failures += 1
+                print(f"FAIL {name}: sequential scan on {', '.join(scans)}")
+            else:
+                print(f"ok   {name}")
+
+    if failures:
+        print(f"{failures} hot queries fell back to a sequential scan")
+        sys.exit(1)
+    print("All hot queries use indexes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Script to export harvest seasons to Parquet or Arrow files for offline analysis
+
+Writes one file per table (seasons, equipment, costs, expenses, revenue and
+summaries) into the output directory, streaming rows from the database in
+batches. Requires pyarrow.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.database import engine
+from app.services.season_export import EXPORT_FORMATS, ExportUnavailable, export_seasons, season_ids_for_user
+
+def main():
+    parser = argparse.ArgumentParser(description="Export harvest seasons to Parquet/Arrow files")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--season-id", type=int, help="Export this harvest season")
+    target.add_argument("--user-id", type=int, help="Export all harvest seasons of this user")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="parquet", help="Output file format")
+    parser.add_argument("--output-dir", required=True, help="Directory to write one file per table into")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    season_ids = args.season_id if args.season_id is not None else season_ids_for_user(args.user_id)
+
+    try:
+        with engine.connect() as connection:
+            export_seasons(
+                connection, season_ids, args.format, args.output_dir,
+                progress=lambda table, rows: print(f"{table}: {rows} rows")
+            )
+        print(f"Export written to {args.output_dir}")
+    except ExportUnavailable as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error exporting seasons: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
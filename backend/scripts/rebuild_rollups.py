@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the daily income and expense rollups from the raw entries
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.database import SessionLocal, engine, Base
+from app.models import DailyIncomeRollup, DailyExpenseRollup
+from app.services.rollups import rebuild_rollups
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily analytics rollups")
+    parser.add_argument("--user-id", type=int, help="Only rebuild rollups of this user")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine, tables=[DailyIncomeRollup.__table__, DailyExpenseRollup.__table__])
+
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db, args.user_id)
+        db.commit()
+        print("Rollups rebuilt successfully")
+    except Exception as e:
+        print(f"Error rebuilding rollups: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Script to recalculate harvest season summaries in bulk across a process pool
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.services.batch_recalculation import recalculate_seasons, get_all_season_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalculate harvest season summaries")
+    parser.add_argument("--season-ids", type=int, nargs="+", help="Seasons to recalculate (default: all)")
+    parser.add_argument("--user-id", type=int, help="Only recalculate seasons of this user")
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, help="Seasons per transaction")
+    parser.add_argument("--backend", choices=["python", "numpy", "sql"], help="Calculation engine")
+    args = parser.parse_args()
+
+    season_ids = args.season_ids
+    if season_ids is None:
+        season_ids = get_all_season_ids(args.user_id)
+
+    result = recalculate_seasons(
+        season_ids=season_ids,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        backend=args.backend
+    )
+
+    print(f"Recalculated {result['recalculated_seasons']} of {result['requested_seasons']} seasons "
+          f"in {result['chunks']} chunks using {result['workers']} workers")
+    for failed in result['failed_chunks']:
+        print(f"Failed chunk {failed['season_ids']}: {failed['error']}")
+    print(f"Elapsed: {result['elapsed_seconds']:.2f}s")
+    print(f"Throughput: {result['seasons_per_second']:.1f} seasons/sec")
+
+    if result['failed_chunks']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -35,17 +35,12 @@ export const HarvestSummaryPage: React.FC<HarvestSummaryPageProps> = ({ harvestS
 
   const fetchSummaryData = useCallback(async () => {
     try {
-      const [profitLossData, costData, revenueData, equipmentData] = await Promise.all([
-        summaryService.getProfitLossSummary(harvestSeasonId),
-        summaryService.getCostBreakdown(harvestSeasonId),
-        summaryService.getRevenueBreakdown(harvestSeasonId),
-        summaryService.getEquipmentAnalysis(harvestSeasonId),
-      ]);
+      const overview = await summaryService.getSummaryOverview(harvestSeasonId);
 
-      setProfitLoss(profitLossData);
-      setCostBreakdown(costData);
-      setRevenueBreakdown(revenueData);
-      setEquipmentAnalysis(equipmentData);
+      setProfitLoss(overview.profit_loss);
+      setCostBreakdown(overview.cost_breakdown);
+      setRevenueBreakdown(overview.revenue_breakdown);
+      setEquipmentAnalysis(overview.equipment_analysis);
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to load summary data');
     } finally {
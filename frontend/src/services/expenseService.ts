@@ -3,7 +3,7 @@ import { ExpenseEntry } from '../types';
 
 export const expenseService = {
   async getExpenseEntries(params?: {
-    skip?: number;
+    cursor?: string;
     limit?: number;
     start_date?: string;
     end_date?: string;
@@ -3,7 +3,7 @@ import { IncomeEntry } from '../types';
 
 export const incomeService = {
   async getIncomeEntries(params?: {
-    skip?: number;
+    cursor?: string;
     limit?: number;
     start_date?: string;
     end_date?: string;
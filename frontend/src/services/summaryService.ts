@@ -1,7 +1,12 @@
 import { api } from './api';
-import { ProfitLossSummary, CostBreakdown, RevenueBreakdown, EquipmentAnalysis } from '../types';
+import { ProfitLossSummary, CostBreakdown, RevenueBreakdown, EquipmentAnalysis, SummaryOverview, RecalculationJob, SummaryHistoryEntry } from '../types';
 
 export const summaryService = {
+  async getSummaryOverview(harvestSeasonId: number): Promise<SummaryOverview> {
+    const response = await api.get(`/api/summary/harvest-season/${harvestSeasonId}/overview`);
+    return response.data;
+  },
+
   async getProfitLossSummary(harvestSeasonId: number): Promise<ProfitLossSummary> {
     const response = await api.get(`/api/summary/harvest-season/${harvestSeasonId}/profit-loss`);
     return response.data;
@@ -22,7 +27,29 @@ export const summaryService = {
     return response.data;
   },
 
-  async recalculateSummary(harvestSeasonId: number): Promise<void> {
-    await api.post(`/api/summary/harvest-season/${harvestSeasonId}/recalculate`);
+  async getSummaryHistory(harvestSeasonId: number, limit?: number): Promise<SummaryHistoryEntry[]> {
+    const response = await api.get(`/api/summary/harvest-season/${harvestSeasonId}/history`, { params: { limit } });
+    return response.data;
+  },
+
+  async getRecalculationJob(jobId: string): Promise<RecalculationJob> {
+    const response = await api.get(`/api/summary/jobs/${jobId}`);
+    return response.data;
+  },
+
+  async recalculateSummary(harvestSeasonId: number): Promise<RecalculationJob> {
+    const response = await api.post(`/api/summary/harvest-season/${harvestSeasonId}/recalculate`);
+    let job: RecalculationJob = response.data;
+
+    // Recalculation runs in the background; poll until it finishes
+    while (job.status === 'queued' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      job = await summaryService.getRecalculationJob(job.job_id);
+    }
+
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Recalculation failed');
+    }
+    return job;
   },
 };
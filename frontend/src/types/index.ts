@@ -216,3 +216,40 @@ export interface EquipmentAnalysis {
   equipment_cost_breakdown: Record<string, number>;
   cost_per_acre_by_equipment: Record<string, number>;
 }
+
+export interface SummaryOverview {
+  profit_loss: ProfitLossSummary;
+  cost_breakdown: CostBreakdown;
+  revenue_breakdown: RevenueBreakdown;
+  equipment_analysis: EquipmentAnalysis;
+}
+
+export interface SummaryHistoryEntry {
+  harvest_season_id: number;
+  version: number;
+  calculated_at: string;
+  harvest_duration_days?: number;
+  acres_billed?: number;
+  total_equipment_cost: number;
+  total_expenses: number;
+  total_revenue: number;
+  gross_profit: number;
+  net_profit: number;
+  profit_margin: number;
+  cost_per_acre: number;
+  revenue_per_acre: number;
+  profit_per_acre: number;
+}
+
+export interface RecalculationJob {
+  job_id: string;
+  harvest_season_id: number;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  stage: string;
+  progress: number;
+  summary_id?: number;
+  error?: string;
+  created_at: string;
+  started_at?: string;
+  finished_at?: string;
+}